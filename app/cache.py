@@ -0,0 +1,175 @@
+"""In-process caches.
+
+``LOOKUPS`` holds the reference lists (clients, categories, team members) and the first page of their typeahead
+lookups, which forms and filters show before anything is typed. Entries never expire on their own; the service
+functions that write an entity invalidate its entries after commit. Every invalidation bumps the entry's
+generation, so a load that started before a write cannot store its now stale result afterwards.
+
+``DASHBOARD`` holds the numbers every open dashboard shows. They change with every requirement write, so its
+entries live only a few seconds, and the many dashboards opened at the same time share one load.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LookupCache:
+    """Thread-safe key/value cache with per-key generations and hit/miss counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[Hashable, Any] = {}
+        self._generations: dict[Hashable, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable) -> tuple[bool, Any, int]:
+        """Return ``(found, value, generation)``; pass the generation to ``put`` after loading a miss."""
+        with self._lock:
+            if key in self._values:
+                self._hits += 1
+                return True, self._values[key], self._generations.get(key, 0)
+            self._misses += 1
+            return False, None, self._generations.get(key, 0)
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """Store a loaded value unless the key was invalidated since ``get`` handed out ``generation``."""
+        with self._lock:
+            if self._generations.get(key, 0) == generation:
+                self._values[key] = value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in set(self._values) | set(self._generations):
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._values.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._values),
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+            }
+
+
+class SingleFlightCache:
+    """Async key/value cache with a time to live, single-flight loads and stale-while-revalidate.
+
+    An entry is fresh for ``ttl`` seconds, then stale for ``stale_ttl`` more: a stale entry is still returned at
+    once while a single background load replaces it. Calls that have to wait for a load share one, and count as
+    coalesced. Invalidated entries are never served, and a load that started before an invalidation is neither
+    stored nor shared with later calls. ``invalidate`` may be called from any thread, ``get`` on the event loop.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0, clock: Callable[[], float] = time.monotonic) -> None:
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._values: dict[Hashable, tuple[Any, float]] = {}
+        self._generations: dict[Hashable, int] = {}
+        self._loads: dict[Hashable, tuple[int, asyncio.Task]] = {}
+        self._counters = dict.fromkeys(("hits", "stale_hits", "loads", "coalesced", "errors", "invalidations"), 0)
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value of ``key``, calling ``load`` when it has to be (re)loaded."""
+        with self._lock:
+            generation = self._generations.get(key, 0)
+            if key in self._values:
+                value, loaded_at = self._values[key]
+                age = self._clock() - loaded_at
+                if age < self._ttl:
+                    self._counters["hits"] += 1
+                    return value
+                if age < self._ttl + self._stale_ttl:
+                    self._counters["stale_hits"] += 1
+                    if self._running_load(key, generation) is None:
+                        self._start_load(key, load, generation)
+                    return value
+            task = self._running_load(key, generation)
+            if task is None:
+                task = self._start_load(key, load, generation)
+            else:
+                self._counters["coalesced"] += 1
+        # A caller that goes away (its page closed) must not cancel the load the others are waiting for
+        return await asyncio.shield(task)
+
+    def _running_load(self, key: Hashable, generation: int) -> Optional[asyncio.Task]:
+        if key not in self._loads:
+            return None
+        load_generation, task = self._loads[key]
+        # Tasks of another event loop (a test's, say) cannot be awaited here
+        if load_generation != generation or task.get_loop() is not asyncio.get_running_loop():
+            return None
+        return task
+
+    def _start_load(self, key: Hashable, load: Callable[[], Awaitable[Any]], generation: int) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._load(key, load, generation))
+        task.add_done_callback(_log_failure)
+        self._loads[key] = (generation, task)
+        self._counters["loads"] += 1
+        return task
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        try:
+            value = await load()
+        except Exception:
+            with self._lock:
+                self._counters["errors"] += 1
+                self._finish(key)
+            raise
+        with self._lock:
+            if self._generations.get(key, 0) == generation:
+                self._values[key] = (value, self._clock())
+            self._finish(key)
+        return value
+
+    def _finish(self, key: Hashable) -> None:
+        if key in self._loads and self._loads[key][1] is asyncio.current_task():
+            del self._loads[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in set(self._values) | set(self._generations) | set(self._loads):
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._values.clear()
+            self._loads.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._values), **self._counters}
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    # Also retrieves the exception of background refreshes that nobody awaits
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Loading a cached value failed: {task.exception()!r}")
+
+
+# Shared by the client, category and team member services
+LOOKUPS = LookupCache()
+
+# Fresh for a few seconds, then served for up to a minute while it is reloaded; writes invalidate it
+DASHBOARD_TTL_SECONDS = 5.0
+DASHBOARD_STALE_SECONDS = 60.0
+DASHBOARD = SingleFlightCache(DASHBOARD_TTL_SECONDS, DASHBOARD_STALE_SECONDS)
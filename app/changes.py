@@ -0,0 +1,157 @@
+"""Change notifications between app processes over PostgreSQL LISTEN/NOTIFY.
+
+Service functions call ``publish`` inside the transaction that writes an entity, so PostgreSQL delivers the
+notification only when (and if) that transaction commits. Every process runs one listener thread that hands
+notifications to the callbacks registered with ``subscribe``. By default those only hear about *other*
+processes, because the writing process has already updated its own caches; callbacks that react to every
+committed change, such as live page updates, subscribe with ``own=True``. After (re)connecting, the listener
+cannot know what it missed and calls every callback with ``None`` for the id.
+"""
+
+import json
+import logging
+import os
+import select
+import threading
+from collections import defaultdict
+from typing import Callable, Optional, Sequence
+from uuid import uuid4
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy.engine import make_url
+from sqlmodel import Session, text
+from app.database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "app_changes"
+# LISTEN needs a session-level connection; point this past PgBouncer when it runs in transaction mode
+LISTEN_URL = os.environ.get("APP_DB_LISTEN_URL", DATABASE_URL)
+POLL_SECONDS = 1.0
+RECONNECT_SECONDS = 5.0
+
+# Lets a process recognize (and skip) the notifications it sent itself
+ORIGIN = uuid4().hex
+
+# Callbacks per entity type, each with whether it also wants this process's own changes
+_subscribers: defaultdict[str, list[tuple[Callable[[Optional[int]], None], bool]]] = defaultdict(list)
+
+
+def subscribe(entity: str, callback: Callable[[Optional[int]], None], own: bool = False, first: bool = False) -> None:
+    """Call ``callback(entity_id)`` whenever another process (or, with ``own``, any process) changes an entity.
+
+    Callbacks run on the listener thread, in the order they subscribed; with ``first`` the callback runs before
+    the earlier ones, as caches must be invalidated before pages are told to reload from them.
+    """
+    if first:
+        _subscribers[entity].insert(0, (callback, own))
+    else:
+        _subscribers[entity].append((callback, own))
+
+
+def publish(session: Session, entity: str, entity_id: Optional[int]) -> None:
+    """Queue a change notification; it is sent when the session's transaction commits."""
+    payload = json.dumps({"entity": entity, "id": entity_id, "origin": ORIGIN})
+    session.connection().execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+
+def publish_many(session: Session, entity: str, entity_ids: Sequence[Optional[int]]) -> None:
+    """Queue one change notification per id with a single statement; sent when the transaction commits."""
+    if not entity_ids:
+        return
+    session.connection().execute(
+        text(
+            "SELECT pg_notify(:channel, json_build_object('entity', :entity, 'id', id, 'origin', :origin)::text) "
+            "FROM unnest(CAST(:ids AS integer[])) AS id"
+        ),
+        {"channel": CHANNEL, "entity": entity, "origin": ORIGIN, "ids": list(entity_ids)},
+    )
+
+
+def _notify_subscribers(entity: str, entity_id: Optional[int], own_change: bool = False) -> None:
+    for callback, own in _subscribers.get(entity, []):
+        if own_change and not own:
+            continue
+        try:
+            callback(entity_id)
+        except Exception:
+            logger.exception(f"Change callback for {entity} {entity_id} failed")
+
+
+def dispatch(payload: str) -> None:
+    """Run the callbacks for one notification payload, ignoring malformed ones."""
+    try:
+        change = json.loads(payload)
+        entity, entity_id, origin = change["entity"], change["id"], change["origin"]
+    except (KeyError, TypeError, ValueError):
+        logger.warning(f"Ignoring malformed change notification: {payload!r}")
+        return
+    _notify_subscribers(entity, entity_id, own_change=origin == ORIGIN)
+
+
+def _dispatch_all() -> None:
+    for entity in list(_subscribers):
+        _notify_subscribers(entity, None)
+
+
+class ChangeListener:
+    """Background thread holding a dedicated LISTEN connection; reconnects after connection errors."""
+
+    def __init__(self, url: str = LISTEN_URL) -> None:
+        self._dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="change-listener", daemon=True)
+        self.listening = threading.Event()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except psycopg2.Error as e:
+                self.listening.clear()
+                logger.warning(f"Change listener disconnected, retrying in {RECONNECT_SECONDS}s: {e}")
+                self._stop.wait(RECONNECT_SECONDS)
+
+    def _listen(self) -> None:
+        conn = psycopg2.connect(self._dsn, connect_timeout=15)
+        try:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            _dispatch_all()
+            self.listening.set()
+            while not self._stop.is_set():
+                if select.select([conn], [], [], POLL_SECONDS) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    dispatch(conn.notifies.pop(0).payload)
+        finally:
+            self.listening.clear()
+            conn.close()
+
+
+_listener: Optional[ChangeListener] = None
+
+
+def start_listener() -> ChangeListener:
+    """Start this process's listener unless it is already running."""
+    global _listener
+    if _listener is None:
+        _listener = ChangeListener()
+        _listener.start()
+    return _listener
+
+
+def stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
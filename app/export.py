@@ -0,0 +1,24 @@
+"""Download endpoint that streams requirements as CSV or NDJSON.
+
+The response body is produced from a server-side cursor while it is sent, so an export holds one batch of rows
+in memory at a time. It accepts the same filters as the requirements list, as query parameters.
+"""
+
+from typing import Annotated, Literal
+from fastapi import Depends
+from fastapi.responses import StreamingResponse
+from nicegui import app
+from app.models import RequirementFilter
+from app.services.requirement_service import EXPORT_FORMATS, export_requirements_async
+
+
+def create() -> None:
+    @app.get("/export/requirements")
+    async def export_requirements(
+        filters: Annotated[RequirementFilter, Depends()], format: Literal["csv", "ndjson"] = "csv"
+    ) -> StreamingResponse:
+        return StreamingResponse(
+            export_requirements_async(format, filters),
+            media_type=EXPORT_FORMATS[format],
+            headers={"Content-Disposition": f'attachment; filename="requirements.{format}"'},
+        )
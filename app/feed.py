@@ -0,0 +1,75 @@
+"""Change feed that pushes requirement changes into the pages open in browsers.
+
+Every committed requirement write, whether made by this process or another one, reaches ``app.changes``'s
+LISTEN/NOTIFY listener. Pages register an async callback with ``watch_requirements`` and get the ids of the
+changed requirements. The updates then go out over the page's existing websocket, so nothing polls. Changes that
+arrive while a callback is still running are merged into its next call. ``None`` instead of ids means the
+listener may have missed changes and the page should reload what it shows.
+"""
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, Optional
+from nicegui import background_tasks, context
+from nicegui.client import Client
+from app import changes
+
+RequirementCallback = Callable[[Optional[set[int]]], Awaitable[None]]
+
+
+class _Watcher:
+    def __init__(self, client: Client, callback: RequirementCallback) -> None:
+        self.client = client
+        self.callback = callback
+        self.loop = asyncio.get_running_loop()
+        self.pending: set[int] = set()
+        self.reload = False
+        self.running = False
+
+    def notify(self, requirement_id: Optional[int]) -> None:
+        if requirement_id is None:
+            self.reload = True
+        else:
+            self.pending.add(requirement_id)
+        if not self.running:
+            self.running = True
+            background_tasks.create(self._run(), name=f"requirement feed {self.client.id}")
+
+    async def _run(self) -> None:
+        try:
+            while (self.reload or self.pending) and not self.client._deleted:
+                requirement_ids = None if self.reload else self.pending
+                self.pending, self.reload = set(), False
+                with self.client:
+                    await self.callback(requirement_ids)
+        finally:
+            self.running = False
+
+
+_lock = threading.Lock()
+_watchers: set[_Watcher] = set()
+
+
+def watch_requirements(callback: RequirementCallback) -> None:
+    """Call ``callback`` with the ids of changed requirements for as long as the current page is open."""
+    watcher = _Watcher(context.client, callback)
+    with _lock:
+        _watchers.add(watcher)
+
+    def unwatch() -> None:
+        with _lock:
+            _watchers.discard(watcher)
+
+    context.client.on_disconnect(unwatch)
+
+
+def _on_requirement_change(requirement_id: Optional[int]) -> None:
+    # Runs on the listener thread; each watcher is handed the change on its page's event loop
+    with _lock:
+        watchers = list(_watchers)
+    for watcher in watchers:
+        if not watcher.loop.is_closed():
+            watcher.loop.call_soon_threadsafe(watcher.notify, requirement_id)
+
+
+changes.subscribe("requirement", _on_requirement_change, own=True)
@@ -0,0 +1,48 @@
+"""Command-line CSV import of clients and requirements.
+
+    python -m app.importer clients clients.csv
+    python -m app.importer requirements requirements.csv
+
+Import clients before the requirements that refer to them. Rows that cannot be imported are logged as errors
+with their row number; the exit status is 1 when there were any, 2 when the file could not be imported at all.
+"""
+
+import argparse
+import logging
+import sys
+from typing import Optional, Sequence
+from sqlalchemy.exc import SQLAlchemyError
+from app.services.import_service import import_clients, import_requirements
+
+logger = logging.getLogger(__name__)
+
+IMPORTERS = {"clients": import_clients, "requirements": import_requirements}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.importer", description="Import clients or requirements.")
+    parser.add_argument("kind", choices=sorted(IMPORTERS), help="what the file contains")
+    parser.add_argument("file", help="CSV file with a header row")
+    args = parser.parse_args(argv)
+
+    try:
+        # utf-8-sig also accepts files saved by spreadsheet programs with a byte order mark
+        with open(args.file, newline="", encoding="utf-8-sig") as file:
+            result = IMPORTERS[args.kind](file)
+    except (OSError, ValueError) as e:
+        logger.error(f"Import failed: {e}")
+        return 2
+    except SQLAlchemyError:
+        # Say, a referenced row deleted meanwhile, a lost connection or the statement timeout; nothing was imported
+        logger.exception("Import failed")
+        return 2
+
+    for row_number, error in result["errors"].items():
+        logger.error(f"Row {row_number}: {error}")
+    logger.info(f"Imported {result['imported']} {args.kind}, skipped {len(result['errors'])} rows")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
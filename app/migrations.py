@@ -0,0 +1,185 @@
+"""Versioned schema migrations.
+
+Applied versions are recorded in ``schema_migrations``; startup only reads the current version and does nothing
+else when the schema is up to date. Migration 1 creates the schema from the models, so a fresh database gets the
+current schema in one step; every later migration must therefore be idempotent (``IF NOT EXISTS`` and friends)
+because its changes may already be part of that initial schema.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+from sqlalchemy import Connection, Engine, insert
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import SQLModel, text
+
+from app.models import REQUIREMENT_SEARCH_VECTOR, SchemaMigration, SummaryCount
+from app.summary import install_summary_triggers, reconcile_summary_counts
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key so that concurrently starting processes migrate one at a time
+MIGRATION_LOCK_KEY = 727_001
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    transactional: bool = True
+
+
+def _create_schema(conn: Connection) -> None:
+    SQLModel.metadata.create_all(conn)
+    install_summary_triggers(conn)
+
+
+def _create_index_concurrently(conn: Connection, name: str, definition: str) -> None:
+    """Build an index without blocking writes, replacing a leftover invalid build of it."""
+    invalid = conn.execute(
+        text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid is not None:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}"))
+
+
+def _requirement_indexes(conn: Connection) -> None:
+    for name, definition in [
+        ("ix_requirements_created_at_id", "requirements (created_at, id)"),
+        ("ix_requirements_updated_at_id", "requirements (updated_at, id)"),
+        ("ix_requirements_due_date_id", "requirements (due_date, id)"),
+        ("ix_requirements_priority_id", "requirements (priority, id)"),
+        ("ix_requirements_client_id_created_at_id", "requirements (client_id, created_at, id)"),
+        ("ix_requirements_team_member_id_created_at_id", "requirements (team_member_id, created_at, id)"),
+        ("ix_requirements_category_id", "requirements (category_id)"),
+        ("ix_requirements_status_priority", "requirements (status, priority)"),
+        (
+            "ix_requirements_open_due_date",
+            "requirements (due_date) WHERE status <> 'DONE' AND due_date IS NOT NULL",
+        ),
+    ]:
+        _create_index_concurrently(conn, name, definition)
+
+
+def _requirement_search(conn: Connection) -> None:
+    # Adding a stored generated column computes it for every existing row (one table rewrite)
+    column = CreateColumn(REQUIREMENT_SEARCH_VECTOR).compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE requirements ADD COLUMN IF NOT EXISTS {column}"))
+    _create_index_concurrently(conn, "ix_requirements_search_vector", "requirements USING gin (search_vector)")
+
+
+def _lookup_indexes(conn: Connection) -> None:
+    for name, definition in [
+        ("ix_clients_agency_name", "clients (agency_name)"),
+        ("ix_team_members_name", "team_members (name)"),
+    ]:
+        _create_index_concurrently(conn, name, definition)
+    try:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError as e:
+        # Lookups still work, with scans instead of trigram index searches
+        logger.warning(f"pg_trgm is not available, name lookups will not use trigram indexes: {e.orig}")
+        return
+    # Not declared on the models: they depend on the extension, which the initial schema does not create
+    for name, definition in [
+        ("ix_clients_agency_name_trgm", "clients USING gin (agency_name gin_trgm_ops)"),
+        ("ix_categories_name_trgm", "categories USING gin (name gin_trgm_ops)"),
+        ("ix_team_members_name_trgm", "team_members USING gin (name gin_trgm_ops)"),
+    ]:
+        _create_index_concurrently(conn, name, definition)
+
+
+def _completion_times(conn: Connection) -> None:
+    conn.execute(text("ALTER TABLE requirements ADD COLUMN IF NOT EXISTS completed_at timestamp without time zone"))
+    # The best estimate for requirements completed before this was recorded: their last change
+    conn.execute(
+        text("UPDATE requirements SET completed_at = updated_at WHERE status = 'DONE' AND completed_at IS NULL")
+    )
+
+
+def _summary_counts(conn: Connection) -> None:
+    SQLModel.metadata.create_all(conn, tables=[SummaryCount.__table__])  # type: ignore[attr-defined]
+    # Creating the triggers blocks writes until commit, so the backfill cannot miss a concurrent change
+    install_summary_triggers(conn)
+    # Every count is missing at first, so this is the backfill rather than drift
+    backfilled = reconcile_summary_counts(conn)
+    logger.info(f"Backfilled {len(backfilled)} summary counts")
+
+
+def _chart_counts(conn: Connection) -> None:
+    # Room for the keys combining a due date and a client; a longer varchar limit does not rewrite the table
+    conn.execute(text("ALTER TABLE summary_counts ALTER COLUMN key TYPE varchar(40)"))
+    _completion_times(conn)
+    # The triggers now also count open requirements per due date and client and per team member, and
+    # requirements per creation and completion day; the recount adds those counts for the existing rows
+    install_summary_triggers(conn)
+    recounted = reconcile_summary_counts(conn)
+    logger.info(f"Recounted {len(recounted)} summary counts")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Initial schema", _create_schema),
+    Migration(2, "Indexes for requirement filters and sort orders", _requirement_indexes, transactional=False),
+    Migration(3, "Full-text search over requirement titles and descriptions", _requirement_search, transactional=False),
+    Migration(4, "Indexes for client, category and team member name lookups", _lookup_indexes, transactional=False),
+    Migration(5, "Dashboard counts maintained by triggers", _summary_counts),
+    Migration(6, "Completion times and counts for the dashboard charts", _chart_counts),
+]
+
+
+def get_schema_version(engine: Engine) -> int:
+    """Get the latest applied migration version (0 for a database that was never migrated)."""
+    try:
+        with engine.connect() as conn:
+            version = conn.execute(text("SELECT max(version) FROM schema_migrations")).scalar()
+    except ProgrammingError:
+        logger.info("No schema_migrations table yet, treating the database as unversioned")
+        return 0
+    return version if version is not None else 0
+
+
+def _apply(engine: Engine, migration: Migration) -> None:
+    logger.info(f"Applying migration {migration.version}: {migration.description}")
+    record = insert(SchemaMigration).values(
+        version=migration.version, description=migration.description, applied_at=datetime.utcnow()
+    )
+    if migration.transactional:
+        with engine.begin() as conn:
+            # Migrations may rewrite large tables, which takes longer than the per-statement budget
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+            migration.apply(conn)
+            conn.execute(record)
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SET statement_timeout = 0"))
+        try:
+            migration.apply(conn)
+            conn.execute(record)
+        finally:
+            conn.execute(text("RESET statement_timeout"))
+
+
+def upgrade(engine: Engine) -> None:
+    """Apply pending migrations in order; a single version query when the schema is current."""
+    latest = MIGRATIONS[-1].version
+    if get_schema_version(engine) >= latest:
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            # Another process may have migrated while we waited for the lock
+            current = get_schema_version(engine)
+            for migration in MIGRATIONS:
+                if migration.version > current:
+                    _apply(engine, migration)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
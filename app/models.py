@@ -1,3 +1,5 @@
+from sqlalchemy import Column, Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, date
 from typing import Optional, List
@@ -19,6 +21,8 @@ class Status(str, Enum):
 # Persistent models (stored in database)
 class Client(SQLModel, table=True):
     __tablename__ = "clients"  # type: ignore[assignment]
+    # Alphabetical listings and lookups by name
+    __table_args__ = (Index("ix_clients_agency_name", "agency_name"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     agency_name: str = Field(max_length=200)
@@ -44,6 +48,8 @@ class Category(SQLModel, table=True):
 
 class TeamMember(SQLModel, table=True):
     __tablename__ = "team_members"  # type: ignore[assignment]
+    # Alphabetical listings and lookups by name
+    __table_args__ = (Index("ix_team_members_name", "name"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=100)
@@ -54,6 +60,25 @@ class TeamMember(SQLModel, table=True):
 
 class Requirement(SQLModel, table=True):
     __tablename__ = "requirements"  # type: ignore[assignment]
+    __table_args__ = (
+        # Sort orders of the requirements table and keyset pagination, with the id as tie-breaker
+        Index("ix_requirements_created_at_id", "created_at", "id"),
+        Index("ix_requirements_updated_at_id", "updated_at", "id"),
+        Index("ix_requirements_due_date_id", "due_date", "id"),
+        Index("ix_requirements_priority_id", "priority", "id"),
+        # Per-client and per-assignee listings (newest first); also serve the foreign key lookups
+        Index("ix_requirements_client_id_created_at_id", "client_id", "created_at", "id"),
+        Index("ix_requirements_team_member_id_created_at_id", "team_member_id", "created_at", "id"),
+        Index("ix_requirements_category_id", "category_id"),
+        # Status/priority filters and the summary breakdown
+        Index("ix_requirements_status_priority", "status", "priority"),
+        # Overdue counting only ever looks at open items that have a due date
+        Index(
+            "ix_requirements_open_due_date",
+            "due_date",
+            postgresql_where=text("status <> 'DONE' AND due_date IS NOT NULL"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(max_length=200)
@@ -66,12 +91,50 @@ class Requirement(SQLModel, table=True):
     team_member_id: Optional[int] = Field(default=None, foreign_key="team_members.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set by a database trigger when the status becomes Done, cleared when it is reopened (see app.summary)
+    completed_at: Optional[datetime] = Field(default=None)
 
     client: Client = Relationship(back_populates="requirements")
     category: Category = Relationship(back_populates="requirements")
     team_member: Optional[TeamMember] = Relationship(back_populates="requirements")
 
 
+# Full-text search document over title (weighted higher) and description. A stored generated column, so
+# PostgreSQL keeps it current on every write, bulk statements and imports included. It is deliberately not a model
+# field: loading or writing requirements never touches it, only search predicates and ranking do.
+SEARCH_CONFIG = "english"
+REQUIREMENT_SEARCH_VECTOR = Column(
+    "search_vector",
+    TSVECTOR,
+    Computed(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', description), 'B')",
+        persisted=True,
+    ),
+    nullable=False,
+)
+Requirement.__table__.append_column(REQUIREMENT_SEARCH_VECTOR)  # type: ignore[attr-defined]
+Index("ix_requirements_search_vector", REQUIREMENT_SEARCH_VECTOR, postgresql_using="gin")
+
+
+class SchemaMigration(SQLModel, table=True):
+    __tablename__ = "schema_migrations"  # type: ignore[assignment]
+
+    version: int = Field(primary_key=True)
+    description: str = Field(max_length=200)
+    applied_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SummaryCount(SQLModel, table=True):
+    """One pre-aggregated dashboard number, such as the requirements with a status; kept by triggers (app.summary)."""
+
+    __tablename__ = "summary_counts"  # type: ignore[assignment]
+
+    dimension: str = Field(primary_key=True, max_length=20)
+    key: str = Field(default="", primary_key=True, max_length=40)
+    count: int = Field(default=0)
+
+
 # Non-persistent schemas (for validation, forms, API requests/responses)
 class ClientCreate(SQLModel, table=False):
     agency_name: str = Field(max_length=200)
@@ -127,3 +190,15 @@ class RequirementUpdate(SQLModel, table=False):
     client_id: Optional[int] = Field(default=None)
     category_id: Optional[int] = Field(default=None)
     team_member_id: Optional[int] = Field(default=None)
+
+
+class RequirementFilter(SQLModel, table=False):
+    status: Optional[Status] = Field(default=None)
+    priority: Optional[Priority] = Field(default=None)
+    client_id: Optional[int] = Field(default=None)
+    category_id: Optional[int] = Field(default=None)
+    team_member_id: Optional[int] = Field(default=None)
+    due_from: Optional[date] = Field(default=None)
+    due_to: Optional[date] = Field(default=None)
+    # Words to look for in title and description; the last one may be incomplete (search as you type)
+    search: Optional[str] = Field(default=None, max_length=200)
@@ -0,0 +1,105 @@
+"""Connection pools that record how long callers wait to check out a connection.
+
+The wait covers everything ``Pool.connect()`` does: queueing for a free slot, opening a new
+connection when the pool may grow, and the pre-ping. Metrics survive ``Engine.dispose()``,
+which replaces the pool through ``recreate()``.
+"""
+
+import threading
+import time
+from typing import Any, cast
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+# Upper bounds of the checkout wait histogram buckets, in milliseconds
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """Thread-safe checkout counters and wait-time histogram for one pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self._checkouts = 0
+            self._timeouts = 0
+            self._wait_total_ms = 0.0
+            self._wait_max_ms = 0.0
+
+    def observe(self, wait_ms: float, timed_out: bool = False) -> None:
+        bucket = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait_ms <= bound), len(WAIT_BUCKETS_MS))
+        with self._lock:
+            self._buckets[bucket] += 1
+            self._wait_total_ms += wait_ms
+            self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._checkouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"le_{bound}" for bound in WAIT_BUCKETS_MS] + ["le_inf"]
+            return {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "wait_ms_total": round(self._wait_total_ms, 3),
+                "wait_ms_max": round(self._wait_max_ms, 3),
+                "wait_ms_histogram": dict(zip(labels, self._buckets)),
+            }
+
+
+class _TimedCheckout(Pool):
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.observe((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.metrics.observe((time.perf_counter() - start) * 1000)
+        return connection
+
+    def recreate(self) -> Any:
+        # Typed loosely because each concrete base (QueuePool, NullPool, ...) narrows the return type differently
+        pool = cast(_TimedCheckout, super().recreate())
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def pool_status(pool: Pool) -> dict:
+    """Current occupancy and checkout metrics of a pool, as reported by ``/health``."""
+    status: dict = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # Negative while the pool has not yet opened all of its base connections
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, _TimedCheckout):
+        status.update(pool.metrics.snapshot())
+    return status
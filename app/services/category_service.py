@@ -1,14 +1,79 @@
 from typing import List, Optional
-from sqlmodel import select
-from app.database import get_session
-from app.models import Category, CategoryCreate, CategoryUpdate
+from sqlalchemy import Exists, String, and_, cast, delete, exists
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import col, func, select
+from sqlmodel.sql.expression import Select
+from app.cache import LOOKUPS
+from app.changes import publish, subscribe
+from app.database import get_async_session, get_session
+from app.models import Category, CategoryCreate, CategoryUpdate, Requirement, SummaryCount
+from app.services.typeahead import TYPEAHEAD_LIMIT, typeahead_statement
+from app.summary import CATEGORY
+
+# The first typeahead page, which forms and filters show before anything is typed
+_FIRST_PAGE = ("categories", "first page")
+
+
+def invalidate_category_lookups() -> None:
+    """Drop the cached category list and first typeahead page; call after every category write."""
+    LOOKUPS.invalidate("categories")
+    LOOKUPS.invalidate(_FIRST_PAGE)
+
+
+# Other processes changed a category: drop our copies
+subscribe("category", lambda _: invalidate_category_lookups())
 
 
 def get_all_categories() -> List[Category]:
     """Get all categories ordered by name."""
+    found, categories, generation = LOOKUPS.get("categories")
+    if not found:
+        with get_session() as session:
+            categories = list(session.exec(select(Category).order_by(Category.name)))
+        LOOKUPS.put("categories", categories, generation)
+    # A copy, so callers cannot change the cached list
+    return list(categories)
+
+
+async def get_all_categories_async() -> List[Category]:
+    """Async variant of ``get_all_categories``."""
+    found, categories, generation = LOOKUPS.get("categories")
+    if not found:
+        async with get_async_session() as session:
+            categories = list((await session.exec(select(Category).order_by(Category.name))).all())
+        LOOKUPS.put("categories", categories, generation)
+    return list(categories)
+
+
+def search_categories(search: str, limit: int = TYPEAHEAD_LIMIT) -> List[Category]:
+    """Get the categories whose name contains ``search``, the ones starting with it first.
+
+    The first page for an empty search is cached, so opening a form or filter costs no query.
+    """
+    if not search.strip() and limit == TYPEAHEAD_LIMIT:
+        found, categories, generation = LOOKUPS.get(_FIRST_PAGE)
+        if not found:
+            with get_session() as session:
+                categories = list(session.exec(typeahead_statement(Category, Category.name, search, limit)))
+            LOOKUPS.put(_FIRST_PAGE, categories, generation)
+        return list(categories)
     with get_session() as session:
-        statement = select(Category).order_by(Category.name)
-        return list(session.exec(statement))
+        return list(session.exec(typeahead_statement(Category, Category.name, search, limit)))
+
+
+async def search_categories_async(search: str, limit: int = TYPEAHEAD_LIMIT) -> List[Category]:
+    """Async variant of ``search_categories``."""
+    if not search.strip() and limit == TYPEAHEAD_LIMIT:
+        found, categories, generation = LOOKUPS.get(_FIRST_PAGE)
+        if not found:
+            async with get_async_session() as session:
+                categories = list(
+                    (await session.exec(typeahead_statement(Category, Category.name, search, limit))).all()
+                )
+            LOOKUPS.put(_FIRST_PAGE, categories, generation)
+        return list(categories)
+    async with get_async_session() as session:
+        return list((await session.exec(typeahead_statement(Category, Category.name, search, limit))).all())
 
 
 def get_category_by_id(category_id: int) -> Optional[Category]:
@@ -17,14 +82,23 @@ def get_category_by_id(category_id: int) -> Optional[Category]:
         return session.get(Category, category_id)
 
 
+async def get_category_by_id_async(category_id: int) -> Optional[Category]:
+    """Async variant of ``get_category_by_id``."""
+    async with get_async_session() as session:
+        return await session.get(Category, category_id)
+
+
 def create_category(category_data: CategoryCreate) -> Category:
     """Create a new category."""
     with get_session() as session:
         category = Category(**category_data.model_dump())
         session.add(category)
+        session.flush()
+        publish(session, "category", category.id)
         session.commit()
         session.refresh(category)
-        return category
+    invalidate_category_lookups()
+    return category
 
 
 def update_category(category_id: int, category_data: CategoryUpdate) -> Optional[Category]:
@@ -39,36 +113,76 @@ def update_category(category_id: int, category_data: CategoryUpdate) -> Optional
             setattr(category, field, value)
 
         session.add(category)
+        publish(session, "category", category_id)
         session.commit()
         session.refresh(category)
-        return category
+    invalidate_category_lookups()
+    return category
+
+
+def _has_requirements(category_id: int) -> Exists:
+    # Answered from the category_id index without reading any requirement rows
+    return exists().where(col(Requirement.category_id) == category_id)
+
+
+def category_has_requirements(category_id: int) -> bool:
+    """Whether any requirement is filed under the category."""
+    with get_session() as session:
+        return session.exec(select(_has_requirements(category_id))).one()
+
+
+async def category_has_requirements_async(category_id: int) -> bool:
+    """Async variant of ``category_has_requirements``."""
+    async with get_async_session() as session:
+        return (await session.exec(select(_has_requirements(category_id)))).one()
 
 
 def delete_category(category_id: int) -> bool:
     """Delete a category if it has no associated requirements."""
     with get_session() as session:
-        category = session.get(Category, category_id)
-        if category is None:
+        statement = delete(Category).where(col(Category.id) == category_id, ~_has_requirements(category_id))
+        try:
+            result = session.connection().execute(statement)
+            if result.rowcount > 0:
+                publish(session, "category", category_id)
+            session.commit()
+        except IntegrityError:
+            # A requirement was linked between the EXISTS check and the delete
             return False
+    if result.rowcount == 0:
+        return False
+    invalidate_category_lookups()
+    return True
 
-        # Check if category has requirements
-        if category.requirements:
-            return False
 
-        session.delete(category)
-        session.commit()
-        return True
+def category_row(category: Category, requirement_count: int) -> dict:
+    """Format a category and its requirement count as a row of the categories table."""
+    return {
+        "id": category.id,
+        "name": category.name,
+        "requirement_count": requirement_count,
+    }
+
+
+def _categories_with_counts_statement() -> Select:
+    # The requirement counts are maintained by triggers; no requirement rows are read
+    count_key = and_(col(SummaryCount.dimension) == CATEGORY, col(SummaryCount.key) == cast(col(Category.id), String))
+    return (
+        select(Category, func.coalesce(col(SummaryCount.count), 0))
+        .outerjoin(SummaryCount, count_key)
+        .order_by(Category.name)
+    )
 
 
 def get_categories_with_requirement_counts() -> List[dict]:
     """Get all categories with their requirement counts."""
     with get_session() as session:
-        categories = session.exec(select(Category).order_by(Category.name)).all()
-        return [
-            {
-                "id": category.id,
-                "name": category.name,
-                "requirement_count": len(category.requirements) if category.requirements else 0,
-            }
-            for category in categories
-        ]
+        rows = session.exec(_categories_with_counts_statement()).all()
+        return [category_row(category, requirement_count) for category, requirement_count in rows]
+
+
+async def get_categories_with_requirement_counts_async() -> List[dict]:
+    """Async variant of ``get_categories_with_requirement_counts``."""
+    async with get_async_session() as session:
+        rows = (await session.exec(_categories_with_counts_statement())).all()
+        return [category_row(category, requirement_count) for category, requirement_count in rows]
@@ -1,14 +1,79 @@
 from typing import List, Optional
-from sqlmodel import select
-from app.database import get_session
-from app.models import Client, ClientCreate, ClientUpdate
+from sqlalchemy import Exists, String, and_, cast, delete, exists
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import col, func, select
+from sqlmodel.sql.expression import Select
+from app.cache import LOOKUPS
+from app.changes import publish, subscribe
+from app.database import get_async_session, get_session
+from app.models import Client, ClientCreate, ClientUpdate, Requirement, SummaryCount
+from app.services.typeahead import TYPEAHEAD_LIMIT, typeahead_statement
+from app.summary import CLIENT
+
+# The first typeahead page, which forms and filters show before anything is typed
+_FIRST_PAGE = ("clients", "first page")
+
+
+def invalidate_client_lookups() -> None:
+    """Drop the cached client list and first typeahead page; call after every client write."""
+    LOOKUPS.invalidate("clients")
+    LOOKUPS.invalidate(_FIRST_PAGE)
+
+
+# Other processes changed a client: drop our copies
+subscribe("client", lambda _: invalidate_client_lookups())
 
 
 def get_all_clients() -> List[Client]:
     """Get all clients ordered by agency name."""
+    found, clients, generation = LOOKUPS.get("clients")
+    if not found:
+        with get_session() as session:
+            clients = list(session.exec(select(Client).order_by(Client.agency_name)))
+        LOOKUPS.put("clients", clients, generation)
+    # A copy, so callers cannot change the cached list
+    return list(clients)
+
+
+async def get_all_clients_async() -> List[Client]:
+    """Async variant of ``get_all_clients``."""
+    found, clients, generation = LOOKUPS.get("clients")
+    if not found:
+        async with get_async_session() as session:
+            clients = list((await session.exec(select(Client).order_by(Client.agency_name))).all())
+        LOOKUPS.put("clients", clients, generation)
+    return list(clients)
+
+
+def search_clients(search: str, limit: int = TYPEAHEAD_LIMIT) -> List[Client]:
+    """Get the clients whose agency name contains ``search``, the ones starting with it first.
+
+    The first page for an empty search is cached, so opening a form or filter costs no query.
+    """
+    if not search.strip() and limit == TYPEAHEAD_LIMIT:
+        found, clients, generation = LOOKUPS.get(_FIRST_PAGE)
+        if not found:
+            with get_session() as session:
+                clients = list(session.exec(typeahead_statement(Client, Client.agency_name, search, limit)))
+            LOOKUPS.put(_FIRST_PAGE, clients, generation)
+        return list(clients)
     with get_session() as session:
-        statement = select(Client).order_by(Client.agency_name)
-        return list(session.exec(statement))
+        return list(session.exec(typeahead_statement(Client, Client.agency_name, search, limit)))
+
+
+async def search_clients_async(search: str, limit: int = TYPEAHEAD_LIMIT) -> List[Client]:
+    """Async variant of ``search_clients``."""
+    if not search.strip() and limit == TYPEAHEAD_LIMIT:
+        found, clients, generation = LOOKUPS.get(_FIRST_PAGE)
+        if not found:
+            async with get_async_session() as session:
+                clients = list(
+                    (await session.exec(typeahead_statement(Client, Client.agency_name, search, limit))).all()
+                )
+            LOOKUPS.put(_FIRST_PAGE, clients, generation)
+        return list(clients)
+    async with get_async_session() as session:
+        return list((await session.exec(typeahead_statement(Client, Client.agency_name, search, limit))).all())
 
 
 def get_client_by_id(client_id: int) -> Optional[Client]:
@@ -17,14 +82,23 @@ def get_client_by_id(client_id: int) -> Optional[Client]:
         return session.get(Client, client_id)
 
 
+async def get_client_by_id_async(client_id: int) -> Optional[Client]:
+    """Async variant of ``get_client_by_id``."""
+    async with get_async_session() as session:
+        return await session.get(Client, client_id)
+
+
 def create_client(client_data: ClientCreate) -> Client:
     """Create a new client."""
     with get_session() as session:
         client = Client(**client_data.model_dump())
         session.add(client)
+        session.flush()
+        publish(session, "client", client.id)
         session.commit()
         session.refresh(client)
-        return client
+    invalidate_client_lookups()
+    return client
 
 
 def update_client(client_id: int, client_data: ClientUpdate) -> Optional[Client]:
@@ -39,40 +113,80 @@ def update_client(client_id: int, client_data: ClientUpdate) -> Optional[Client]
             setattr(client, field, value)
 
         session.add(client)
+        publish(session, "client", client_id)
         session.commit()
         session.refresh(client)
-        return client
+    invalidate_client_lookups()
+    return client
+
+
+def _has_requirements(client_id: int) -> Exists:
+    # Answered from the client_id index without reading any requirement rows
+    return exists().where(col(Requirement.client_id) == client_id)
+
+
+def client_has_requirements(client_id: int) -> bool:
+    """Whether any requirement belongs to the client."""
+    with get_session() as session:
+        return session.exec(select(_has_requirements(client_id))).one()
+
+
+async def client_has_requirements_async(client_id: int) -> bool:
+    """Async variant of ``client_has_requirements``."""
+    async with get_async_session() as session:
+        return (await session.exec(select(_has_requirements(client_id)))).one()
 
 
 def delete_client(client_id: int) -> bool:
     """Delete a client if it has no associated requirements."""
     with get_session() as session:
-        client = session.get(Client, client_id)
-        if client is None:
+        statement = delete(Client).where(col(Client.id) == client_id, ~_has_requirements(client_id))
+        try:
+            result = session.connection().execute(statement)
+            if result.rowcount > 0:
+                publish(session, "client", client_id)
+            session.commit()
+        except IntegrityError:
+            # A requirement was linked between the EXISTS check and the delete
             return False
-
-        # Check if client has requirements
-        if client.requirements:
-            return False
-
-        session.delete(client)
-        session.commit()
-        return True
+    if result.rowcount == 0:
+        return False
+    invalidate_client_lookups()
+    return True
+
+
+def client_row(client: Client, requirement_count: int) -> dict:
+    """Format a client and its requirement count as a row of the clients table."""
+    return {
+        "id": client.id,
+        "agency_name": client.agency_name,
+        "contact_person": client.contact_person,
+        "email": client.email,
+        "phone": client.phone,
+        "website": client.website,
+        "requirement_count": requirement_count,
+    }
+
+
+def _clients_with_counts_statement() -> Select:
+    # The requirement counts are maintained by triggers; no requirement rows are read
+    count_key = and_(col(SummaryCount.dimension) == CLIENT, col(SummaryCount.key) == cast(col(Client.id), String))
+    return (
+        select(Client, func.coalesce(col(SummaryCount.count), 0))
+        .outerjoin(SummaryCount, count_key)
+        .order_by(Client.agency_name)
+    )
 
 
 def get_clients_with_requirement_counts() -> List[dict]:
     """Get all clients with their requirement counts."""
     with get_session() as session:
-        clients = session.exec(select(Client).order_by(Client.agency_name)).all()
-        return [
-            {
-                "id": client.id,
-                "agency_name": client.agency_name,
-                "contact_person": client.contact_person,
-                "email": client.email,
-                "phone": client.phone,
-                "website": client.website,
-                "requirement_count": len(client.requirements) if client.requirements else 0,
-            }
-            for client in clients
-        ]
+        rows = session.exec(_clients_with_counts_statement()).all()
+        return [client_row(client, requirement_count) for client, requirement_count in rows]
+
+
+async def get_clients_with_requirement_counts_async() -> List[dict]:
+    """Async variant of ``get_clients_with_requirement_counts``."""
+    async with get_async_session() as session:
+        rows = (await session.exec(_clients_with_counts_statement())).all()
+        return [client_row(client, requirement_count) for client, requirement_count in rows]
@@ -0,0 +1,53 @@
+from typing import Optional
+from app import changes
+from app.cache import DASHBOARD
+from app.services.requirement_service import get_requirements_summary_async
+from app.services.trend_service import (
+    TREND_RANGES,
+    get_overdue_by_client_async,
+    get_requirement_trends_async,
+    get_team_member_load_async,
+)
+
+SUMMARY_KEY = "summary"
+BREAKDOWNS_KEY = "breakdowns"
+TRENDS_KEY = "trends"
+
+_KEYS = [SUMMARY_KEY, BREAKDOWNS_KEY] + [(TRENDS_KEY, trend_range) for trend_range in TREND_RANGES]
+
+
+def _invalidate_dashboard(_: Optional[int]) -> None:
+    for key in _KEYS:
+        DASHBOARD.invalidate(key)
+
+
+# Any committed write (of any process) changes the numbers; drop them before the pages hear of the change
+for _entity in ("requirement", "client", "category", "team_member"):
+    changes.subscribe(_entity, _invalidate_dashboard, own=True, first=True)
+
+
+async def get_dashboard_summary() -> dict:
+    """The requirements summary with the client and category counts, as shown by the dashboard.
+
+    All dashboards share one cached copy: concurrent calls share a single query, and for a while after it expires
+    the old copy is returned while one call reloads it (see ``app.cache.SingleFlightCache``).
+    """
+    return await DASHBOARD.get(SUMMARY_KEY, get_requirements_summary_async)
+
+
+async def get_dashboard_trends(trend_range: str) -> dict:
+    """Created, completed and open requirements over one of the ``TREND_RANGES``; cached like the summary."""
+    days = TREND_RANGES[trend_range][1]
+    return await DASHBOARD.get((TRENDS_KEY, trend_range), lambda: get_requirement_trends_async(days))
+
+
+async def _load_breakdowns() -> dict:
+    return {
+        "overdue_by_client": await get_overdue_by_client_async(),
+        "team_member_load": await get_team_member_load_async(),
+    }
+
+
+async def get_dashboard_breakdowns() -> dict:
+    """Overdue requirements of the top clients and open requirements per team member; cached like the summary."""
+    return await DASHBOARD.get(BREAKDOWNS_KEY, _load_breakdowns)
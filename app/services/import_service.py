@@ -0,0 +1,205 @@
+import csv
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, Iterable, Iterator, Optional
+from pydantic import ValidationError
+from sqlmodel import Session, text
+from app.changes import publish
+from app.database import get_session
+from app.models import ClientCreate, Priority, RequirementCreate, Status
+from app.services.category_service import get_all_categories
+from app.services.client_service import get_all_clients, invalidate_client_lookups
+from app.services.team_member_service import get_all_team_members
+
+# Staged rows are kept in memory up to this size, then spill to a temporary file
+SPOOL_BYTES = 8 * 1024 * 1024
+# Loading and merging a large file takes longer than the pool's default statement timeout
+IMPORT_STATEMENT_TIMEOUT = "5min"
+
+CLIENT_COLUMNS = ("agency_name", "contact_person", "email", "phone", "address", "website")
+
+
+def _rows(file: IO[str], required: Iterable[str]) -> Iterator[tuple[int, dict[str, str]]]:
+    """Read CSV rows with the row numbers a spreadsheet shows (the header is row 1)."""
+    reader = csv.DictReader(file)
+    missing = set(required).difference(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+    for row_number, row in enumerate(reader, start=2):
+        yield row_number, row
+
+
+def _validation_message(e: ValidationError) -> str:
+    error = e.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+def _ids_by_name(entities: Iterable[Any], attribute: str) -> dict[str, Optional[int]]:
+    """Map names to ids; a name shared by several entities maps to ``None``."""
+    ids: dict[str, Optional[int]] = {}
+    for entity in entities:
+        name = getattr(entity, attribute)
+        ids[name] = None if name in ids else entity.id
+    return ids
+
+
+def _resolve(ids: dict[str, Optional[int]], name: str, label: str) -> int:
+    if name not in ids:
+        raise ValueError(f"Unknown {label} '{name}'")
+    entity_id = ids[name]
+    if entity_id is None:
+        raise ValueError(f"More than one {label} is named '{name}'")
+    return entity_id
+
+
+def _load(session: Session, staging_table: str, columns: str, staged: IO[str]) -> None:
+    """COPY the staged CSV into a temporary table that is dropped at commit.
+
+    COPY reads empty fields as NULL; the merges turn them back into empty strings for the text columns.
+    """
+    connection = session.connection()
+    connection.execute(text(f"SET LOCAL statement_timeout = '{IMPORT_STATEMENT_TIMEOUT}'"))
+    connection.execute(text(f"CREATE TEMPORARY TABLE {staging_table} ({columns}) ON COMMIT DROP"))
+    staged.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {staging_table} FROM STDIN WITH (FORMAT csv)", staged)  # type: ignore[attr-defined]
+    finally:
+        cursor.close()
+
+
+def import_clients(file: IO[str]) -> dict:
+    """Import clients from a CSV file with a header row.
+
+    Rows are validated with ``ClientCreate`` in one streaming pass, COPYed into a staging table and merged with
+    one INSERT ... SELECT. Clients whose agency name already exists are skipped. Returns ``imported``, the
+    number of clients created, and ``errors``, a message for the row number of every row that was skipped.
+    """
+    errors: dict[int, str] = {}
+    agency_names: set[str] = set()
+    with SpooledTemporaryFile(SPOOL_BYTES, mode="w+", newline="") as staged:
+        writer = csv.writer(staged)
+        for row_number, row in _rows(file, ("agency_name", "contact_person", "email")):
+            try:
+                client = ClientCreate.model_validate({column: row.get(column) or "" for column in CLIENT_COLUMNS})
+            except ValidationError as e:
+                errors[row_number] = _validation_message(e)
+                continue
+            if not (client.agency_name and client.contact_person and client.email):
+                errors[row_number] = "agency_name, contact_person and email are required"
+            elif client.agency_name in agency_names:
+                errors[row_number] = f"Client '{client.agency_name}' appears more than once"
+            else:
+                agency_names.add(client.agency_name)
+                writer.writerow([row_number, *(getattr(client, column) for column in CLIENT_COLUMNS)])
+
+        with get_session() as session:
+            _load(
+                session,
+                "client_import",
+                "row_number integer, " + ", ".join(f"{c} text" for c in CLIENT_COLUMNS),
+                staged,
+            )
+            connection = session.connection()
+            existing = connection.execute(
+                text(
+                    "SELECT s.row_number, s.agency_name FROM client_import s "
+                    "WHERE EXISTS (SELECT 1 FROM clients c WHERE c.agency_name = s.agency_name)"
+                )
+            )
+            for row_number, agency_name in existing:
+                errors[row_number] = f"Client '{agency_name}' already exists"
+            columns = ", ".join(CLIENT_COLUMNS)
+            values = ", ".join(f"coalesce({column}, '')" for column in CLIENT_COLUMNS)
+            result = connection.execute(
+                text(
+                    f"INSERT INTO clients ({columns}, created_at) SELECT {values}, :now FROM client_import s "
+                    "WHERE NOT EXISTS (SELECT 1 FROM clients c WHERE c.agency_name = s.agency_name) "
+                    "ORDER BY s.row_number"
+                ),
+                {"now": datetime.utcnow()},
+            )
+            if result.rowcount > 0:
+                publish(session, "client", None)
+            session.commit()
+    invalidate_client_lookups()
+    return {"imported": max(result.rowcount, 0), "errors": dict(sorted(errors.items()))}
+
+
+def import_requirements(file: IO[str]) -> dict:
+    """Import requirements from a CSV file with a header row; a requirements export can be imported again.
+
+    The columns are title, description, priority, status, due_date, client, category and assigned_to. Client,
+    category and assignee are given by name and resolved with in-memory maps of the existing ones.
+    Rows are validated with ``RequirementCreate`` in one streaming pass, COPYed into a staging table and merged
+    with one INSERT ... SELECT. Returns ``imported``, the number of requirements created, and ``errors``, a
+    message for the row number of every row that was skipped.
+    """
+    clients = _ids_by_name(get_all_clients(), "agency_name")
+    categories = _ids_by_name(get_all_categories(), "name")
+    team_members = _ids_by_name(get_all_team_members(), "name")
+    errors: dict[int, str] = {}
+    with SpooledTemporaryFile(SPOOL_BYTES, mode="w+", newline="") as staged:
+        writer = csv.writer(staged)
+        for row_number, row in _rows(file, ("title", "client", "category")):
+            try:
+                assignee = row.get("assigned_to")
+                requirement = RequirementCreate.model_validate(
+                    {
+                        "title": row.get("title") or "",
+                        "description": row.get("description") or "",
+                        "priority": row.get("priority") or Priority.MEDIUM,
+                        "status": row.get("status") or Status.TODO,
+                        "due_date": row.get("due_date") or None,
+                        "client_id": _resolve(clients, row.get("client") or "", "client"),
+                        "category_id": _resolve(categories, row.get("category") or "", "category"),
+                        "team_member_id": _resolve(team_members, assignee, "team member") if assignee else None,
+                    }
+                )
+            except ValidationError as e:
+                errors[row_number] = _validation_message(e)
+                continue
+            except ValueError as e:
+                errors[row_number] = str(e)
+                continue
+            if not requirement.title:
+                errors[row_number] = "title is required"
+                continue
+            writer.writerow(
+                [
+                    row_number,
+                    requirement.title,
+                    requirement.description,
+                    # The database enums hold the member names
+                    requirement.priority.name,
+                    requirement.status.name,
+                    requirement.due_date,
+                    requirement.client_id,
+                    requirement.category_id,
+                    requirement.team_member_id,
+                ],
+            )
+
+        with get_session() as session:
+            _load(
+                session,
+                "requirement_import",
+                "row_number integer, title text, description text, priority text, status text, due_date date, "
+                "client_id integer, category_id integer, team_member_id integer",
+                staged,
+            )
+            result = session.connection().execute(
+                text(
+                    "INSERT INTO requirements (title, description, priority, status, due_date, client_id, "
+                    "category_id, team_member_id, created_at, updated_at) "
+                    "SELECT title, coalesce(description, ''), CAST(priority AS priority), CAST(status AS status), due_date, "
+                    "client_id, category_id, team_member_id, :now, :now FROM requirement_import ORDER BY row_number"
+                ),
+                {"now": datetime.utcnow()},
+            )
+            if result.rowcount > 0:
+                # One notification for the whole import; pages reload instead of fetching every requirement
+                publish(session, "requirement", None)
+            session.commit()
+    return {"imported": max(result.rowcount, 0), "errors": errors}
@@ -1,112 +1,539 @@
-from typing import List, Optional
-from datetime import datetime
-from sqlmodel import select, desc
-from app.database import get_session
-from app.models import Requirement, RequirementCreate, RequirementUpdate, Client, Category, TeamMember, Status
+import base64
+import binascii
+import csv
+import io
+import json
+import re
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Mapping, Optional, Sequence, TypeVar
+from datetime import date, datetime
+from sqlalchemy import (
+    ColumnElement,
+    Insert,
+    Integer,
+    Update,
+    cast,
+    column,
+    delete,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, contains_eager, joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlmodel import Session, and_, asc, col, func, select, desc
+from sqlmodel.sql.expression import Select, SelectOfScalar
+from app.changes import publish, publish_many
+from app.database import get_async_session, get_session
+from app.models import (
+    REQUIREMENT_SEARCH_VECTOR,
+    SEARCH_CONFIG,
+    Requirement,
+    RequirementCreate,
+    RequirementFilter,
+    RequirementUpdate,
+    Client,
+    Category,
+    TeamMember,
+    Priority,
+    Status,
+    SummaryCount,
+)
+from app.summary import CATEGORIES, CLIENTS, OPEN_DUE, PRIORITY, STATUS, TOTAL
+
+MAX_PAGE_SIZE = 200
+
+# Rows per multi-row statement in the bulk functions, well below PostgreSQL's limit of 65535 bind parameters
+BULK_BATCH_SIZE = 1000
+
+# Columns the requirements table can be sorted by, keyed by the table's column names
+SORTABLE_COLUMNS = {
+    "title": Requirement.title,
+    "client": Client.agency_name,
+    "category": Category.name,
+    "priority": Requirement.priority,
+    "status": Requirement.status,
+    "assigned_to": TeamMember.name,
+    "due_date": Requirement.due_date,
+    "created_at": Requirement.created_at,
+    "updated_at": Requirement.updated_at,
+}
+
+# Pseudo sort column for text searches: best matches first
+RELEVANCE = "relevance"
+
+# Rows per fetch from the server-side cursor of an export
+EXPORT_BATCH_SIZE = 1000
+
+# Export formats and their media types
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Likely duplicates: open requirements of the same client whose words overlap at least this much (Jaccard)
+DUPLICATE_SIMILARITY = 0.5
+# Best-ranked candidates whose similarity is computed, and words of the new text used to find them
+DUPLICATE_CANDIDATES = 20
+DUPLICATE_QUERY_WORDS = 64
+
+# Foreign keys checked by the bulk functions, with the referenced model and its name in error messages
+_REFERENCES = (
+    ("client_id", Client, "Client"),
+    ("category_id", Category, "Category"),
+    ("team_member_id", TeamMember, "Team member"),
+)
+
+# Columns that support keyset (cursor) pagination; each is paired with the id as a tie-breaker
+KEYSET_COLUMNS = ("created_at", "updated_at", "due_date", "priority")
+
+
+_Statement = TypeVar("_Statement", Select, SelectOfScalar)
+
+
+class DuplicateRequirementError(ValueError):
+    """Raised by ``create_requirement`` when open requirements of the same client look like the same request."""
+
+    def __init__(self, duplicates: List[tuple[Requirement, float]]) -> None:
+        super().__init__("Similar open requirements exist for this client")
+        self.duplicates = duplicates
+
+
+def _related_loaders(strategy: Callable[..., LoaderOption] = selectinload) -> List[LoaderOption]:
+    """Loader options that fetch client, category and team member alongside requirements.
+
+    Listings use ``selectinload`` (one extra IN query per relationship, regardless of row count);
+    single-row lookups use ``joinedload`` so everything arrives in one statement.
+    """
+    return [
+        strategy(Requirement.client),  # type: ignore[arg-type]
+        strategy(Requirement.category),  # type: ignore[arg-type]
+        strategy(Requirement.team_member),  # type: ignore[arg-type]
+    ]
+
+
+def _search_query(search: Optional[str]) -> Optional[ColumnElement]:
+    """A tsquery requiring every word of ``search``; the last word also matches as a prefix, as it may be incomplete.
+
+    Only word characters are kept, so user input can never be a tsquery syntax error.
+    """
+    words = re.findall(r"\w+", search or "")
+    if not words:
+        return None
+    return func.to_tsquery(SEARCH_CONFIG, " & ".join([*words[:-1], f"{words[-1]}:*"]))
+
+
+def _apply_filters(statement: _Statement, filters: Optional[RequirementFilter]) -> _Statement:
+    """Restrict a requirements query to the rows matching the given filters."""
+    if filters is None:
+        return statement
+    if filters.status is not None:
+        statement = statement.where(Requirement.status == filters.status)
+    if filters.priority is not None:
+        statement = statement.where(Requirement.priority == filters.priority)
+    if filters.client_id is not None:
+        statement = statement.where(Requirement.client_id == filters.client_id)
+    if filters.category_id is not None:
+        statement = statement.where(Requirement.category_id == filters.category_id)
+    if filters.team_member_id is not None:
+        statement = statement.where(Requirement.team_member_id == filters.team_member_id)
+    if filters.due_from is not None:
+        statement = statement.where(col(Requirement.due_date) >= filters.due_from)
+    if filters.due_to is not None:
+        statement = statement.where(col(Requirement.due_date) <= filters.due_to)
+    query = _search_query(filters.search)
+    if query is not None:
+        # Served by the GIN index on the generated search vector
+        statement = statement.where(REQUIREMENT_SEARCH_VECTOR.bool_op("@@")(query))
+    return statement
+
+
+def requirement_matches(requirement: Requirement, filters: Optional[RequirementFilter]) -> bool:
+    """Whether a loaded requirement passes the filters; the in-memory counterpart of ``_apply_filters``.
+
+    The text search is not evaluated: it depends on the database's word stemming, so with ``filters.search`` set
+    only a query can tell whether a requirement matches.
+    """
+    if filters is None:
+        return True
+    for field in ("status", "priority", "client_id", "category_id", "team_member_id"):
+        wanted = getattr(filters, field)
+        if wanted is not None and getattr(requirement, field) != wanted:
+            return False
+    due_date = requirement.due_date
+    if filters.due_from is not None and (due_date is None or due_date < filters.due_from):
+        return False
+    if filters.due_to is not None and (due_date is None or due_date > filters.due_to):
+        return False
+    return True
 
 
 def get_all_requirements() -> List[Requirement]:
     """Get all requirements with related data loaded."""
     with get_session() as session:
-        statement = select(Requirement).order_by(desc(Requirement.created_at))
-        requirements = session.exec(statement).all()
-
-        # Explicitly load relationships to avoid lazy loading issues
-        for req in requirements:
-            _ = req.client.agency_name  # Force load client
-            _ = req.category.name  # Force load category
-            if req.team_member:
-                _ = req.team_member.name  # Force load team member
-
-        return list(requirements)
+        statement = select(Requirement).options(*_related_loaders()).order_by(desc(Requirement.created_at))
+        return list(session.exec(statement).all())
 
 
 def get_requirement_by_id(requirement_id: int) -> Optional[Requirement]:
     """Get a requirement by ID with relationships loaded."""
     with get_session() as session:
-        req = session.get(Requirement, requirement_id)
-        if req:
-            # Force load relationships
-            _ = req.client.agency_name
-            _ = req.category.name
-            if req.team_member:
-                _ = req.team_member.name
-        return req
-
-
-def create_requirement(requirement_data: RequirementCreate) -> Optional[Requirement]:
-    """Create a new requirement."""
+        return session.get(Requirement, requirement_id, options=_related_loaders(joinedload))
+
+
+async def get_requirement_by_id_async(requirement_id: int) -> Optional[Requirement]:
+    """Async variant of ``get_requirement_by_id``."""
+    async with get_async_session() as session:
+        return await session.get(Requirement, requirement_id, options=_related_loaders(joinedload))
+
+
+def _clamp_page(page: int, page_size: int) -> tuple[int, int]:
+    return max(page, 1), min(max(page_size, 1), MAX_PAGE_SIZE)
+
+
+def _page_statements(
+    page: int, page_size: int, sort_by: str, descending: bool, filters: Optional[RequirementFilter]
+) -> tuple[SelectOfScalar[Requirement], SelectOfScalar[int]]:
+    """Build the row query and the count query for one page of requirements."""
+    query = _search_query(filters.search if filters is not None else None)
+    if sort_by == RELEVANCE:
+        if query is None:
+            raise ValueError("Sorting by relevance needs a search")
+        # Title matches are weighted above description matches
+        sort_column = func.ts_rank(REQUIREMENT_SEARCH_VECTOR, query)
+    elif sort_by in SORTABLE_COLUMNS:
+        sort_column = SORTABLE_COLUMNS[sort_by]
+    else:
+        raise ValueError(f"Cannot sort requirements by '{sort_by}'")
+
+    statement = _apply_filters(select(Requirement), filters)
+    match sort_by:
+        case "client":
+            statement = statement.join(Client)
+        case "category":
+            statement = statement.join(Category)
+        case "assigned_to":
+            statement = statement.join(TeamMember, isouter=True)
+    direction = desc if descending else asc
+    statement = (
+        statement.options(*_related_loaders())
+        .order_by(direction(sort_column), direction(Requirement.id))
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    count_statement = _apply_filters(select(func.count()).select_from(Requirement), filters)
+    return statement, count_statement
+
+
+def _page_result(
+    items: List[Requirement], total: int, page: int, page_size: int, sort_by: str, descending: bool
+) -> dict:
+    result: dict[str, Any] = {"items": items, "total": total}
+    if sort_by in KEYSET_COLUMNS:
+        # Let callers continue from this page with constant-cost cursor fetches
+        has_next = page * page_size < total
+        result["next_cursor"] = _encode_cursor(items[-1], sort_by, descending, "next") if has_next and items else None
+        result["prev_cursor"] = _encode_cursor(items[0], sort_by, descending, "prev") if page > 1 and items else None
+    return result
+
+
+def get_requirements_page(
+    page: int = 1,
+    page_size: int = 25,
+    sort_by: str = "created_at",
+    descending: bool = True,
+    filters: Optional[RequirementFilter] = None,
+) -> dict:
+    """Get one page of requirements and the total number of requirements matching the filters.
+
+    With ``filters.search`` set, ``sort_by`` may also be ``"relevance"`` to rank the matches.
+    """
+    page, page_size = _clamp_page(page, page_size)
+    statement, count_statement = _page_statements(page, page_size, sort_by, descending, filters)
     with get_session() as session:
-        # Validate client exists
-        client = session.get(Client, requirement_data.client_id)
-        if client is None:
-            return None
+        total = session.exec(count_statement).one()
+        items = list(session.exec(statement).all())
+    return _page_result(items, total, page, page_size, sort_by, descending)
+
+
+async def get_requirements_page_async(
+    page: int = 1,
+    page_size: int = 25,
+    sort_by: str = "created_at",
+    descending: bool = True,
+    filters: Optional[RequirementFilter] = None,
+) -> dict:
+    """Async variant of ``get_requirements_page``."""
+    page, page_size = _clamp_page(page, page_size)
+    statement, count_statement = _page_statements(page, page_size, sort_by, descending, filters)
+    async with get_async_session() as session:
+        total = (await session.exec(count_statement)).one()
+        items = list((await session.exec(statement)).all())
+    return _page_result(items, total, page, page_size, sort_by, descending)
+
+
+def _encode_cursor(requirement: Requirement, sort_by: str, descending: bool, direction: str) -> str:
+    """Build an opaque cursor pointing just past (``next``) or before (``prev``) a requirement."""
+    value = getattr(requirement, sort_by)
+    match value:
+        case Priority():
+            value = value.name
+        case date():  # also covers datetime
+            value = value.isoformat()
+    payload = {"s": sort_by, "d": descending, "k": direction, "v": value, "i": requirement.id}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> dict:
+    """Decode and validate a cursor produced by ``_encode_cursor``."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if payload["s"] not in KEYSET_COLUMNS or payload["k"] not in ("next", "prev"):
+            raise ValueError(cursor)
+        value = payload["v"]
+        if value is not None:
+            match payload["s"]:
+                case "priority":
+                    value = Priority[value]
+                case "due_date":
+                    value = date.fromisoformat(value)
+                case _:
+                    value = datetime.fromisoformat(value)
+        return {**payload, "v": value, "i": int(payload["i"])}
+    except (binascii.Error, KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid requirements cursor") from e
+
+
+def _keyset_condition(sort_by: str, value: Any, requirement_id: int, greater: bool) -> ColumnElement[bool]:
+    """Rows strictly greater/less than ``(value, id)``, ordering NULLs as the largest values like PostgreSQL."""
+    column = getattr(Requirement, sort_by)
+    key = tuple_(column, col(Requirement.id))
+    if value is None:
+        if greater:
+            return and_(column.is_(None), col(Requirement.id) > requirement_id)
+        return or_(column.is_not(None), and_(column.is_(None), col(Requirement.id) < requirement_id))
+    if greater:
+        condition = key > (value, requirement_id)
+        return or_(condition, column.is_(None)) if column.expression.nullable else condition
+    return key < (value, requirement_id)
+
+
+def _cursor_statement(
+    cursor: Optional[str], limit: int, sort_by: str, descending: bool, filters: Optional[RequirementFilter]
+) -> tuple[SelectOfScalar[Requirement], str, bool, str]:
+    """Build the keyset query; returns it with the effective sort column, direction and paging direction."""
+    direction = "next"
+    statement = _apply_filters(select(Requirement), filters)
+    if cursor is not None:
+        position = _decode_cursor(cursor)
+        sort_by, descending, direction = position["s"], position["d"], position["k"]
+        # "next" moves along the sort order; "prev" moves against it
+        greater = (direction == "next") != descending
+        statement = statement.where(_keyset_condition(sort_by, position["v"], position["i"], greater))
+    elif sort_by not in KEYSET_COLUMNS:
+        raise ValueError(f"Cannot page requirements by '{sort_by}' with a cursor")
+
+    # Fetching backwards scans in reverse order; the page is flipped back afterwards
+    scan_descending = descending if direction == "next" else not descending
+    order = desc if scan_descending else asc
+    statement = (
+        statement.options(*_related_loaders())
+        .order_by(order(getattr(Requirement, sort_by)), order(Requirement.id))
+        .limit(limit + 1)
+    )
+    return statement, sort_by, descending, direction
+
+
+def _cursor_result(
+    items: List[Requirement], limit: int, from_cursor: bool, sort_by: str, descending: bool, direction: str
+) -> dict:
+    has_more = len(items) > limit
+    items = items[:limit]
+    if direction == "prev":
+        items.reverse()
+    if not items:
+        return {"items": [], "next_cursor": None, "prev_cursor": None}
+
+    has_next = has_more if direction == "next" else True
+    has_prev = from_cursor if direction == "next" else has_more
+    return {
+        "items": items,
+        "next_cursor": _encode_cursor(items[-1], sort_by, descending, "next") if has_next and items else None,
+        "prev_cursor": _encode_cursor(items[0], sort_by, descending, "prev") if has_prev else None,
+    }
+
+
+def get_requirements_by_cursor(
+    cursor: Optional[str] = None,
+    limit: int = 25,
+    sort_by: str = "created_at",
+    descending: bool = True,
+    filters: Optional[RequirementFilter] = None,
+) -> dict:
+    """Get requirements with keyset pagination.
+
+    Without a cursor the first page for ``sort_by``/``descending`` is returned; otherwise the cursor decides
+    the sort and whether to fetch the page after or before it. The cost of a fetch does not depend on depth.
+    """
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    statement, sort_by, descending, direction = _cursor_statement(cursor, limit, sort_by, descending, filters)
+    with get_session() as session:
+        items = list(session.exec(statement).all())
+    return _cursor_result(items, limit, cursor is not None, sort_by, descending, direction)
+
+
+async def get_requirements_by_cursor_async(
+    cursor: Optional[str] = None,
+    limit: int = 25,
+    sort_by: str = "created_at",
+    descending: bool = True,
+    filters: Optional[RequirementFilter] = None,
+) -> dict:
+    """Async variant of ``get_requirements_by_cursor``."""
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    statement, sort_by, descending, direction = _cursor_statement(cursor, limit, sort_by, descending, filters)
+    async with get_async_session() as session:
+        items = list((await session.exec(statement)).all())
+    return _cursor_result(items, limit, cursor is not None, sort_by, descending, direction)
+
+
+def _written_statement(write: Insert | Update) -> SelectOfScalar[Requirement]:
+    """Run an INSERT/UPDATE ... RETURNING and select the written row with its client, category and team member.
+
+    The write is a data-modifying CTE, so the row and its display names come back in one statement.
+    """
+    # The mapped columns only; the search vector is not part of the model
+    columns = Requirement.__mapper__.columns  # type: ignore[attr-defined]
+    written = aliased(Requirement, write.returning(*columns).cte("written"))
+    return (
+        select(written)
+        .join(written.client)  # type: ignore[arg-type]
+        .join(written.category)  # type: ignore[arg-type]
+        .outerjoin(written.team_member)  # type: ignore[arg-type]
+        .options(
+            contains_eager(written.client),  # type: ignore[arg-type]
+            contains_eager(written.category),  # type: ignore[arg-type]
+            contains_eager(written.team_member),  # type: ignore[arg-type]
+        )
+        .order_by(col(written.id))
+    )
 
-        # Validate category exists
-        category = session.get(Category, requirement_data.category_id)
-        if category is None:
-            return None
 
-        # Validate team member exists if provided
-        if requirement_data.team_member_id is not None:
-            team_member = session.get(TeamMember, requirement_data.team_member_id)
-            if team_member is None:
+def _write_requirement(write: Insert | Update) -> Optional[Requirement]:
+    """Execute a requirement write; ``None`` if no row matched or a client/category/team member does not exist."""
+    with get_session() as session:
+        try:
+            requirement = session.exec(_written_statement(write)).one_or_none()
+            if requirement is None:
                 return None
-
-        requirement = Requirement(**requirement_data.model_dump())
-        session.add(requirement)
-        session.commit()
-        session.refresh(requirement)
-
-        # Load relationships
-        _ = requirement.client.agency_name
-        _ = requirement.category.name
-        if requirement.team_member:
-            _ = requirement.team_member.name
-
+            publish(session, "requirement", requirement.id)
+            # Detach the loaded objects so the commit does not expire them; nothing needs reloading
+            session.expunge_all()
+            session.commit()
+        except IntegrityError:
+            # The foreign keys validate the referenced rows
+            return None
         return requirement
 
 
-def update_requirement(requirement_id: int, requirement_data: RequirementUpdate) -> Optional[Requirement]:
-    """Update an existing requirement."""
-    with get_session() as session:
-        requirement = session.get(Requirement, requirement_id)
-        if requirement is None:
-            return None
+def _similar_statement(client_id: int, title: str, description: str) -> Optional[Select]:
+    """Select the open requirements of the client that share the most words with the text, with the lexemes of both.
+
+    Candidates are found through the search vector's GIN index and the client index, and ranked in the database;
+    the title lexemes are the vector's weight-A entries.
+    """
+    words = list(dict.fromkeys(re.findall(r"\w+", f"{title} {description}".lower())))[:DUPLICATE_QUERY_WORDS]
+    if not words:
+        return None
+    any_word = func.to_tsquery(SEARCH_CONFIG, " | ".join(words))
+    columns = [
+        Requirement,
+        # Weight A holds the title; the untyped literal resolves to the "char"[] ts_filter expects
+        func.tsvector_to_array(func.ts_filter(REQUIREMENT_SEARCH_VECTOR, literal_column("'{a}'"))),
+        func.tsvector_to_array(REQUIREMENT_SEARCH_VECTOR),
+        # The new text, stemmed like the stored vectors
+        func.tsvector_to_array(func.to_tsvector(SEARCH_CONFIG, title)),
+        func.tsvector_to_array(func.to_tsvector(SEARCH_CONFIG, f"{title} {description}")),
+    ]
+    return (
+        select(*columns)
+        .where(
+            Requirement.client_id == client_id,
+            Requirement.status != Status.DONE,
+            REQUIREMENT_SEARCH_VECTOR.bool_op("@@")(any_word),
+        )
+        .order_by(desc(func.ts_rank(REQUIREMENT_SEARCH_VECTOR, any_word)), desc(Requirement.id))
+        .limit(DUPLICATE_CANDIDATES)
+    )
 
-        update_data = requirement_data.model_dump(exclude_unset=True)
 
-        # Validate references if they're being updated
-        if "client_id" in update_data:
-            client = session.get(Client, update_data["client_id"])
-            if client is None:
-                return None
+def _jaccard(first: Iterable[str], second: Iterable[str]) -> float:
+    first, second = set(first), set(second)
+    return len(first & second) / len(first | second) if first or second else 0.0
 
-        if "category_id" in update_data:
-            category = session.get(Category, update_data["category_id"])
-            if category is None:
-                return None
 
-        if "team_member_id" in update_data and update_data["team_member_id"] is not None:
-            team_member = session.get(TeamMember, update_data["team_member_id"])
-            if team_member is None:
-                return None
+def _similar_result(rows: Sequence[Any], limit: int) -> List[tuple[Requirement, float]]:
+    """Score the candidates by title overlap or whole-text overlap, whichever is higher."""
+    scored = [
+        (requirement, max(_jaccard(title_words, new_title_words), _jaccard(words, new_words)))
+        for requirement, title_words, words, new_title_words, new_words in rows
+    ]
+    similar = [(requirement, score) for requirement, score in scored if score >= DUPLICATE_SIMILARITY]
+    return sorted(similar, key=lambda item: item[1], reverse=True)[:limit]
 
-        for field, value in update_data.items():
-            setattr(requirement, field, value)
 
-        requirement.updated_at = datetime.utcnow()
-        session.add(requirement)
-        session.commit()
-        session.refresh(requirement)
+def find_similar_requirements(
+    client_id: int, title: str, description: str = "", limit: int = 5
+) -> List[tuple[Requirement, float]]:
+    """Find open requirements of the client that are likely the same request, with their similarity (0 to 1).
 
-        # Load relationships
-        _ = requirement.client.agency_name
-        _ = requirement.category.name
-        if requirement.team_member:
-            _ = requirement.team_member.name
+    Similarity is the overlap of the stemmed words (Jaccard) of the titles, or of title and description
+    together if that is higher; requirements below ``DUPLICATE_SIMILARITY`` are left out. Most similar first.
+    """
+    statement = _similar_statement(client_id, title, description)
+    if statement is None:
+        return []
+    with get_session() as session:
+        rows = session.exec(statement).all()
+    return _similar_result(rows, limit)
+
+
+async def find_similar_requirements_async(
+    client_id: int, title: str, description: str = "", limit: int = 5
+) -> List[tuple[Requirement, float]]:
+    """Async variant of ``find_similar_requirements``."""
+    statement = _similar_statement(client_id, title, description)
+    if statement is None:
+        return []
+    async with get_async_session() as session:
+        rows = (await session.exec(statement)).all()
+    return _similar_result(rows, limit)
+
+
+def create_requirement(requirement_data: RequirementCreate, check_duplicates: bool = False) -> Optional[Requirement]:
+    """Create a new requirement.
+
+    With ``check_duplicates``, raise ``DuplicateRequirementError`` instead of creating it when
+    ``find_similar_requirements`` finds likely duplicates.
+    """
+    if check_duplicates:
+        duplicates = find_similar_requirements(
+            requirement_data.client_id, requirement_data.title, requirement_data.description
+        )
+        if duplicates:
+            raise DuplicateRequirementError(duplicates)
+    values = Requirement(**requirement_data.model_dump()).model_dump(exclude={"id"})
+    return _write_requirement(insert(Requirement).values(**values))
 
-        return requirement
+
+def update_requirement(requirement_id: int, requirement_data: RequirementUpdate) -> Optional[Requirement]:
+    """Update an existing requirement."""
+    values = requirement_data.model_dump(exclude_unset=True)
+    values["updated_at"] = datetime.utcnow()
+    return _write_requirement(update(Requirement).where(col(Requirement.id) == requirement_id).values(**values))
 
 
 def delete_requirement(requirement_id: int) -> bool:
@@ -117,24 +544,241 @@ def delete_requirement(requirement_id: int) -> bool:
             return False
 
         session.delete(requirement)
+        publish(session, "requirement", requirement_id)
         session.commit()
         return True
 
 
-def get_requirements_by_client(client_id: int) -> List[Requirement]:
-    """Get all requirements for a specific client."""
+def _batches(items: list) -> Iterator[list]:
+    for start in range(0, len(items), BULK_BATCH_SIZE):
+        yield items[start : start + BULK_BATCH_SIZE]
+
+
+def _existing_references(session: Session, rows: Iterable[dict]) -> set[tuple[str, int]]:
+    """Find which of the clients, categories and team members the rows refer to exist, in one statement."""
+    wanted: dict[str, set[int]] = {field: set() for field, _, _ in _REFERENCES}
+    for row in rows:
+        for field, ids in wanted.items():
+            if row.get(field) is not None:
+                ids.add(row[field])
+    lookups = [
+        select(literal(field), col(model.id)).where(col(model.id).in_(wanted[field]))
+        for field, model, _ in _REFERENCES
+        if wanted[field]
+    ]
+    if not lookups:
+        return set()
+    return {(field, entity_id) for field, entity_id in session.connection().execute(union_all(*lookups))}
+
+
+def _reference_error(row: dict, existing: set[tuple[str, int]]) -> Optional[str]:
+    for field, _, label in _REFERENCES:
+        if field not in row:
+            continue
+        if row[field] is None:
+            if field != "team_member_id":
+                return f"{label} is required"
+        elif (field, row[field]) not in existing:
+            return f"{label} {row[field]} does not exist"
+    return None
+
+
+def _bulk_update_statement(fields: Sequence[str], rows: list[tuple], updated_at: datetime) -> Update:
+    """UPDATE ... FROM (VALUES ...) setting ``fields`` of each ``(id, *field values)`` row."""
+    table_columns = Requirement.__table__.columns  # type: ignore[attr-defined]
+    changes = values(
+        column("id", Integer), *(column(field, table_columns[field].type) for field in fields), name="changes"
+    ).data(rows)
+    # VALUES columns arrive as text or integers; cast them to the column types (enums, dates)
+    assignments = {field: cast(changes.c[field], table_columns[field].type) for field in fields}
+    return (
+        update(Requirement).where(col(Requirement.id) == changes.c.id).values({**assignments, "updated_at": updated_at})
+    )
+
+
+_CONCURRENT_DELETE = "A referenced client, category or team member was deleted while saving"
+
+
+def create_requirements(items: Sequence[RequirementCreate]) -> dict:
+    """Create many requirements in one transaction.
+
+    The foreign keys of all items are checked with one query and the valid items are written with multi-row
+    INSERTs. Returns ``items``, the created requirement (or ``None``) for each input in order, and ``errors``,
+    a message for the index of every input that was not created.
+    """
+    rows = [Requirement(**item.model_dump()).model_dump(exclude={"id"}) for item in items]
+    created: List[Optional[Requirement]] = [None] * len(rows)
+    with get_session() as session:
+        existing = _existing_references(session, rows)
+        errors = {index: error for index, row in enumerate(rows) if (error := _reference_error(row, existing))}
+        try:
+            for batch in _batches([index for index in range(len(rows)) if index not in errors]):
+                written = session.exec(_written_statement(insert(Requirement).values([rows[i] for i in batch])))
+                # The ids are drawn in VALUES order, so the rows (sorted by id) line up with the batch
+                for index, requirement in zip(batch, written):
+                    created[index] = requirement
+            publish_many(session, "requirement", [requirement.id for requirement in created if requirement])
+            session.expunge_all()
+            session.commit()
+        except IntegrityError:
+            return {
+                "items": [None] * len(rows),
+                "errors": {i: errors.get(i, _CONCURRENT_DELETE) for i in range(len(rows))},
+            }
+    return {"items": created, "errors": errors}
+
+
+def update_requirements(changes: Mapping[int, RequirementUpdate]) -> dict:
+    """Apply many requirement updates in one transaction.
+
+    The foreign keys are checked with one query; updates setting the same fields share a multi-row UPDATE.
+    Returns ``items``, the updated requirements by id, and ``errors``, a message for every id not updated.
+    """
+    rows = {requirement_id: data.model_dump(exclude_unset=True) for requirement_id, data in changes.items()}
+    updated: dict[int, Requirement] = {}
+    with get_session() as session:
+        existing = _existing_references(session, rows.values())
+        errors = {
+            requirement_id: error for requirement_id, row in rows.items() if (error := _reference_error(row, existing))
+        }
+        by_fields: defaultdict[tuple[str, ...], list[int]] = defaultdict(list)
+        for requirement_id, row in rows.items():
+            if requirement_id not in errors:
+                by_fields[tuple(sorted(row))].append(requirement_id)
+        updated_at = datetime.utcnow()
+        try:
+            for fields, requirement_ids in by_fields.items():
+                for batch in _batches(requirement_ids):
+                    data = [(requirement_id, *(rows[requirement_id][f] for f in fields)) for requirement_id in batch]
+                    statement = _written_statement(_bulk_update_statement(fields, data, updated_at))
+                    for requirement in session.exec(statement):
+                        updated[requirement.id] = requirement  # type: ignore[index]
+            publish_many(session, "requirement", list(updated))
+            session.expunge_all()
+            session.commit()
+        except IntegrityError:
+            return {
+                "items": {},
+                "errors": {requirement_id: errors.get(requirement_id, _CONCURRENT_DELETE) for requirement_id in rows},
+            }
+    for requirement_id in rows.keys() - updated.keys() - errors.keys():
+        errors[requirement_id] = "Requirement not found"
+    return {"items": updated, "errors": errors}
+
+
+def delete_requirements(requirement_ids: Sequence[int]) -> dict:
+    """Delete many requirements in one transaction.
+
+    Returns ``deleted``, the ids that were deleted, and ``errors``, a message for every id that was not found.
+    """
+    deleted: List[int] = []
     with get_session() as session:
-        statement = select(Requirement).where(Requirement.client_id == client_id).order_by(desc(Requirement.created_at))
-        requirements = session.exec(statement).all()
+        for batch in _batches(list(dict.fromkeys(requirement_ids))):
+            statement = delete(Requirement).where(col(Requirement.id).in_(batch)).returning(col(Requirement.id))
+            deleted.extend(session.connection().execute(statement).scalars())  # type: ignore[arg-type]
+        publish_many(session, "requirement", deleted)
+        session.commit()
+    missing = set(requirement_ids).difference(deleted)
+    return {"deleted": deleted, "errors": {requirement_id: "Requirement not found" for requirement_id in missing}}
+
+
+def _export_statement(filters: Optional[RequirementFilter]) -> Select:
+    """Requirements with their client, category and assignee names joined in, newest first."""
+    columns = [
+        col(Requirement.id),
+        col(Requirement.title),
+        col(Requirement.description),
+        col(Client.agency_name).label("client"),
+        col(Category.name).label("category"),
+        col(Requirement.priority),
+        col(Requirement.status),
+        col(TeamMember.name).label("assigned_to"),
+        col(Requirement.due_date),
+        col(Requirement.created_at),
+        col(Requirement.updated_at),
+    ]
+    statement = (
+        select(*columns)
+        .join(Client)
+        .join(Category)
+        .outerjoin(TeamMember)
+        .order_by(desc(Requirement.created_at), desc(Requirement.id))
+    )
+    return _apply_filters(statement, filters).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def _export_value(value: Any) -> Any:
+    match value:
+        case Priority() | Status():
+            return value.value
+        case date():  # also covers datetime
+            return value.isoformat()
+    return value
+
+
+def _export_chunk(rows: Sequence[Any], export_format: str) -> str:
+    """Format one batch of export rows as CSV lines or NDJSON objects."""
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([_export_value(value) for value in row] for row in rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps({key: _export_value(value) for key, value in row._mapping.items()}) + "\n" for row in rows
+    )
+
+
+def _export_header(export_format: str) -> Optional[str]:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Cannot export requirements as '{export_format}'")
+    if export_format == "csv":
+        return _export_chunk([_export_statement(None).selected_columns.keys()], "csv")
+    return None
+
+
+def export_requirements(export_format: str = "csv", filters: Optional[RequirementFilter] = None) -> Iterator[str]:
+    """Stream the requirements matching the filters as CSV or NDJSON text chunks.
+
+    Rows come from a server-side cursor ``EXPORT_BATCH_SIZE`` at a time, so memory use does not grow with the
+    number of requirements. The database connection is held until the iterator is exhausted or closed.
+    """
+    header = _export_header(export_format)
+
+    def chunks() -> Iterator[str]:
+        if header is not None:
+            yield header
+        with get_session() as session:
+            for rows in session.exec(_export_statement(filters)).partitions():
+                yield _export_chunk(rows, export_format)
+
+    return chunks()
+
+
+def export_requirements_async(
+    export_format: str = "csv", filters: Optional[RequirementFilter] = None
+) -> AsyncIterator[str]:
+    """Async variant of ``export_requirements``."""
+    header = _export_header(export_format)
+
+    async def chunks() -> AsyncIterator[str]:
+        if header is not None:
+            yield header
+        async with get_async_session() as session:
+            async for rows in (await session.stream(_export_statement(filters))).partitions():
+                yield _export_chunk(rows, export_format)
+
+    return chunks()
 
-        # Load relationships
-        for req in requirements:
-            _ = req.client.agency_name
-            _ = req.category.name
-            if req.team_member:
-                _ = req.team_member.name
 
-        return list(requirements)
+def get_requirements_by_client(client_id: int) -> List[Requirement]:
+    """Get all requirements for a specific client."""
+    with get_session() as session:
+        statement = (
+            select(Requirement)
+            .options(*_related_loaders())
+            .where(Requirement.client_id == client_id)
+            .order_by(desc(Requirement.created_at))
+        )
+        return list(session.exec(statement).all())
 
 
 def get_requirements_by_team_member(team_member_id: int) -> List[Requirement]:
@@ -142,46 +786,53 @@ def get_requirements_by_team_member(team_member_id: int) -> List[Requirement]:
     with get_session() as session:
         statement = (
             select(Requirement)
+            .options(*_related_loaders())
             .where(Requirement.team_member_id == team_member_id)
             .order_by(desc(Requirement.created_at))
         )
-        requirements = session.exec(statement).all()
+        return list(session.exec(statement).all())
 
-        # Load relationships
-        for req in requirements:
-            _ = req.client.agency_name
-            _ = req.category.name
-            if req.team_member:
-                _ = req.team_member.name
 
-        return list(requirements)
+def _summary_statement() -> Select:
+    # Open requirements are counted per due date; the overdue ones are those of the past dates
+    return select(SummaryCount.dimension, SummaryCount.key, SummaryCount.count).where(
+        or_(
+            col(SummaryCount.dimension).in_([TOTAL, STATUS, PRIORITY, CLIENTS, CATEGORIES]),
+            and_(col(SummaryCount.dimension) == OPEN_DUE, col(SummaryCount.key) < date.today().isoformat()),
+        )
+    )
+
+
+def _summarize(rows: Sequence[Any]) -> dict:
+    counts: defaultdict[str, dict[str, int]] = defaultdict(dict)
+    for dimension, key, count in rows:
+        counts[dimension][key] = count
+    return {
+        "total": counts[TOTAL].get("", 0),
+        "by_status": {
+            status.value: counts[STATUS][status.name] for status in Status if counts[STATUS].get(status.name)
+        },
+        "by_priority": {
+            priority.value: counts[PRIORITY][priority.name]
+            for priority in Priority
+            if counts[PRIORITY].get(priority.name)
+        },
+        "overdue": sum(counts[OPEN_DUE].values()),
+        "clients": counts[CLIENTS].get("", 0),
+        "categories": counts[CATEGORIES].get("", 0),
+    }
 
 
 def get_requirements_summary() -> dict:
-    """Get summary statistics for requirements."""
-    with get_session() as session:
-        all_requirements = session.exec(select(Requirement)).all()
-
-        total = len(all_requirements)
-        by_status = {}
-        by_priority = {}
-        overdue = 0
-
-        from datetime import date
+    """Get summary statistics for requirements, plus the number of clients and categories.
 
-        today = date.today()
-
-        for req in all_requirements:
-            # Count by status
-            status_str = req.status.value
-            by_status[status_str] = by_status.get(status_str, 0) + 1
-
-            # Count by priority
-            priority_str = req.priority.value
-            by_priority[priority_str] = by_priority.get(priority_str, 0) + 1
+    Read from the pre-aggregated counts (see ``app.summary``): a few rows, however many requirements exist.
+    """
+    with get_session() as session:
+        return _summarize(session.exec(_summary_statement()).all())
 
-            # Count overdue
-            if req.due_date and req.due_date < today and req.status != Status.DONE:
-                overdue += 1
 
-        return {"total": total, "by_status": by_status, "by_priority": by_priority, "overdue": overdue}
+async def get_requirements_summary_async() -> dict:
+    """Async variant of ``get_requirements_summary``."""
+    async with get_async_session() as session:
+        return _summarize((await session.exec(_summary_statement())).all())
@@ -1,14 +1,79 @@
 from typing import List, Optional
-from sqlmodel import select
-from app.database import get_session
-from app.models import TeamMember, TeamMemberCreate, TeamMemberUpdate
+from sqlalchemy import Exists, String, and_, cast, delete, exists
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import col, func, select
+from sqlmodel.sql.expression import Select
+from app.cache import LOOKUPS
+from app.changes import publish, subscribe
+from app.database import get_async_session, get_session
+from app.models import TeamMember, TeamMemberCreate, TeamMemberUpdate, Requirement, SummaryCount
+from app.services.typeahead import TYPEAHEAD_LIMIT, typeahead_statement
+from app.summary import TEAM_MEMBER
+
+# The first typeahead page, which forms and filters show before anything is typed
+_FIRST_PAGE = ("team_members", "first page")
+
+
+def invalidate_team_member_lookups() -> None:
+    """Drop the cached team member list and first typeahead page; call after every team member write."""
+    LOOKUPS.invalidate("team_members")
+    LOOKUPS.invalidate(_FIRST_PAGE)
+
+
+# Other processes changed a team member: drop our copies
+subscribe("team_member", lambda _: invalidate_team_member_lookups())
 
 
 def get_all_team_members() -> List[TeamMember]:
     """Get all team members ordered by name."""
+    found, team_members, generation = LOOKUPS.get("team_members")
+    if not found:
+        with get_session() as session:
+            team_members = list(session.exec(select(TeamMember).order_by(TeamMember.name)))
+        LOOKUPS.put("team_members", team_members, generation)
+    # A copy, so callers cannot change the cached list
+    return list(team_members)
+
+
+async def get_all_team_members_async() -> List[TeamMember]:
+    """Async variant of ``get_all_team_members``."""
+    found, team_members, generation = LOOKUPS.get("team_members")
+    if not found:
+        async with get_async_session() as session:
+            team_members = list((await session.exec(select(TeamMember).order_by(TeamMember.name))).all())
+        LOOKUPS.put("team_members", team_members, generation)
+    return list(team_members)
+
+
+def search_team_members(search: str, limit: int = TYPEAHEAD_LIMIT) -> List[TeamMember]:
+    """Get the team members whose name contains ``search``, the ones starting with it first.
+
+    The first page for an empty search is cached, so opening a form or filter costs no query.
+    """
+    if not search.strip() and limit == TYPEAHEAD_LIMIT:
+        found, team_members, generation = LOOKUPS.get(_FIRST_PAGE)
+        if not found:
+            with get_session() as session:
+                team_members = list(session.exec(typeahead_statement(TeamMember, TeamMember.name, search, limit)))
+            LOOKUPS.put(_FIRST_PAGE, team_members, generation)
+        return list(team_members)
     with get_session() as session:
-        statement = select(TeamMember).order_by(TeamMember.name)
-        return list(session.exec(statement))
+        return list(session.exec(typeahead_statement(TeamMember, TeamMember.name, search, limit)))
+
+
+async def search_team_members_async(search: str, limit: int = TYPEAHEAD_LIMIT) -> List[TeamMember]:
+    """Async variant of ``search_team_members``."""
+    if not search.strip() and limit == TYPEAHEAD_LIMIT:
+        found, team_members, generation = LOOKUPS.get(_FIRST_PAGE)
+        if not found:
+            async with get_async_session() as session:
+                team_members = list(
+                    (await session.exec(typeahead_statement(TeamMember, TeamMember.name, search, limit))).all()
+                )
+            LOOKUPS.put(_FIRST_PAGE, team_members, generation)
+        return list(team_members)
+    async with get_async_session() as session:
+        return list((await session.exec(typeahead_statement(TeamMember, TeamMember.name, search, limit))).all())
 
 
 def get_team_member_by_id(team_member_id: int) -> Optional[TeamMember]:
@@ -17,14 +82,23 @@ def get_team_member_by_id(team_member_id: int) -> Optional[TeamMember]:
         return session.get(TeamMember, team_member_id)
 
 
+async def get_team_member_by_id_async(team_member_id: int) -> Optional[TeamMember]:
+    """Async variant of ``get_team_member_by_id``."""
+    async with get_async_session() as session:
+        return await session.get(TeamMember, team_member_id)
+
+
 def create_team_member(team_member_data: TeamMemberCreate) -> TeamMember:
     """Create a new team member."""
     with get_session() as session:
         team_member = TeamMember(**team_member_data.model_dump())
         session.add(team_member)
+        session.flush()
+        publish(session, "team_member", team_member.id)
         session.commit()
         session.refresh(team_member)
-        return team_member
+    invalidate_team_member_lookups()
+    return team_member
 
 
 def update_team_member(team_member_id: int, team_member_data: TeamMemberUpdate) -> Optional[TeamMember]:
@@ -39,36 +113,78 @@ def update_team_member(team_member_id: int, team_member_data: TeamMemberUpdate)
             setattr(team_member, field, value)
 
         session.add(team_member)
+        publish(session, "team_member", team_member_id)
         session.commit()
         session.refresh(team_member)
-        return team_member
+    invalidate_team_member_lookups()
+    return team_member
+
+
+def _has_requirements(team_member_id: int) -> Exists:
+    # Answered from the team_member_id index without reading any requirement rows
+    return exists().where(col(Requirement.team_member_id) == team_member_id)
+
+
+def team_member_has_requirements(team_member_id: int) -> bool:
+    """Whether any requirement is assigned to the team member."""
+    with get_session() as session:
+        return session.exec(select(_has_requirements(team_member_id))).one()
+
+
+async def team_member_has_requirements_async(team_member_id: int) -> bool:
+    """Async variant of ``team_member_has_requirements``."""
+    async with get_async_session() as session:
+        return (await session.exec(select(_has_requirements(team_member_id)))).one()
 
 
 def delete_team_member(team_member_id: int) -> bool:
     """Delete a team member if they have no assigned requirements."""
     with get_session() as session:
-        team_member = session.get(TeamMember, team_member_id)
-        if team_member is None:
+        statement = delete(TeamMember).where(col(TeamMember.id) == team_member_id, ~_has_requirements(team_member_id))
+        try:
+            result = session.connection().execute(statement)
+            if result.rowcount > 0:
+                publish(session, "team_member", team_member_id)
+            session.commit()
+        except IntegrityError:
+            # A requirement was linked between the EXISTS check and the delete
             return False
+    if result.rowcount == 0:
+        return False
+    invalidate_team_member_lookups()
+    return True
 
-        # Check if team member has requirements
-        if team_member.requirements:
-            return False
 
-        session.delete(team_member)
-        session.commit()
-        return True
+def team_member_row(team_member: TeamMember, requirement_count: int) -> dict:
+    """Format a team member and its requirement count as a row of the team members table."""
+    return {
+        "id": team_member.id,
+        "name": team_member.name,
+        "requirement_count": requirement_count,
+    }
+
+
+def _team_members_with_counts_statement() -> Select:
+    # The requirement counts are maintained by triggers; no requirement rows are read
+    count_key = and_(
+        col(SummaryCount.dimension) == TEAM_MEMBER, col(SummaryCount.key) == cast(col(TeamMember.id), String)
+    )
+    return (
+        select(TeamMember, func.coalesce(col(SummaryCount.count), 0))
+        .outerjoin(SummaryCount, count_key)
+        .order_by(TeamMember.name)
+    )
 
 
 def get_team_members_with_requirement_counts() -> List[dict]:
     """Get all team members with their requirement counts."""
     with get_session() as session:
-        team_members = session.exec(select(TeamMember).order_by(TeamMember.name)).all()
-        return [
-            {
-                "id": team_member.id,
-                "name": team_member.name,
-                "requirement_count": len(team_member.requirements) if team_member.requirements else 0,
-            }
-            for team_member in team_members
-        ]
+        rows = session.exec(_team_members_with_counts_statement()).all()
+        return [team_member_row(team_member, requirement_count) for team_member, requirement_count in rows]
+
+
+async def get_team_members_with_requirement_counts_async() -> List[dict]:
+    """Async variant of ``get_team_members_with_requirement_counts``."""
+    async with get_async_session() as session:
+        rows = (await session.exec(_team_members_with_counts_statement())).all()
+        return [team_member_row(team_member, requirement_count) for team_member, requirement_count in rows]
@@ -0,0 +1,180 @@
+"""Time series and breakdowns for the dashboard charts.
+
+Everything is read from the counts the triggers maintain (see ``app.summary``). Requirements are counted per
+creation and completion day as they are written, so a trend adds up at most a few thousand day counts, bucketed
+with ``date_trunc`` in SQL, however many requirements there are; only the buckets are returned. The open backlog
+of past buckets follows from today's open count and the requirements created and completed since.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, List, Sequence
+from sqlalchemy import CompoundSelect, DateTime, String, and_, cast, literal_column, null, or_
+from sqlmodel import col, desc, func, select
+from sqlmodel.sql.expression import Select
+from app.database import get_async_session, get_session
+from app.models import Client, Status, SummaryCount, TeamMember
+from app.summary import COMPLETED_DAY, CREATED_DAY, OPEN_DUE_CLIENT, OPEN_TEAM_MEMBER, STATUS, TOTAL
+
+# Date range choices for the trends: label and number of days up to today
+TREND_RANGES: dict[str, tuple[str, int]] = {
+    "30d": ("Last 30 days", 30),
+    "90d": ("Last 90 days", 90),
+    "1y": ("Last 12 months", 365),
+    "3y": ("Last 3 years", 3 * 365),
+}
+DEFAULT_TREND_RANGE = "90d"
+
+# Clients shown in the overdue breakdown, the ones with most overdue requirements first
+OVERDUE_CLIENTS_LIMIT = 10
+
+UNASSIGNED = "Unassigned"
+
+
+def trend_unit(days: int) -> str:
+    """The ``date_trunc`` unit for a range: days for a month, weeks up to a year, then months (at most ~50 points)."""
+    if days <= 31:
+        return "day"
+    return "week" if days <= 366 else "month"
+
+
+def _bucket_start(day: date, unit: str) -> date:
+    # Same buckets as date_trunc: ISO weeks start on Monday
+    if unit == "week":
+        return day - timedelta(days=day.weekday())
+    if unit == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(day: date, unit: str) -> date:
+    if unit == "week":
+        return day + timedelta(days=7)
+    if unit == "month":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def _buckets(days: int, today: date) -> tuple[str, List[date]]:
+    unit = trend_unit(days)
+    bucket = _bucket_start(today - timedelta(days=days - 1), unit)
+    buckets = []
+    while bucket <= today:
+        buckets.append(bucket)
+        bucket = _next_bucket(bucket, unit)
+    return unit, buckets
+
+
+def _trend_statement(unit: str, start: date) -> CompoundSelect:
+    # Created and completed per bucket, plus the total and done counts for today's open backlog
+    days = col(SummaryCount.dimension).in_([CREATED_DAY, COMPLETED_DAY])
+    # The unit is written into the statement: as a parameter, asyncpg would see the GROUP BY as another expression
+    bucket = func.date_trunc(literal_column(f"'{unit}'"), cast(col(SummaryCount.key), DateTime)).label("bucket")
+    return (
+        select(SummaryCount.dimension, bucket, func.sum(SummaryCount.count))
+        .where(days, col(SummaryCount.key) >= start.isoformat())
+        .group_by(SummaryCount.dimension, bucket)
+        .union_all(
+            select(SummaryCount.dimension, null(), SummaryCount.count).where(
+                or_(
+                    col(SummaryCount.dimension) == TOTAL,
+                    and_(col(SummaryCount.dimension) == STATUS, col(SummaryCount.key) == Status.DONE.name),
+                )
+            )
+        )
+    )
+
+
+def _trends(rows: Sequence[Any], unit: str, buckets: List[date]) -> dict:
+    positions = {bucket: position for position, bucket in enumerate(buckets)}
+    series = {CREATED_DAY: [0] * len(buckets), COMPLETED_DAY: [0] * len(buckets)}
+    totals = {TOTAL: 0, STATUS: 0}
+    for dimension, bucket, count in rows:
+        if dimension in totals:
+            totals[dimension] = count
+        elif bucket.date() in positions:
+            series[dimension][positions[bucket.date()]] += count
+    created, completed = series[CREATED_DAY], series[COMPLETED_DAY]
+
+    # Open at the end of each bucket: today's open requirements, less those created since, plus those completed since
+    open_requirements = [0] * len(buckets)
+    remaining = totals[TOTAL] - totals[STATUS]
+    for position in reversed(range(len(buckets))):
+        open_requirements[position] = remaining
+        remaining += completed[position] - created[position]
+    return {
+        "unit": unit,
+        "buckets": [bucket.isoformat() for bucket in buckets],
+        "created": created,
+        "completed": completed,
+        "open": open_requirements,
+    }
+
+
+def get_requirement_trends(days: int) -> dict:
+    """Requirements created, completed and open per bucket over the last ``days`` days, up to today (UTC).
+
+    Buckets are days, weeks or months depending on the range (see ``trend_unit``), listed by their first day.
+    """
+    unit, buckets = _buckets(days, datetime.utcnow().date())
+    with get_session() as session:
+        return _trends(session.connection().execute(_trend_statement(unit, buckets[0])).all(), unit, buckets)
+
+
+async def get_requirement_trends_async(days: int) -> dict:
+    """Async variant of ``get_requirement_trends``."""
+    unit, buckets = _buckets(days, datetime.utcnow().date())
+    async with get_async_session() as session:
+        connection = await session.connection()
+        return _trends((await connection.execute(_trend_statement(unit, buckets[0]))).all(), unit, buckets)
+
+
+def _overdue_by_client_statement(today: date, limit: int) -> Select:
+    # Open requirements are counted per "<due date>:<client id>"; the overdue ones are those of the past dates
+    client_key = func.split_part(col(SummaryCount.key), ":", 2)
+    overdue = func.sum(SummaryCount.count).label("overdue")
+    return (
+        select(Client.agency_name, overdue)
+        .join(SummaryCount, cast(col(Client.id), String) == client_key)
+        .where(col(SummaryCount.dimension) == OPEN_DUE_CLIENT, col(SummaryCount.key) < today.isoformat())
+        .group_by(col(Client.id))
+        .having(overdue > 0)
+        .order_by(desc(overdue), Client.agency_name)
+        .limit(limit)
+    )
+
+
+def get_overdue_by_client(limit: int = OVERDUE_CLIENTS_LIMIT) -> List[tuple[str, int]]:
+    """The clients with the most overdue requirements, as ``(agency name, overdue count)``."""
+    with get_session() as session:
+        return [(name, count) for name, count in session.exec(_overdue_by_client_statement(date.today(), limit))]
+
+
+async def get_overdue_by_client_async(limit: int = OVERDUE_CLIENTS_LIMIT) -> List[tuple[str, int]]:
+    """Async variant of ``get_overdue_by_client``."""
+    async with get_async_session() as session:
+        rows = await session.exec(_overdue_by_client_statement(date.today(), limit))
+        return [(name, count) for name, count in rows]
+
+
+def _team_member_load_statement() -> Select:
+    count_key = cast(col(TeamMember.id), String) == col(SummaryCount.key)
+    return (
+        select(TeamMember.name, SummaryCount.count)
+        .select_from(SummaryCount)
+        .outerjoin(TeamMember, count_key)
+        .where(col(SummaryCount.dimension) == OPEN_TEAM_MEMBER, col(SummaryCount.count) > 0)
+        .order_by(desc(SummaryCount.count), TeamMember.name)
+    )
+
+
+def get_team_member_load() -> List[tuple[str, int]]:
+    """Open requirements per team member, busiest first; unassigned ones under ``UNASSIGNED``."""
+    with get_session() as session:
+        return [(name or UNASSIGNED, count) for name, count in session.exec(_team_member_load_statement())]
+
+
+async def get_team_member_load_async() -> List[tuple[str, int]]:
+    """Async variant of ``get_team_member_load``."""
+    async with get_async_session() as session:
+        rows = await session.exec(_team_member_load_statement())
+        return [(name or UNASSIGNED, count) for name, count in rows]
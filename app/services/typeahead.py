@@ -0,0 +1,29 @@
+from typing import Any, TypeVar
+from sqlalchemy import case
+from sqlmodel import SQLModel, col, select
+from sqlmodel.sql.expression import SelectOfScalar
+
+# Options a typeahead selector shows for one search
+TYPEAHEAD_LIMIT = 20
+MAX_TYPEAHEAD_LIMIT = 100
+
+_Model = TypeVar("_Model", bound=SQLModel)
+
+
+def _escape_like(search: str) -> str:
+    return search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def typeahead_statement(model: type[_Model], name: Any, search: str, limit: int) -> SelectOfScalar[_Model]:
+    """Select up to ``limit`` rows whose ``name`` contains ``search``, names that start with it first.
+
+    The substring match is served by the name's trigram index where the pg_trgm extension is installed; searches
+    shorter than three characters have no trigrams and are answered by the name's B-tree order instead.
+    """
+    search = _escape_like(search.strip())
+    statement = select(model)
+    order = [col(name), col(model.id)]  # type: ignore[attr-defined]
+    if search:
+        statement = statement.where(col(name).ilike(f"%{search}%", escape="\\"))
+        order.insert(0, case((col(name).ilike(f"{search}%", escape="\\"), 0), else_=1))
+    return statement.order_by(*order).limit(min(max(limit, 1), MAX_TYPEAHEAD_LIMIT))
@@ -1,11 +1,22 @@
-from app.database import create_tables
-from nicegui import ui
+from app import export
+from app.changes import start_listener, stop_listener
+from app.database import ENGINE, run_migrations
+from app.summary import start_reconciler, stop_reconciler
+from nicegui import app, ui
 from app.ui import dashboard, client_management, requirement_management, settings
 
 
 def startup() -> None:
     # this function is called before the first request
-    create_tables()
+    run_migrations()
+
+    # Keep in-process caches coherent with writes made by other app processes
+    start_listener()
+    app.on_shutdown(stop_listener)
+
+    # Repair any drift of the dashboard counts now and then
+    start_reconciler(ENGINE)
+    app.on_shutdown(stop_reconciler)
 
     # Register UI modules
     dashboard.create()
@@ -13,6 +24,9 @@ def startup() -> None:
     requirement_management.create()
     settings.create()
 
+    # Register HTTP endpoints
+    export.create()
+
     @ui.page("/")
     def index():
         ui.navigate.to("/dashboard")
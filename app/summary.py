@@ -0,0 +1,326 @@
+"""Pre-aggregated dashboard counts in ``summary_counts``, kept current by PostgreSQL triggers.
+
+Statement-level triggers on requirements, clients and categories work out the net change of every INSERT, UPDATE
+and DELETE from the statement's transition tables. So single saves, bulk statements and COPY imports all keep the
+counts exact without any extra statement from the app, and reading the dashboard numbers touches a handful of rows
+however many requirements exist.
+
+The triggers only stage the changed counts in ``summary_count_changes``; a deferred trigger adds a transaction's
+changes to ``summary_counts`` when it commits, in one statement and in key order, and removes the requirement
+counts that dropped to zero. Writers therefore hold the count rows only while committing and lock just the counts
+they change (the ``total`` only when requirements are created or deleted), always in the same order, so they
+cannot deadlock on them. Overdue requirements depend on the date, so open requirements are counted per due date
+(and per due date and client) and the overdue numbers sum the past dates. Requirements are also counted per
+creation and completion day, which the dashboard trends add up per week or month; a row trigger records when a
+requirement is completed.
+
+``reconcile_summary_counts`` recomputes the counts from the tables and repairs any drift (say, after rows were
+changed with the triggers disabled); ``SummaryReconciler`` runs it periodically in the background.
+"""
+
+import logging
+import os
+import threading
+from typing import Optional
+from sqlalchemy import Connection, Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import Category, Client
+
+logger = logging.getLogger(__name__)
+
+# Dimensions of the requirement counts; keys are enum names, ids, ISO dates (UTC days for creation and completion),
+# "<ISO due date>:<client id>" or "" (no team member)
+TOTAL = "total"
+STATUS = "status"
+PRIORITY = "priority"
+CLIENT = "client"
+CATEGORY = "category"
+TEAM_MEMBER = "team_member"
+OPEN_DUE = "open_due"
+OPEN_DUE_CLIENT = "open_due_client"
+OPEN_TEAM_MEMBER = "open_team_member"
+CREATED_DAY = "created_day"
+COMPLETED_DAY = "completed_day"
+# Row counts of whole tables, under the table's name
+CLIENTS: str = Client.__tablename__  # type: ignore[assignment]
+CATEGORIES: str = Category.__tablename__  # type: ignore[assignment]
+
+RECONCILE_SECONDS = float(os.environ.get("APP_SUMMARY_RECONCILE_SECONDS", 3600))
+# Recounting reads the whole requirements table, which takes longer than the pool's default statement timeout
+RECONCILE_STATEMENT_TIMEOUT = "5min"
+# Arbitrary application-wide key so that reconciliations in several processes do not apply the same repair twice
+RECONCILE_LOCK_KEY = 727_002
+
+# The (dimension, key) pairs one requirement row ``r`` counts towards; NULL keys are not counted
+_REQUIREMENT_KEYS = f"""(VALUES
+    ('{TOTAL}', ''),
+    ('{STATUS}', r.status::text),
+    ('{PRIORITY}', r.priority::text),
+    ('{CLIENT}', r.client_id::text),
+    ('{CATEGORY}', r.category_id::text),
+    ('{TEAM_MEMBER}', coalesce(r.team_member_id::text, '')),
+    ('{OPEN_DUE}', CASE WHEN r.status <> 'DONE' THEN to_char(r.due_date, 'YYYY-MM-DD') END),
+    ('{OPEN_DUE_CLIENT}',
+        CASE WHEN r.status <> 'DONE' THEN to_char(r.due_date, 'YYYY-MM-DD') || ':' || r.client_id END),
+    ('{OPEN_TEAM_MEMBER}', CASE WHEN r.status <> 'DONE' THEN coalesce(r.team_member_id::text, '') END),
+    ('{CREATED_DAY}', to_char(r.created_at, 'YYYY-MM-DD')),
+    ('{COMPLETED_DAY}', to_char(r.completed_at, 'YYYY-MM-DD'))
+) AS k(dimension, key)"""
+
+_COUNTED_COLUMNS = "status, priority, client_id, category_id, team_member_id, due_date, created_at, completed_at"
+
+# Done requirements keep the time they were completed, taken from the write that completed them (or, for rows
+# inserted as done, their last update); reopening clears it
+_COMPLETION_FUNCTION = """
+CREATE OR REPLACE FUNCTION requirements_completed_at() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.status <> 'DONE' THEN
+        NEW.completed_at := NULL;
+    ELSIF TG_OP = 'INSERT' THEN
+        NEW.completed_at := coalesce(NEW.completed_at, NEW.updated_at);
+    ELSIF OLD.status <> 'DONE' THEN
+        NEW.completed_at := CASE WHEN NEW.updated_at IS DISTINCT FROM OLD.updated_at
+            THEN NEW.updated_at ELSE timezone('utc', now()) END;
+    END IF;
+    RETURN NEW;
+END
+$$"""
+
+_CHANGES = {
+    "INSERT": f"SELECT 1 AS delta, {_COUNTED_COLUMNS} FROM new_rows",
+    "UPDATE": f"SELECT 1 AS delta, {_COUNTED_COLUMNS} FROM new_rows "
+    f"UNION ALL SELECT -1, {_COUNTED_COLUMNS} FROM old_rows",
+    "DELETE": f"SELECT -1 AS delta, {_COUNTED_COLUMNS} FROM old_rows",
+}
+
+# Changed counts waiting for the commit of the transaction that changed them; unlogged, since a crash discards
+# them together with their transaction
+_CHANGES_TABLE = """
+CREATE UNLOGGED TABLE IF NOT EXISTS summary_count_changes (
+    dimension varchar(20) NOT NULL,
+    key varchar(40) NOT NULL,
+    delta integer NOT NULL
+)"""
+
+_ADD_REQUIREMENT_CHANGES = f"""
+        INSERT INTO summary_count_changes (dimension, key, delta)
+        SELECT k.dimension, k.key, sum(r.delta)
+        FROM ({{changes}}) r CROSS JOIN LATERAL {_REQUIREMENT_KEYS}
+        WHERE k.key IS NOT NULL
+        GROUP BY k.dimension, k.key
+        HAVING sum(r.delta) <> 0"""
+
+_REQUIREMENT_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION summary_counts_requirements() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN {_ADD_REQUIREMENT_CHANGES.format(changes=_CHANGES["INSERT"])};
+    ELSIF TG_OP = 'UPDATE' THEN {_ADD_REQUIREMENT_CHANGES.format(changes=_CHANGES["UPDATE"])};
+    ELSE {_ADD_REQUIREMENT_CHANGES.format(changes=_CHANGES["DELETE"])};
+    END IF;
+    RETURN NULL;
+END
+$$"""
+
+_ROWS_FUNCTION = """
+CREATE OR REPLACE FUNCTION summary_counts_rows() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    delta integer;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT count(*) INTO delta FROM new_rows;
+    ELSE
+        SELECT -count(*) INTO delta FROM old_rows;
+    END IF;
+    IF delta <> 0 THEN
+        INSERT INTO summary_count_changes (dimension, key, delta) VALUES (TG_TABLE_NAME, '', delta);
+    END IF;
+    RETURN NULL;
+END
+$$"""
+
+# Fired at commit for every staged change; the first call applies them all, later ones find none left. Only this
+# transaction's changes are visible: the others' are uncommitted until they have applied (and deleted) them.
+_APPLY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION summary_counts_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    emptied_dimensions text[];
+    emptied_keys text[];
+BEGIN
+    WITH changes AS (
+        DELETE FROM summary_count_changes RETURNING dimension, key, delta
+    ), applied AS (
+        INSERT INTO summary_counts (dimension, key, count)
+        SELECT dimension, key, sum(delta) FROM changes
+        GROUP BY dimension, key
+        ORDER BY dimension, key
+        ON CONFLICT (dimension, key) DO UPDATE SET count = summary_counts.count + excluded.count
+        RETURNING dimension, key, count
+    )
+    SELECT array_agg(dimension), array_agg(key) INTO emptied_dimensions, emptied_keys
+    FROM applied WHERE count = 0 AND dimension NOT IN ('{TOTAL}', '{CLIENTS}', '{CATEGORIES}');
+    IF emptied_dimensions IS NOT NULL THEN
+        -- Rows this transaction already holds: removing them waits for no one
+        DELETE FROM summary_counts s USING unnest(emptied_dimensions, emptied_keys) AS e(dimension, key)
+        WHERE s.dimension = e.dimension AND s.key = e.key AND s.count = 0;
+    END IF;
+    RETURN NULL;
+END
+$$"""
+
+_TRIGGERS = [
+    ("requirements", "summary_counts_requirements", ("INSERT", "UPDATE", "DELETE")),
+    (CLIENTS, "summary_counts_rows", ("INSERT", "DELETE")),
+    (CATEGORIES, "summary_counts_rows", ("INSERT", "DELETE")),
+]
+
+_TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+# Difference between the counts recomputed from the tables and the stored ones, as of one snapshot; the stored
+# counts include the changes this transaction has staged but not applied yet
+_DRIFT = f"""
+WITH expected AS (
+    SELECT k.dimension, k.key, count(*) AS count
+    FROM requirements r CROSS JOIN LATERAL {_REQUIREMENT_KEYS}
+    WHERE k.key IS NOT NULL
+    GROUP BY k.dimension, k.key
+    UNION ALL SELECT '{CLIENTS}', '', count(*) FROM clients
+    UNION ALL SELECT '{CATEGORIES}', '', count(*) FROM categories
+), stored AS (
+    SELECT dimension, key, sum(count) AS count
+    FROM (SELECT dimension, key, count FROM summary_counts
+          UNION ALL SELECT dimension, key, delta FROM summary_count_changes) c
+    GROUP BY dimension, key
+)
+SELECT dimension, key, coalesce(e.count, 0) - coalesce(s.count, 0) AS delta
+FROM expected e FULL JOIN stored s USING (dimension, key)
+WHERE coalesce(e.count, 0) <> coalesce(s.count, 0)
+ORDER BY dimension, key
+"""
+
+
+def install_summary_triggers(conn: Connection) -> None:
+    """Create (or replace) the trigger functions and the triggers that maintain ``summary_counts``.
+
+    Also the table the changes are staged in, and the row trigger (and column) that records completion times, which
+    the counts per completion day rely on.
+    """
+    conn.execute(text(_CHANGES_TABLE))
+    conn.execute(text(_APPLY_FUNCTION))
+    # Constraint triggers cannot be replaced, and dropping this one would lose the changes already staged for it
+    installed = conn.execute(
+        text("SELECT 1 FROM pg_trigger WHERE tgname = 'summary_counts_apply' AND NOT tgisinternal")
+    ).first()
+    if installed is None:
+        conn.execute(
+            text(
+                "CREATE CONSTRAINT TRIGGER summary_counts_apply AFTER INSERT ON summary_count_changes "
+                "DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION summary_counts_apply()"
+            )
+        )
+    # The column the completion trigger fills; databases from before completion times were recorded lack it when
+    # an earlier migration installs the triggers. Checked first, as adding it locks out even the readers
+    column = conn.execute(
+        text(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = 'requirements' AND column_name = 'completed_at'"
+        )
+    ).first()
+    if column is None:
+        conn.execute(text("ALTER TABLE requirements ADD COLUMN completed_at timestamp without time zone"))
+    conn.execute(text(_COMPLETION_FUNCTION))
+    conn.execute(
+        text(
+            "CREATE OR REPLACE TRIGGER requirements_completed_at BEFORE INSERT OR UPDATE OF status ON requirements "
+            "FOR EACH ROW EXECUTE FUNCTION requirements_completed_at()"
+        )
+    )
+    conn.execute(text(_REQUIREMENT_FUNCTION))
+    conn.execute(text(_ROWS_FUNCTION))
+    for table, function, operations in _TRIGGERS:
+        for operation in operations:
+            conn.execute(
+                text(
+                    f"CREATE OR REPLACE TRIGGER summary_counts_{operation.lower()} AFTER {operation} ON {table} "
+                    f"REFERENCING {_TRANSITION_TABLES[operation]} FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+                )
+            )
+
+
+def reconcile_summary_counts(conn: Connection) -> dict[tuple[str, str], int]:
+    """Recount everything and correct the stored counts; returns the corrections by ``(dimension, key)``.
+
+    The drift is measured in one snapshot and staged as changes, like the triggers do, so changes committed
+    meanwhile stay counted and writers are only held up while the corrections are committed, not by the recount.
+    Requirement counts left at zero are removed.
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY})
+    drift = {(dimension, key): delta for dimension, key, delta in conn.execute(text(_DRIFT))}
+    if drift:
+        conn.execute(
+            text("INSERT INTO summary_count_changes (dimension, key, delta) VALUES (:dimension, :key, :delta)"),
+            [{"dimension": dimension, "key": key, "delta": delta} for (dimension, key), delta in drift.items()],
+        )
+    # Zero counts applied without a change are removed like those a commit empties
+    conn.execute(
+        text(
+            "INSERT INTO summary_count_changes (dimension, key, delta) SELECT dimension, key, 0 FROM summary_counts "
+            "WHERE count = 0 AND dimension NOT IN (:total, :clients, :categories)"
+        ),
+        {"total": TOTAL, "clients": CLIENTS, "categories": CATEGORIES},
+    )
+    return drift
+
+
+class SummaryReconciler:
+    """Background thread that reconciles the summary counts every ``interval`` seconds."""
+
+    def __init__(self, engine: Engine, interval: float = RECONCILE_SECONDS) -> None:
+        self._engine = engine
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="summary-reconciler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def reconcile(self) -> dict[tuple[str, str], int]:
+        with self._engine.begin() as conn:
+            conn.execute(text(f"SET LOCAL statement_timeout = '{RECONCILE_STATEMENT_TIMEOUT}'"))
+            drift = reconcile_summary_counts(conn)
+        if drift:
+            # The triggers keep the counts exact, so drift means they were bypassed
+            logger.warning(f"Repaired {len(drift)} drifted summary counts: {drift}")
+        return drift
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.reconcile()
+            except SQLAlchemyError:
+                logger.exception("Reconciling the summary counts failed")
+
+
+_reconciler: Optional[SummaryReconciler] = None
+
+
+def start_reconciler(engine: Engine) -> SummaryReconciler:
+    """Start this process's reconciler unless it is already running."""
+    global _reconciler
+    if _reconciler is None:
+        _reconciler = SummaryReconciler(engine)
+        _reconciler.start()
+    return _reconciler
+
+
+def stop_reconciler() -> None:
+    global _reconciler
+    if _reconciler is not None:
+        _reconciler.stop()
+        _reconciler = None
@@ -1,17 +1,22 @@
-from nicegui import ui
+from nicegui import run, ui
 from app.services.client_service import (
-    get_clients_with_requirement_counts,
-    get_client_by_id,
+    get_clients_with_requirement_counts_async,
+    get_client_by_id_async,
     create_client,
     update_client,
     delete_client,
+    client_has_requirements_async,
+    client_row,
 )
-from app.models import ClientCreate, ClientUpdate
+from app.services.import_service import import_clients
+from app.models import Client, ClientCreate, ClientUpdate
+from app.ui.import_dialog import show_import_dialog
+from app.ui.table_rows import drop_row, find_row, put_row
 
 
 def create():
     @ui.page("/clients")
-    def clients_page():
+    async def clients_page():
         ui.colors(
             primary="#2563eb",
             secondary="#64748b",
@@ -32,13 +37,18 @@ def create():
         with ui.column().classes("w-full p-6 max-w-7xl mx-auto"):
             with ui.row().classes("justify-between items-center mb-6"):
                 ui.label("Clients").classes("text-2xl font-bold text-gray-800")
-                ui.button("Add New Client", on_click=lambda: show_client_form()).classes(
-                    "bg-primary text-white px-4 py-2 rounded-lg hover:shadow-md"
-                ).props("icon=add")
+                with ui.row().classes("gap-2"):
+                    ui.button("Import CSV", on_click=lambda: show_client_import()).props("outline icon=upload_file")
+                    ui.button("Add New Client", on_click=lambda: show_client_form()).classes(
+                        "bg-primary text-white px-4 py-2 rounded-lg hover:shadow-md"
+                    ).props("icon=add")
+
+            tables: list[ui.table] = []
 
             @ui.refreshable
-            def show_clients_table():
-                clients = get_clients_with_requirement_counts()
+            async def show_clients_table() -> None:
+                tables.clear()
+                clients = await get_clients_with_requirement_counts_async()
 
                 if not clients:
                     with ui.card().classes("p-8 text-center bg-gray-50"):
@@ -66,38 +76,65 @@ def create():
                 ]
 
                 table = ui.table(columns=columns, rows=clients, row_key="id").classes("w-full")
+                tables.append(table)
                 table.add_slot(
                     "body-cell-actions",
                     """
                     <q-td :props="props">
                         <q-btn flat dense icon="edit" color="primary" size="sm" @click="$parent.$emit('edit', props.row)" />
-                        <q-btn flat dense icon="delete" color="negative" size="sm" @click="$parent.$emit('delete', props.row)" />
+                        <q-btn flat dense icon="delete" color="negative" size="sm" :disable="props.row.requirement_count > 0" @click="$parent.$emit('delete', props.row)" />
                         <q-btn flat dense icon="visibility" color="info" size="sm" @click="$parent.$emit('view', props.row)" />
                     </q-td>
                 """,
                 )
 
-                def handle_edit(e):
+                async def handle_edit(e):
                     client_id = e.args["id"]
                     if client_id is not None:
-                        show_client_form(client_id)
+                        await show_client_form(client_id)
 
-                def handle_delete(e):
-                    show_delete_confirmation(e.args["id"], e.args["agency_name"])
+                async def handle_delete(e):
+                    await show_delete_confirmation(e.args["id"], e.args["agency_name"])
 
-                def handle_view(e):
-                    show_client_details(e.args["id"])
+                async def handle_view(e):
+                    await show_client_details(e.args["id"], e.args["requirement_count"])
 
                 table.on("edit", handle_edit)
                 table.on("delete", handle_delete)
                 table.on("view", handle_view)
 
-            show_clients_table()
+            await show_clients_table()
+
+            def show_client_import() -> None:
+                async def show_imported() -> None:
+                    show_clients_table.refresh()
+
+                show_import_dialog(
+                    "Import Clients",
+                    "agency_name, contact_person, email, phone, address and website",
+                    import_clients,
+                    show_imported,
+                )
+
+            def show_saved_client(client: Client) -> None:
+                """Insert or replace the client's row without rebuilding the table."""
+                if not tables:
+                    show_clients_table.refresh()
+                    return
+                shown = find_row(tables[0], client.id) if client.id is not None else None
+                requirement_count = shown["requirement_count"] if shown else 0
+                put_row(tables[0], client_row(client, requirement_count), "agency_name")
+
+            def remove_client_row(client_id: int) -> None:
+                if tables and len(tables[0].rows) > 1:
+                    drop_row(tables[0], client_id)
+                else:
+                    show_clients_table.refresh()  # back to the empty state
 
-            def show_client_form(client_id: int | None = None):
+            async def show_client_form(client_id: int | None = None):
                 client = None
                 if client_id:
-                    client = get_client_by_id(client_id)
+                    client = await get_client_by_id_async(client_id)
                     if client is None:
                         ui.notify("Client not found", type="negative")
                         return
@@ -124,7 +161,7 @@ def create():
                         ui.button("Cancel", on_click=lambda: dialog.close()).props("outline")
                         ui.button("Save", on_click=lambda: save_client()).classes("bg-primary text-white")
 
-                    def save_client():
+                    async def save_client():
                         if not agency_name.value or not contact_person.value or not email.value:
                             ui.notify("Please fill in required fields", type="negative")
                             return
@@ -140,14 +177,14 @@ def create():
                             }
 
                             if client and client.id is not None:
-                                result = update_client(client.id, ClientUpdate(**client_data))
+                                result = await run.io_bound(update_client, client.id, ClientUpdate(**client_data))
                                 if result:
                                     ui.notify("Client updated successfully", type="positive")
                                 else:
                                     ui.notify("Failed to update client", type="negative")
                                     return
                             else:
-                                result = create_client(ClientCreate(**client_data))
+                                result = await run.io_bound(create_client, ClientCreate(**client_data))
                                 if result:
                                     ui.notify("Client created successfully", type="positive")
                                 else:
@@ -155,13 +192,16 @@ def create():
                                     return
 
                             dialog.close()
-                            show_clients_table.refresh()
+                            show_saved_client(result)
                         except Exception as e:
                             ui.notify(f"Error: {str(e)}", type="negative")
 
                 dialog.open()
 
-            def show_delete_confirmation(client_id: int, agency_name: str):
+            async def show_delete_confirmation(client_id: int, agency_name: str):
+                # The table's counts may be stale, so ask the database again before offering the delete
+                in_use = await client_has_requirements_async(client_id)
+
                 with ui.dialog() as dialog, ui.card():
                     ui.label("Confirm Deletion").classes("text-lg font-bold mb-4")
                     ui.label(f'Are you sure you want to delete "{agency_name}"?').classes("mb-2")
@@ -173,20 +213,20 @@ def create():
                         ui.button("Cancel", on_click=lambda: dialog.close()).props("outline")
                         ui.button("Delete", on_click=lambda: delete_client_and_refresh()).classes(
                             "bg-negative text-white"
-                        )
+                        ).set_enabled(not in_use)
 
-                    def delete_client_and_refresh():
-                        if delete_client(client_id):
+                    async def delete_client_and_refresh():
+                        if await run.io_bound(delete_client, client_id):
                             ui.notify("Client deleted successfully", type="positive")
                             dialog.close()
-                            show_clients_table.refresh()
+                            remove_client_row(client_id)
                         else:
                             ui.notify("Cannot delete client with requirements", type="negative")
 
                 dialog.open()
 
-            def show_client_details(client_id: int):
-                client = get_client_by_id(client_id)
+            async def show_client_details(client_id: int, requirement_count: int):
+                client = await get_client_by_id_async(client_id)
                 if client is None:
                     ui.notify("Client not found", type="negative")
                     return
@@ -203,7 +243,7 @@ def create():
                             ui.label(f"Address: {client.address}")
                         if client.website:
                             ui.label(f"Website: {client.website}")
-                        ui.label(f"Requirements: {len(client.requirements)}").classes("text-primary font-semibold")
+                        ui.label(f"Requirements: {requirement_count}").classes("text-primary font-semibold")
 
                     with ui.row().classes("justify-end mt-4"):
                         ui.button("Close", on_click=lambda: dialog.close()).props("outline")
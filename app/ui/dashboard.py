@@ -1,12 +1,36 @@
 from nicegui import ui
-from app.services.requirement_service import get_requirements_summary
-from app.services.client_service import get_all_clients
-from app.services.category_service import get_all_categories
+from app.services.dashboard_service import get_dashboard_breakdowns, get_dashboard_summary, get_dashboard_trends
+from app.services.trend_service import DEFAULT_TREND_RANGE, TREND_RANGES
+from app.feed import watch_requirements
+
+
+def chart_options(chart_type: str, categories: list[str], series: list[dict]) -> dict:
+    """Highcharts options for one chart; each series has an ``id`` naming its data in ``set_series``."""
+    return {
+        "chart": {"type": chart_type},
+        "title": {"text": None},
+        "credits": {"enabled": False},
+        "xAxis": {"categories": categories},
+        "yAxis": {"title": {"text": None}, "allowDecimals": False},
+        "series": series,
+    }
+
+
+def set_series(chart: ui.highchart, categories: list[str], data: dict[str, list[int]]) -> None:
+    """Replace the categories and the data of every series; only the chart's options go to the browser."""
+    chart.options["xAxis"]["categories"] = categories
+    for series in chart.options["series"]:
+        series["data"] = data[series["id"]]
+    chart.update()
+
+
+def bar_data(rows: list[tuple[str, int]]) -> tuple[list[str], dict[str, list[int]]]:
+    return [name for name, _ in rows], {"count": [count for _, count in rows]}
 
 
 def create():
     @ui.page("/dashboard")
-    def dashboard():
+    async def dashboard():
         ui.colors(
             primary="#2563eb",
             secondary="#64748b",
@@ -41,11 +65,15 @@ def create():
             with ui.column().classes("flex-1 ml-6"):
                 ui.label("Dashboard Overview").classes("text-3xl font-bold text-gray-800 mb-6")
 
+                # Labels showing the numbers, so that changes only need to replace their text
+                counters: dict[str, ui.label] = {}
+                breakdowns: dict[str, dict[str, ui.label]] = {"by_status": {}, "by_priority": {}}
+
                 @ui.refreshable
-                def show_summary():
-                    summary = get_requirements_summary()
-                    clients_count = len(get_all_clients())
-                    categories_count = len(get_all_categories())
+                async def show_summary() -> None:
+                    summary = await get_dashboard_summary()
+                    breakdowns["by_status"].clear()
+                    breakdowns["by_priority"].clear()
 
                     # Summary cards
                     with ui.row().classes("gap-6 mb-8 w-full"):
@@ -54,28 +82,38 @@ def create():
                             "p-6 bg-white shadow-lg rounded-xl hover:shadow-xl transition-shadow min-w-48"
                         ):
                             ui.label("Total Requirements").classes("text-sm text-gray-500 uppercase tracking-wider")
-                            ui.label(str(summary["total"])).classes("text-3xl font-bold text-primary mt-2")
+                            counters["total"] = (
+                                ui.label(str(summary["total"]))
+                                .classes("text-3xl font-bold text-primary mt-2")
+                                .mark("total-requirements")
+                            )
 
                         # Clients
                         with ui.card().classes(
                             "p-6 bg-white shadow-lg rounded-xl hover:shadow-xl transition-shadow min-w-48"
                         ):
                             ui.label("Active Clients").classes("text-sm text-gray-500 uppercase tracking-wider")
-                            ui.label(str(clients_count)).classes("text-3xl font-bold text-info mt-2")
+                            counters["clients"] = ui.label(str(summary["clients"])).classes(
+                                "text-3xl font-bold text-info mt-2"
+                            )
 
                         # Categories
                         with ui.card().classes(
                             "p-6 bg-white shadow-lg rounded-xl hover:shadow-xl transition-shadow min-w-48"
                         ):
                             ui.label("Categories").classes("text-sm text-gray-500 uppercase tracking-wider")
-                            ui.label(str(categories_count)).classes("text-3xl font-bold text-accent mt-2")
+                            counters["categories"] = ui.label(str(summary["categories"])).classes(
+                                "text-3xl font-bold text-accent mt-2"
+                            )
 
                         # Overdue
                         with ui.card().classes(
                             "p-6 bg-white shadow-lg rounded-xl hover:shadow-xl transition-shadow min-w-48"
                         ):
                             ui.label("Overdue Items").classes("text-sm text-gray-500 uppercase tracking-wider")
-                            ui.label(str(summary["overdue"])).classes("text-3xl font-bold text-negative mt-2")
+                            counters["overdue"] = ui.label(str(summary["overdue"])).classes(
+                                "text-3xl font-bold text-negative mt-2"
+                            )
 
                     # Status and Priority breakdown
                     with ui.row().classes("gap-6 w-full"):
@@ -85,7 +123,9 @@ def create():
                             for status, count in summary["by_status"].items():
                                 with ui.row().classes("justify-between items-center mb-2"):
                                     ui.label(status).classes("text-gray-700")
-                                    ui.label(str(count)).classes("font-bold text-primary")
+                                    breakdowns["by_status"][status] = ui.label(str(count)).classes(
+                                        "font-bold text-primary"
+                                    )
 
                         # Priority breakdown
                         with ui.card().classes("p-6 bg-white shadow-lg rounded-xl flex-1"):
@@ -94,11 +134,108 @@ def create():
                             for priority, count in summary["by_priority"].items():
                                 with ui.row().classes("justify-between items-center mb-2"):
                                     ui.label(priority).classes("text-gray-700")
-                                    ui.label(str(count)).classes(
+                                    breakdowns["by_priority"][priority] = ui.label(str(count)).classes(
                                         f"font-bold {priority_colors.get(priority, 'text-primary')}"
                                     )
 
-                show_summary()
+                await show_summary()
+
+                async def update_summary(requirement_ids: set[int] | None = None) -> None:
+                    """Send only the changed numbers; rebuild when a breakdown gains or loses a line."""
+                    summary = await get_dashboard_summary()
+                    if any(summary[key].keys() != labels.keys() for key, labels in breakdowns.items()):
+                        show_summary.refresh()
+                        return
+                    for key, label in counters.items():
+                        label.set_text(str(summary[key]))
+                    for key, labels in breakdowns.items():
+                        for name, label in labels.items():
+                            label.set_text(str(summary[key][name]))
+
+                # Trends over a date range; changing the range reloads only these series
+                with ui.card().classes("p-6 bg-white shadow-lg rounded-xl mt-6 w-full"):
+                    with ui.row().classes("justify-between items-center w-full mb-4"):
+                        ui.label("Trends").classes("text-lg font-bold text-gray-800")
+                        trend_range = (
+                            ui.select(
+                                {key: label for key, (label, _) in TREND_RANGES.items()},
+                                value=DEFAULT_TREND_RANGE,
+                                on_change=lambda: update_trends(),
+                            )
+                            .classes("w-48")
+                            .mark("trend-range")
+                        )
+                    trends = await get_dashboard_trends(DEFAULT_TREND_RANGE)
+                    with ui.row().classes("gap-6 w-full no-wrap"):
+                        with ui.column().classes("flex-1"):
+                            ui.label("Created vs Completed").classes("text-gray-700")
+                            flow_chart = (
+                                ui.highchart(
+                                    chart_options(
+                                        "column",
+                                        trends["buckets"],
+                                        [
+                                            {"id": "created", "name": "Created", "data": trends["created"]},
+                                            {"id": "completed", "name": "Completed", "data": trends["completed"]},
+                                        ],
+                                    )
+                                )
+                                .classes("w-full h-64")
+                                .mark("flow-chart")
+                            )
+                        with ui.column().classes("flex-1"):
+                            ui.label("Open Backlog").classes("text-gray-700")
+                            backlog_chart = (
+                                ui.highchart(
+                                    chart_options(
+                                        "area",
+                                        trends["buckets"],
+                                        [{"id": "open", "name": "Open", "data": trends["open"]}],
+                                    )
+                                )
+                                .classes("w-full h-64")
+                                .mark("backlog-chart")
+                            )
+
+                # Current breakdowns, independent of the date range
+                breakdown_rows = await get_dashboard_breakdowns()
+                breakdown_charts: dict[str, ui.highchart] = {}
+                with ui.row().classes("gap-6 w-full mt-6 no-wrap"):
+                    for key, title, name, color in [
+                        ("overdue_by_client", "Overdue by Client", "Overdue", "#ef4444"),
+                        ("team_member_load", "Open Requirements per Team Member", "Open", "#2563eb"),
+                    ]:
+                        with ui.card().classes("p-6 bg-white shadow-lg rounded-xl flex-1"):
+                            ui.label(title).classes("text-lg font-bold text-gray-800 mb-4")
+                            categories, data = bar_data(breakdown_rows[key])
+                            breakdown_charts[key] = (
+                                ui.highchart(
+                                    chart_options(
+                                        "bar",
+                                        categories,
+                                        [{"id": "count", "name": name, "data": data["count"], "color": color}],
+                                    )
+                                )
+                                .classes("w-full h-64")
+                                .mark(key.replace("_", "-"))
+                            )
+
+                async def update_trends() -> None:
+                    trends = await get_dashboard_trends(trend_range.value or DEFAULT_TREND_RANGE)
+                    set_series(flow_chart, trends["buckets"], trends)
+                    set_series(backlog_chart, trends["buckets"], trends)
+
+                async def update_breakdowns() -> None:
+                    rows = await get_dashboard_breakdowns()
+                    for key, chart in breakdown_charts.items():
+                        set_series(chart, *bar_data(rows[key]))
+
+                async def update_dashboard(requirement_ids: set[int] | None = None) -> None:
+                    await update_summary()
+                    await update_trends()
+                    await update_breakdowns()
+
+                watch_requirements(update_dashboard)
 
                 # Quick actions
                 with ui.card().classes("p-6 bg-white shadow-lg rounded-xl mt-6"):
@@ -116,6 +253,6 @@ def create():
 
                 # Refresh button
                 with ui.row().classes("mt-6"):
-                    ui.button("Refresh Data", on_click=show_summary.refresh).classes(
+                    ui.button("Refresh Data", on_click=lambda: update_dashboard()).classes(
                         "bg-accent text-white px-4 py-2 rounded-lg hover:shadow-md"
                     ).props("icon=refresh")
@@ -0,0 +1,58 @@
+import io
+import logging
+from typing import IO, Awaitable, Callable
+from nicegui import background_tasks, events, run, ui
+from nicegui.client import Client
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+# Skipped rows listed in the dialog; the rest are only counted
+MAX_LISTED_ERRORS = 50
+
+
+def show_import_dialog(
+    title: str, columns: str, importer: Callable[[IO[str]], dict], on_imported: Callable[[], Awaitable[None]]
+) -> None:
+    """Let the user upload a CSV file, import it with ``importer`` and list the rows that were skipped."""
+    with ui.dialog() as dialog, ui.card().classes("w-[600px]"):
+        ui.label(title).classes("text-lg font-bold mb-2")
+        ui.label(f"CSV file with a header row and the columns {columns}.").classes("text-sm text-gray-600 mb-2")
+        report = ui.column().classes("w-full gap-1")
+
+        async def import_file(client: Client, data: bytes) -> None:
+            try:
+                # The import runs in a worker thread; the page stays responsive for large files
+                result = await run.io_bound(importer, io.StringIO(data.decode("utf-8-sig"), newline=""))
+            except ValueError as e:
+                logger.info(f"{title} rejected the file: {e}")
+                with client:
+                    ui.notify(f"Import failed: {e}", type="negative")
+                return
+            except SQLAlchemyError:
+                logger.exception(f"{title} failed")
+                with client:
+                    ui.notify("Import failed: the rows could not be saved", type="negative")
+                return
+            with client:
+                ui.notify(f"Imported {result['imported']} rows", type="positive")
+                errors = result["errors"]
+                report.clear()
+                with report:
+                    if errors:
+                        ui.label(f"{len(errors)} rows were skipped:").classes("font-semibold text-negative")
+                        for row_number, error in list(errors.items())[:MAX_LISTED_ERRORS]:
+                            ui.label(f"Row {row_number}: {error}").classes("text-sm text-gray-700")
+                        if len(errors) > MAX_LISTED_ERRORS:
+                            ui.label(f"... and {len(errors) - MAX_LISTED_ERRORS} more").classes("text-sm")
+                await on_imported()
+
+        def handle_upload(e: events.UploadEventArguments) -> None:
+            # Read right away: the uploaded file is closed once the upload request has been answered
+            background_tasks.create(import_file(e.client, e.content.read()), name="csv import")
+
+        ui.upload(on_upload=handle_upload, auto_upload=True).props('accept=".csv"').classes("w-full")
+        with ui.row().classes("justify-end w-full"):
+            ui.button("Close", on_click=lambda: dialog.close()).props("outline")
+
+    dialog.open()
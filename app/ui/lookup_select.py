@@ -0,0 +1,51 @@
+"""Selects that look their options up on the server while the user types.
+
+Only one page of matches is ever sent to the browser, however many clients, categories or team members exist.
+"""
+
+from typing import Any, Awaitable, Callable, Optional
+from nicegui import events, ui
+
+# Typing pauses this long before a lookup runs
+LOOKUP_DEBOUNCE_MS = 250
+
+
+def lookup_select(
+    label: str,
+    search: Callable[[str], Awaitable[dict[Any, str]]],
+    options: dict[Any, str],
+    value: Any = None,
+    fixed_options: Optional[dict[Any, str]] = None,
+    on_change: Optional[Callable[[events.ValueChangeEventArguments], Any]] = None,
+    clearable: bool = False,
+) -> ui.select:
+    """A select showing ``options`` until the user types, then the matches ``search`` returns for the input.
+
+    ``fixed_options`` (like "Unassigned") are always offered first, and the selected option stays among the
+    matches so that it remains displayed. ``options`` must contain ``value``.
+    """
+    fixed_options = fixed_options or {}
+    shown = {**fixed_options, **options}
+    select = ui.select(
+        label=label,
+        options=shown,
+        value=value,
+        with_input=True,
+        on_change=on_change,
+        clearable=clearable,
+    ).props(f"input-debounce={LOOKUP_DEBOUNCE_MS}")
+    latest_search: Optional[str] = None
+
+    async def look_up(e: events.GenericEventArguments) -> None:
+        nonlocal shown, latest_search
+        search_text = latest_search = e.args or ""
+        matches = await search(search_text)
+        if latest_search != search_text:
+            # The user kept typing; the newer lookup fills the options
+            return
+        selected = {key: option for key, option in shown.items() if key == select.value}
+        shown = {**fixed_options, **matches, **selected}
+        select.set_options(shown)
+
+    select.on("filter", look_up, js_handler="(search) => emit(search)")
+    return select
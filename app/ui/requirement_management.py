@@ -1,21 +1,64 @@
 from datetime import date
-from nicegui import ui
+from typing import Iterable
+from urllib.parse import urlencode
+from nicegui import run, ui
 from app.services.requirement_service import (
-    get_all_requirements,
-    get_requirement_by_id,
+    RELEVANCE,
+    DuplicateRequirementError,
+    get_requirements_page_async,
+    get_requirements_by_cursor_async,
+    get_requirement_by_id_async,
     create_requirement,
     update_requirement,
     delete_requirement,
+    update_requirements,
+    delete_requirements,
+    find_similar_requirements_async,
+    requirement_matches,
 )
-from app.services.client_service import get_all_clients
-from app.services.category_service import get_all_categories
-from app.services.team_member_service import get_all_team_members
-from app.models import RequirementCreate, RequirementUpdate, Priority, Status
+from app.services.client_service import search_clients_async
+from app.services.category_service import search_categories_async
+from app.services.team_member_service import search_team_members_async
+from app.services.import_service import import_requirements
+from app.feed import watch_requirements
+from app.ui.import_dialog import show_import_dialog
+from app.ui.lookup_select import lookup_select
+from app.ui.table_rows import drop_row, find_row
+from app.models import Requirement, RequirementCreate, RequirementFilter, RequirementUpdate, Priority, Status
+
+PAGE_SIZE = 25
+
+
+def requirement_row(req: Requirement) -> dict:
+    """Format a requirement as a row of the requirements table."""
+    return {
+        "id": req.id,
+        "title": req.title,
+        "client": req.client.agency_name if req.client else "Unknown",
+        "category": req.category.name if req.category else "Unknown",
+        "priority": req.priority.value,
+        "status": req.status.value,
+        "assigned_to": req.team_member.name if req.team_member else "Unassigned",
+        "due_date": req.due_date.isoformat() if req.due_date else "",
+        "created_at": req.created_at.strftime("%Y-%m-%d"),
+    }
+
+
+async def client_options(search: str = "") -> dict[int | None, str]:
+    return {client.id: client.agency_name for client in await search_clients_async(search)}
+
+
+async def category_options(search: str = "") -> dict[int | None, str]:
+    return {category.id: category.name for category in await search_categories_async(search)}
+
+
+async def team_member_options(search: str = "") -> dict[int | None, str]:
+    return {team_member.id: team_member.name for team_member in await search_team_members_async(search)}
 
 
 def create():
     @ui.page("/requirements")
-    def requirements_page():
+    async def requirements_page():
         ui.colors(
             primary="#2563eb",
             secondary="#64748b",
@@ -36,15 +79,86 @@ def create():
         with ui.column().classes("w-full p-6 max-w-7xl mx-auto"):
             with ui.row().classes("justify-between items-center mb-6"):
                 ui.label("Requirements").classes("text-2xl font-bold text-gray-800")
-                ui.button("Add New Requirement", on_click=lambda: show_requirement_form()).classes(
-                    "bg-primary text-white px-4 py-2 rounded-lg hover:shadow-md"
-                ).props("icon=add")
+                with ui.row().classes("gap-2"):
+                    ui.button("Import CSV", on_click=lambda: show_requirement_import()).props(
+                        "outline icon=upload_file"
+                    )
+                    ui.button("Export CSV", on_click=lambda: download_export()).props("outline icon=download")
+                    ui.button("Add New Requirement", on_click=lambda: show_requirement_form()).classes(
+                        "bg-primary text-white px-4 py-2 rounded-lg hover:shadow-md"
+                    ).props("icon=add")
+
+            filters = RequirementFilter()
+            pagination = {"page": 1, "rowsPerPage": PAGE_SIZE, "sortBy": "created_at", "descending": True}
+            tables: list[ui.table] = []
+            shown: dict = {}  # cursors and total of the page currently displayed
+
+            async def load_page(step: int = 0) -> None:
+                """Query the current page only and push it into the existing table.
+
+                ``step`` is +1/-1 when moving to an adjacent page, which is then fetched by cursor.
+                """
+                if not tables:
+                    return
+                cursor = {1: shown.get("next_cursor"), -1: shown.get("prev_cursor")}.get(step)
+                if cursor is not None:
+                    result = await get_requirements_by_cursor_async(
+                        cursor, limit=pagination["rowsPerPage"], filters=filters
+                    )
+                    result["total"] = shown["total"]
+                else:
+                    result = await get_requirements_page_async(
+                        page=pagination["page"],
+                        page_size=pagination["rowsPerPage"],
+                        sort_by=pagination["sortBy"],
+                        descending=pagination["descending"],
+                        filters=filters,
+                    )
+                shown.update(
+                    next_cursor=result.get("next_cursor"), prev_cursor=result.get("prev_cursor"), total=result["total"]
+                )
+                table = tables[0]
+                table.rows = [requirement_row(req) for req in result["items"]]
+                table.pagination = {**pagination, "rowsNumber": result["total"]}
+
+            def download_export() -> None:
+                # The export streams every matching requirement, not just the page on screen
+                query = urlencode({**filters.model_dump(mode="json", exclude_none=True), "format": "csv"})
+                ui.download.from_url(f"/export/requirements?{query}", filename="requirements.csv")
+
+            def show_requirement_import() -> None:
+                show_import_dialog(
+                    "Import Requirements",
+                    "title, client and category, plus optionally description, priority, status, due_date and "
+                    "assigned_to (names as shown in the app)",
+                    import_requirements,
+                    lambda: apply_requirement_changes(None),
+                )
 
-            @ui.refreshable
-            def show_requirements_table():
-                requirements = get_all_requirements()
+            async def apply_filter(field: str, value) -> None:
+                # Validate through the schema so "To Do" becomes Status.TODO and "2024-01-31" a date
+                validated = RequirementFilter.model_validate({field: value or None})
+                setattr(filters, field, getattr(validated, field))
+                pagination["page"] = 1
+                await load_page()
 
-                if not requirements:
+            async def apply_search(value: str | None) -> None:
+                search = RequirementFilter.model_validate({"search": (value or "").strip() or None}).search
+                if search == filters.search:
+                    return
+                filters.search = search
+                # Best matches first while searching, newest first again once the search is cleared
+                if search and pagination["sortBy"] != RELEVANCE:
+                    pagination.update(sortBy=RELEVANCE, descending=True)
+                elif not search and pagination["sortBy"] == RELEVANCE:
+                    pagination.update(sortBy="created_at", descending=True)
+                pagination["page"] = 1
+                await load_page()
+
+            @ui.refreshable
+            async def show_requirements_table() -> None:
+                tables.clear()
+                if (await get_requirements_page_async(page_size=1))["total"] == 0:
                     with ui.card().classes("p-8 text-center bg-gray-50"):
                         ui.icon("assignment", size="4rem").classes("text-gray-400 mb-4")
                         ui.label("No requirements found").classes("text-xl text-gray-600 mb-2")
@@ -54,36 +168,127 @@ def create():
                         ).props("icon=add")
                     return
 
-                # Format data for table
-                table_data = []
-                for req in requirements:
-                    table_data.append(
-                        {
-                            "id": req.id,
-                            "title": req.title,
-                            "client": req.client.agency_name if req.client else "Unknown",
-                            "category": req.category.name if req.category else "Unknown",
-                            "priority": req.priority.value,
-                            "status": req.status.value,
-                            "assigned_to": req.team_member.name if req.team_member else "Unassigned",
-                            "due_date": req.due_date.isoformat() if req.due_date else "",
-                            "created_at": req.created_at.strftime("%Y-%m-%d"),
-                        }
+                # Debounced, so a query runs once typing pauses rather than on every keystroke
+                with (
+                    ui.input(
+                        placeholder="Search titles and descriptions",
+                        value=filters.search or "",
+                        on_change=lambda e: apply_search(e.value),
+                    )
+                    .props("debounce=300 clearable maxlength=200 outlined dense")
+                    .classes("w-full mb-2")
+                    .add_slot("prepend")
+                ):
+                    ui.icon("search")
+
+                # Filters re-query the current page only
+                with ui.row().classes("gap-4 mb-4 w-full items-end"):
+                    ui.select(
+                        label="Status",
+                        options={s.value: s.value for s in Status},
+                        clearable=True,
+                        on_change=lambda e: apply_filter("status", e.value),
+                    ).classes("w-36")
+                    ui.select(
+                        label="Priority",
+                        options={p.value: p.value for p in Priority},
+                        clearable=True,
+                        on_change=lambda e: apply_filter("priority", e.value),
+                    ).classes("w-36")
+                    lookup_select(
+                        "Client",
+                        client_options,
+                        await client_options(),
+                        clearable=True,
+                        on_change=lambda e: apply_filter("client_id", e.value),
+                    ).classes("w-48")
+                    lookup_select(
+                        "Category",
+                        category_options,
+                        await category_options(),
+                        clearable=True,
+                        on_change=lambda e: apply_filter("category_id", e.value),
+                    ).classes("w-48")
+                    lookup_select(
+                        "Assigned To",
+                        team_member_options,
+                        await team_member_options(),
+                        clearable=True,
+                        on_change=lambda e: apply_filter("team_member_id", e.value),
+                    ).classes("w-48")
+                    ui.input("Due from", on_change=lambda e: apply_filter("due_from", e.value)).props("type=date")
+                    ui.input("Due to", on_change=lambda e: apply_filter("due_to", e.value)).props("type=date")
+
+                def bulk_menu_item(label: str, requirement_data: RequirementUpdate) -> None:
+                    ui.menu_item(label, on_click=lambda: update_selected(requirement_data))
+
+                # Actions on the selected rows, shown while there is a selection
+                with ui.row().classes("gap-2 mb-2 items-center") as bulk_actions:
+                    selected_label = ui.label().classes("text-sm text-gray-600")
+                    with ui.button("Set Status", icon="flag").props("outline"):
+                        with ui.menu():
+                            for status in Status:
+                                bulk_menu_item(status.value, RequirementUpdate(status=status))
+                    with ui.button("Set Priority", icon="priority_high").props("outline"):
+                        with ui.menu():
+                            for priority in Priority:
+                                bulk_menu_item(priority.value, RequirementUpdate(priority=priority))
+                    with ui.button("Assign To", icon="person").props("outline"):
+                        # Team members are looked up while typing, like in the requirement form
+                        with ui.menu() as assign_menu, ui.column().classes("p-2"):
+                            assignee_select = (
+                                lookup_select(
+                                    "Team Member",
+                                    team_member_options,
+                                    await team_member_options(),
+                                    fixed_options={None: "Unassigned"},
+                                )
+                                .classes("w-48")
+                                .mark("bulk-assignee")
+                            )
+                            ui.button(
+                                "Assign", on_click=lambda: assign_selected(assign_menu, assignee_select.value)
+                            ).props("flat").mark("bulk-assign")
+                    with ui.button("Set Due Date", icon="event").props("outline"):
+                        with ui.menu() as due_date_menu:
+                            ui.date(on_change=lambda e: set_selected_due_date(due_date_menu, e.value))
+                            ui.menu_item("Clear Due Date", on_click=lambda: set_selected_due_date(due_date_menu, None))
+                    ui.button("Delete", icon="delete", on_click=lambda: show_bulk_delete_confirmation()).props(
+                        "outline color=negative"
                     )
 
                 # Requirements table
                 columns = [
-                    {"name": "title", "label": "Title", "field": "title", "align": "left"},
-                    {"name": "client", "label": "Client", "field": "client", "align": "left"},
-                    {"name": "category", "label": "Category", "field": "category", "align": "left"},
-                    {"name": "priority", "label": "Priority", "field": "priority", "align": "center"},
-                    {"name": "status", "label": "Status", "field": "status", "align": "center"},
-                    {"name": "assigned_to", "label": "Assigned To", "field": "assigned_to", "align": "left"},
-                    {"name": "due_date", "label": "Due Date", "field": "due_date", "align": "center"},
+                    {"name": "title", "label": "Title", "field": "title", "align": "left", "sortable": True},
+                    {"name": "client", "label": "Client", "field": "client", "align": "left", "sortable": True},
+                    {"name": "category", "label": "Category", "field": "category", "align": "left", "sortable": True},
+                    {"name": "priority", "label": "Priority", "field": "priority", "align": "center", "sortable": True},
+                    {"name": "status", "label": "Status", "field": "status", "align": "center", "sortable": True},
+                    {
+                        "name": "assigned_to",
+                        "label": "Assigned To",
+                        "field": "assigned_to",
+                        "align": "left",
+                        "sortable": True,
+                    },
+                    {"name": "due_date", "label": "Due Date", "field": "due_date", "align": "center", "sortable": True},
                     {"name": "actions", "label": "Actions", "field": "actions", "align": "center"},
                 ]
 
-                table = ui.table(columns=columns, rows=table_data, row_key="id").classes("w-full")
+                table = (
+                    ui.table(
+                        columns=columns,
+                        rows=[],
+                        row_key="id",
+                        pagination={**pagination, "rowsNumber": 0},
+                        selection="multiple",
+                    )
+                    .classes("w-full")
+                    .props(f"rows-per-page-options=[10,{PAGE_SIZE},50,100]")
+                )
+                tables.append(table)
+                bulk_actions.bind_visibility_from(table, "selected", backward=bool)
+                selected_label.bind_text_from(table, "selected", backward=lambda rows: f"{len(rows)} selected")
 
                 # Custom slots for priority and status with colors
                 table.add_slot(
@@ -117,35 +322,190 @@ def create():
                 """,
                 )
 
-                def handle_edit(e):
+                async def handle_request(e):
+                    # Quasar asks for a new page/sort; only that page is queried and sent
+                    requested = e.args["pagination"]
+                    previous = dict(pagination)
+                    pagination.update(
+                        page=requested.get("page", 1),
+                        rowsPerPage=requested.get("rowsPerPage") or PAGE_SIZE,
+                        sortBy=requested.get("sortBy") or "created_at",
+                        descending=requested.get("descending", True),
+                    )
+                    same_order = all(
+                        pagination[key] == previous[key] for key in ("rowsPerPage", "sortBy", "descending")
+                    )
+                    step = pagination["page"] - previous["page"]
+                    await load_page(step if same_order and step in (-1, 1) else 0)
+
+                async def handle_edit(e):
                     requirement_id = e.args["id"]
                     if requirement_id is not None:
-                        show_requirement_form(requirement_id)
+                        await show_requirement_form(requirement_id)
 
                 def handle_delete(e):
                     show_delete_confirmation(e.args["id"], e.args["title"])
 
-                def handle_view(e):
-                    show_requirement_details(e.args["id"])
+                async def handle_view(e):
+                    await show_requirement_details(e.args["id"])
 
+                table.on("request", handle_request)
                 table.on("edit", handle_edit)
                 table.on("delete", handle_delete)
                 table.on("view", handle_view)
+                await load_page()
+
+            await show_requirements_table()
+
+            # Changes this page made and already shows; their notifications need no work
+            handled_here: set[int] = set()
+
+            def set_total(total: int) -> None:
+                shown["total"] = total
+                tables[0].pagination = {**pagination, "rowsNumber": total}
+
+            def patch_rows(requirement_id: int, requirement: Requirement | None, created: bool) -> bool:
+                """Apply one change to the rows on screen; False when only a page query can place it."""
+                if filters.search:
+                    # Whether the row still matches the search, and where it ranks, only a query can tell
+                    return False
+                table = tables[0]
+                row = find_row(table, requirement_id)
+                matches = requirement is not None and requirement_matches(requirement, filters)
+                if row is not None and requirement is not None and matches:
+                    table.rows[table.rows.index(row)] = requirement_row(requirement)
+                    table.update()
+                    return True
+                if row is not None:
+                    # Deleted or filtered out: the page keeps its other rows
+                    drop_row(table, requirement_id)
+                    set_total(shown["total"] - 1)
+                    return True
+                newest_first = (
+                    pagination["page"] == 1 and pagination["sortBy"] == "created_at" and pagination["descending"]
+                )
+                if requirement is not None and created and matches and newest_first:
+                    table.rows.insert(0, requirement_row(requirement))
+                    del table.rows[pagination["rowsPerPage"] :]
+                    # The cursor may point past a row that was just pushed off this page
+                    shown["next_cursor"] = None
+                    set_total(shown["total"] + 1)
+                    return True
+                return False
+
+            async def apply_change(requirement_id: int, requirement: Requirement | None, created: bool = False) -> None:
+                """Update the page in place after a change; query it again only when rows must be backfilled."""
+                if not tables:
+                    # The empty state is replaced once the first requirement exists
+                    show_requirements_table.refresh()
+                elif not patch_rows(requirement_id, requirement, created):
+                    await load_page()
+                elif shown["total"] == 0:
+                    show_requirements_table.refresh()
+                elif not tables[0].rows:
+                    # The last row of the last page is gone
+                    pagination["page"] = max(pagination["page"] - 1, 1)
+                    await load_page()
+
+            async def apply_requirement_changes(requirement_ids: set[int] | None) -> None:
+                """Bring changes made by anyone, including this page, onto the screen."""
+                if not tables:
+                    show_requirements_table.refresh()
+                    return
+                if requirement_ids is None:
+                    await load_page()
+                    return
+                own = requirement_ids & handled_here
+                handled_here.difference_update(own)
+                requirement_ids = requirement_ids - own
+                if len(requirement_ids) > 1:
+                    # One page query is cheaper than fetching every changed requirement
+                    await reload_page()
+                    return
+                for requirement_id in requirement_ids:
+                    await apply_change(requirement_id, await get_requirement_by_id_async(requirement_id))
+
+            watch_requirements(apply_requirement_changes)
+
+            async def reload_page() -> None:
+                """Query the current page again, stepping back or to the empty state when its rows are gone."""
+                await load_page()
+                if shown["total"] == 0:
+                    show_requirements_table.refresh()
+                elif not tables[0].rows:
+                    pagination["page"] = -(-shown["total"] // pagination["rowsPerPage"])
+                    await load_page()
+
+            def report_bulk_result(action: str, done: int, errors: dict) -> None:
+                if done:
+                    ui.notify(f"{action} {done} requirement{'s' if done != 1 else ''}", type="positive")
+                if errors:
+                    first_error = next(iter(errors.values()))
+                    ui.notify(f"{len(errors)} could not be changed: {first_error}", type="negative")
+
+            async def finish_bulk_action(failed_ids: Iterable[int]) -> None:
+                """Clear the selection and show the result with one page query."""
+                # Failed requirements are not notified; left registered, they would hide a later change
+                handled_here.difference_update(failed_ids)
+                tables[0].selected = []
+                await reload_page()
+
+            async def update_selected(requirement_data: RequirementUpdate) -> None:
+                """Apply the same change to every selected requirement with one set-based UPDATE."""
+                requirement_ids = [row["id"] for row in tables[0].selected]
+                # Registered before the write: its notifications may arrive before the write returns
+                handled_here.update(requirement_ids)
+                result = await run.io_bound(
+                    update_requirements, {requirement_id: requirement_data for requirement_id in requirement_ids}
+                )
+                report_bulk_result("Updated", len(result["items"]), result["errors"])
+                await finish_bulk_action(result["errors"])
+
+            async def set_selected_due_date(menu: ui.menu, value: str | None) -> None:
+                menu.close()
+                await update_selected(RequirementUpdate.model_validate({"due_date": value or None}))
+
+            async def assign_selected(menu: ui.menu, team_member_id: int | None) -> None:
+                menu.close()
+                await update_selected(RequirementUpdate(team_member_id=team_member_id))
+
+            def show_bulk_delete_confirmation() -> None:
+                requirement_ids = [row["id"] for row in tables[0].selected]
+                with ui.dialog() as dialog, ui.card():
+                    ui.label("Confirm Deletion").classes("text-lg font-bold mb-4")
+                    ui.label(f"Are you sure you want to delete {len(requirement_ids)} requirements?").classes("mb-2")
+                    ui.label("This action cannot be undone.").classes("text-sm text-gray-600 mb-4")
 
-            show_requirements_table()
+                    with ui.row().classes("gap-2 justify-end w-full"):
+                        ui.button("Cancel", on_click=lambda: dialog.close()).props("outline")
+                        ui.button("Delete", on_click=lambda: delete_selected()).classes("bg-negative text-white")
 
-            def show_requirement_form(requirement_id: int | None = None):
+                    async def delete_selected():
+                        handled_here.update(requirement_ids)
+                        result = await run.io_bound(delete_requirements, requirement_ids)
+                        dialog.close()
+                        report_bulk_result("Deleted", len(result["deleted"]), result["errors"])
+                        await finish_bulk_action(result["errors"])
+
+                dialog.open()
+
+            async def show_requirement_form(requirement_id: int | None = None):
                 requirement = None
                 if requirement_id:
-                    requirement = get_requirement_by_id(requirement_id)
+                    requirement = await get_requirement_by_id_async(requirement_id)
                     if requirement is None:
                         ui.notify("Requirement not found", type="negative")
                         return
 
-                # Get options for dropdowns
-                clients = get_all_clients()
-                categories = get_all_categories()
-                team_members = get_all_team_members()
+                # First options of each dropdown; typing looks up the matching ones
+                clients = await client_options()
+                categories = await category_options()
+                team_members = await team_member_options()
+                if requirement:
+                    clients[requirement.client_id] = requirement.client.agency_name
+                    categories[requirement.category_id] = requirement.category.name
+                    if requirement.team_member:
+                        team_members[requirement.team_member_id] = requirement.team_member.name
 
                 if not clients:
                     ui.notify("Please add clients first", type="negative")
@@ -169,17 +529,14 @@ def create():
                         .props("rows=3")
                     )
 
-                    # Client dropdown
-                    client_options = {c.id: c.agency_name for c in clients}
-                    client_select = ui.select(
-                        label="Client", options=client_options, value=requirement.client_id if requirement else None
+                    client_select = lookup_select(
+                        "Client", client_options, clients, value=requirement.client_id if requirement else None
                     ).classes("w-full mb-2")
 
-                    # Category dropdown
-                    category_options = {c.id: c.name for c in categories}
-                    category_select = ui.select(
-                        label="Category",
-                        options=category_options,
+                    category_select = lookup_select(
+                        "Category",
+                        category_options,
+                        categories,
                         value=requirement.category_id if requirement else None,
                     ).classes("w-full mb-2")
 
@@ -200,12 +557,12 @@ def create():
                     ).classes("w-full mb-2")
 
                     # Team member dropdown (optional)
-                    team_member_options = {tm.id: tm.name for tm in team_members}
-                    team_member_options[None] = "Unassigned"
-                    team_member_select = ui.select(
-                        label="Assigned To",
-                        options=team_member_options,
+                    team_member_select = lookup_select(
+                        "Assigned To",
+                        team_member_options,
+                        team_members,
                         value=requirement.team_member_id if requirement else None,
+                        fixed_options={None: "Unassigned"},
                     ).classes("w-full mb-2")
 
                     # Due date
@@ -217,11 +574,47 @@ def create():
                         .props('label="Due Date"')
                     )
 
+                    # Likely duplicates of a new requirement, shown before it is saved
+                    duplicates_panel = ui.column().classes("w-full gap-1 mb-2")
+                    shown_duplicates: list[tuple[Requirement, float]] = []
+
                     with ui.row().classes("gap-2 justify-end w-full"):
                         ui.button("Cancel", on_click=lambda: dialog.close()).props("outline")
-                        ui.button("Save", on_click=lambda: save_requirement()).classes("bg-primary text-white")
+                        save_button = ui.button("Save", on_click=lambda: save_requirement()).classes(
+                            "bg-primary text-white"
+                        )
+
+                    def show_duplicates(duplicates: list[tuple[Requirement, float]]) -> None:
+                        shown_duplicates[:] = duplicates
+                        duplicates_panel.clear()
+                        with duplicates_panel:
+                            if duplicates:
+                                ui.label("This looks like an open requirement of the same client:").classes(
+                                    "text-sm font-semibold text-warning"
+                                )
+                            for duplicate, similarity in duplicates:
+                                ui.label(
+                                    f"{duplicate.title} ({duplicate.status.value}, {similarity:.0%} similar)"
+                                ).classes("text-sm text-gray-700")
+                        save_button.text = "Save Anyway" if duplicates else "Save"
+
+                    async def check_duplicates() -> None:
+                        if not title_input.value or not client_select.value:
+                            show_duplicates([])
+                            return
+                        show_duplicates(
+                            await find_similar_requirements_async(
+                                client_select.value, title_input.value, description_input.value or ""
+                            )
+                        )
+
+                    if requirement is None:
+                        # Once per finished field rather than per keystroke
+                        title_input.on("blur", check_duplicates)
+                        description_input.on("blur", check_duplicates)
+                        client_select.on_value_change(check_duplicates)
 
-                    def save_requirement():
+                    async def save_requirement():
                         if not title_input.value or not client_select.value or not category_select.value:
                             ui.notify("Please fill in required fields", type="negative")
                             return
@@ -241,14 +634,21 @@ def create():
                             }
 
                             if requirement and requirement.id is not None:
-                                result = update_requirement(requirement.id, RequirementUpdate(**requirement_data))
+                                result = await run.io_bound(
+                                    update_requirement, requirement.id, RequirementUpdate(**requirement_data)
+                                )
                                 if result:
                                     ui.notify("Requirement updated successfully", type="positive")
                                 else:
                                     ui.notify("Failed to update requirement", type="negative")
                                     return
                             else:
-                                result = create_requirement(RequirementCreate(**requirement_data))
+                                # Duplicates the user has seen do not stop the save again
+                                result = await run.io_bound(
+                                    create_requirement,
+                                    RequirementCreate(**requirement_data),
+                                    check_duplicates=not shown_duplicates,
+                                )
                                 if result:
                                     ui.notify("Requirement created successfully", type="positive")
                                 else:
@@ -256,7 +656,10 @@ def create():
                                     return
 
                             dialog.close()
-                            show_requirements_table.refresh()
+                            if result.id is not None:
+                                await apply_change(result.id, result, created=requirement is None)
+                        except DuplicateRequirementError as e:
+                            show_duplicates(e.duplicates)
                         except Exception as e:
                             ui.notify(f"Error: {str(e)}", type="negative")
 
@@ -274,18 +677,21 @@ def create():
                             "bg-negative text-white"
                         )
 
-                    def delete_requirement_and_refresh():
-                        if delete_requirement(requirement_id):
+                    async def delete_requirement_and_refresh():
+                        # Registered before the write: its notification may arrive before the write returns
+                        handled_here.add(requirement_id)
+                        if await run.io_bound(delete_requirement, requirement_id):
                             ui.notify("Requirement deleted successfully", type="positive")
                             dialog.close()
-                            show_requirements_table.refresh()
+                            await apply_change(requirement_id, None)
                         else:
+                            handled_here.discard(requirement_id)
                             ui.notify("Failed to delete requirement", type="negative")
 
                 dialog.open()
 
-            def show_requirement_details(requirement_id: int):
-                requirement = get_requirement_by_id(requirement_id)
+            async def show_requirement_details(requirement_id: int):
+                requirement = await get_requirement_by_id_async(requirement_id)
                 if requirement is None:
                     ui.notify("Requirement not found", type="negative")
                     return
@@ -1,24 +1,29 @@
-from nicegui import ui
+from nicegui import run, ui
 from app.services.category_service import (
-    get_categories_with_requirement_counts,
-    get_category_by_id,
+    get_categories_with_requirement_counts_async,
+    get_category_by_id_async,
     create_category,
     update_category,
     delete_category,
+    category_has_requirements_async,
+    category_row,
 )
 from app.services.team_member_service import (
-    get_team_members_with_requirement_counts,
-    get_team_member_by_id,
+    get_team_members_with_requirement_counts_async,
+    get_team_member_by_id_async,
     create_team_member,
     update_team_member,
     delete_team_member,
+    team_member_has_requirements_async,
+    team_member_row,
 )
-from app.models import CategoryCreate, CategoryUpdate, TeamMemberCreate, TeamMemberUpdate
+from app.models import Category, CategoryCreate, CategoryUpdate, TeamMember, TeamMemberCreate, TeamMemberUpdate
+from app.ui.table_rows import drop_row, find_row, put_row
 
 
 def create():
     @ui.page("/settings")
-    def settings_page():
+    async def settings_page():
         ui.colors(
             primary="#2563eb",
             secondary="#64748b",
@@ -39,6 +44,9 @@ def create():
         with ui.column().classes("w-full p-6 max-w-6xl mx-auto"):
             ui.label("Application Settings").classes("text-2xl font-bold text-gray-800 mb-6")
 
+            category_tables: list[ui.table] = []
+            team_member_tables: list[ui.table] = []
+
             # Categories Section
             with ui.card().classes("p-6 mb-6 shadow-lg rounded-xl"):
                 with ui.row().classes("justify-between items-center mb-4"):
@@ -48,8 +56,9 @@ def create():
                     ).props("icon=add")
 
                 @ui.refreshable
-                def show_categories_section():
-                    categories = get_categories_with_requirement_counts()
+                async def show_categories_section() -> None:
+                    category_tables.clear()
+                    categories = await get_categories_with_requirement_counts_async()
 
                     if not categories:
                         with ui.row().classes("items-center justify-center p-8 bg-gray-50 rounded-lg"):
@@ -72,28 +81,44 @@ def create():
                     ]
 
                     table = ui.table(columns=columns, rows=categories, row_key="id").classes("w-full")
+                    category_tables.append(table)
                     table.add_slot(
                         "body-cell-actions",
                         """
                         <q-td :props="props">
                             <q-btn flat dense icon="edit" color="primary" size="sm" @click="$parent.$emit('edit', props.row)" />
-                            <q-btn flat dense icon="delete" color="negative" size="sm" @click="$parent.$emit('delete', props.row)" />
+                            <q-btn flat dense icon="delete" color="negative" size="sm" :disable="props.row.requirement_count > 0" @click="$parent.$emit('delete', props.row)" />
                         </q-td>
                     """,
                     )
 
-                    def handle_edit_category(e):
+                    async def handle_edit_category(e):
                         category_id = e.args["id"]
                         if category_id is not None:
-                            show_category_form(category_id)
+                            await show_category_form(category_id)
 
-                    def handle_delete_category(e):
-                        show_category_delete_confirmation(e.args["id"], e.args["name"])
+                    async def handle_delete_category(e):
+                        await show_category_delete_confirmation(e.args["id"], e.args["name"])
 
                     table.on("edit", handle_edit_category)
                     table.on("delete", handle_delete_category)
 
-                show_categories_section()
+                await show_categories_section()
+
+                def show_saved_category(category: Category) -> None:
+                    """Insert or replace the row without rebuilding the table."""
+                    if not category_tables:
+                        show_categories_section.refresh()
+                        return
+                    shown = find_row(category_tables[0], category.id) if category.id is not None else None
+                    requirement_count = shown["requirement_count"] if shown else 0
+                    put_row(category_tables[0], category_row(category, requirement_count), "name")
+
+                def remove_category_row(category_id: int) -> None:
+                    if category_tables and len(category_tables[0].rows) > 1:
+                        drop_row(category_tables[0], category_id)
+                    else:
+                        show_categories_section.refresh()  # back to the empty state
 
             # Team Members Section
             with ui.card().classes("p-6 shadow-lg rounded-xl"):
@@ -104,8 +129,9 @@ def create():
                     ).props("icon=person_add")
 
                 @ui.refreshable
-                def show_team_members_section():
-                    team_members = get_team_members_with_requirement_counts()
+                async def show_team_members_section() -> None:
+                    team_member_tables.clear()
+                    team_members = await get_team_members_with_requirement_counts_async()
 
                     if not team_members:
                         with ui.row().classes("items-center justify-center p-8 bg-gray-50 rounded-lg"):
@@ -128,34 +154,50 @@ def create():
                     ]
 
                     table = ui.table(columns=columns, rows=team_members, row_key="id").classes("w-full")
+                    team_member_tables.append(table)
                     table.add_slot(
                         "body-cell-actions",
                         """
                         <q-td :props="props">
                             <q-btn flat dense icon="edit" color="primary" size="sm" @click="$parent.$emit('edit', props.row)" />
-                            <q-btn flat dense icon="delete" color="negative" size="sm" @click="$parent.$emit('delete', props.row)" />
+                            <q-btn flat dense icon="delete" color="negative" size="sm" :disable="props.row.requirement_count > 0" @click="$parent.$emit('delete', props.row)" />
                         </q-td>
                     """,
                     )
 
-                    def handle_edit_team_member(e):
+                    async def handle_edit_team_member(e):
                         team_member_id = e.args["id"]
                         if team_member_id is not None:
-                            show_team_member_form(team_member_id)
+                            await show_team_member_form(team_member_id)
 
-                    def handle_delete_team_member(e):
-                        show_team_member_delete_confirmation(e.args["id"], e.args["name"])
+                    async def handle_delete_team_member(e):
+                        await show_team_member_delete_confirmation(e.args["id"], e.args["name"])
 
                     table.on("edit", handle_edit_team_member)
                     table.on("delete", handle_delete_team_member)
 
-                show_team_members_section()
+                await show_team_members_section()
+
+                def show_saved_team_member(team_member: TeamMember) -> None:
+                    """Insert or replace the row without rebuilding the table."""
+                    if not team_member_tables:
+                        show_team_members_section.refresh()
+                        return
+                    shown = find_row(team_member_tables[0], team_member.id) if team_member.id is not None else None
+                    requirement_count = shown["requirement_count"] if shown else 0
+                    put_row(team_member_tables[0], team_member_row(team_member, requirement_count), "name")
+
+                def remove_team_member_row(team_member_id: int) -> None:
+                    if team_member_tables and len(team_member_tables[0].rows) > 1:
+                        drop_row(team_member_tables[0], team_member_id)
+                    else:
+                        show_team_members_section.refresh()  # back to the empty state
 
             # Category form functions
-            def show_category_form(category_id: int | None = None):
+            async def show_category_form(category_id: int | None = None):
                 category = None
                 if category_id:
-                    category = get_category_by_id(category_id)
+                    category = await get_category_by_id_async(category_id)
                     if category is None:
                         ui.notify("Category not found", type="negative")
                         return
@@ -171,21 +213,25 @@ def create():
                         ui.button("Cancel", on_click=lambda: dialog.close()).props("outline")
                         ui.button("Save", on_click=lambda: save_category()).classes("bg-primary text-white")
 
-                    def save_category():
+                    async def save_category():
                         if not name_input.value.strip():
                             ui.notify("Please enter a category name", type="negative")
                             return
 
                         try:
                             if category and category.id is not None:
-                                result = update_category(category.id, CategoryUpdate(name=name_input.value.strip()))
+                                result = await run.io_bound(
+                                    update_category, category.id, CategoryUpdate(name=name_input.value.strip())
+                                )
                                 if result:
                                     ui.notify("Category updated successfully", type="positive")
                                 else:
                                     ui.notify("Failed to update category", type="negative")
                                     return
                             else:
-                                result = create_category(CategoryCreate(name=name_input.value.strip()))
+                                result = await run.io_bound(
+                                    create_category, CategoryCreate(name=name_input.value.strip())
+                                )
                                 if result:
                                     ui.notify("Category created successfully", type="positive")
                                 else:
@@ -193,13 +239,16 @@ def create():
                                     return
 
                             dialog.close()
-                            show_categories_section.refresh()
+                            show_saved_category(result)
                         except Exception as e:
                             ui.notify(f"Error: {str(e)}", type="negative")
 
                 dialog.open()
 
-            def show_category_delete_confirmation(category_id: int, name: str):
+            async def show_category_delete_confirmation(category_id: int, name: str):
+                # The table's counts may be stale, so ask the database again before offering the delete
+                in_use = await category_has_requirements_async(category_id)
+
                 with ui.dialog() as dialog, ui.card():
                     ui.label("Confirm Deletion").classes("text-lg font-bold mb-4")
                     ui.label(f'Are you sure you want to delete the category "{name}"?').classes("mb-2")
@@ -209,23 +258,23 @@ def create():
                         ui.button("Cancel", on_click=lambda: dialog.close()).props("outline")
                         ui.button("Delete", on_click=lambda: delete_category_and_refresh()).classes(
                             "bg-negative text-white"
-                        )
+                        ).set_enabled(not in_use)
 
-                    def delete_category_and_refresh():
-                        if delete_category(category_id):
+                    async def delete_category_and_refresh():
+                        if await run.io_bound(delete_category, category_id):
                             ui.notify("Category deleted successfully", type="positive")
                             dialog.close()
-                            show_categories_section.refresh()
+                            remove_category_row(category_id)
                         else:
                             ui.notify("Cannot delete category with requirements", type="negative")
 
                 dialog.open()
 
             # Team member form functions
-            def show_team_member_form(team_member_id: int | None = None):
+            async def show_team_member_form(team_member_id: int | None = None):
                 team_member = None
                 if team_member_id:
-                    team_member = get_team_member_by_id(team_member_id)
+                    team_member = await get_team_member_by_id_async(team_member_id)
                     if team_member is None:
                         ui.notify("Team member not found", type="negative")
                         return
@@ -243,15 +292,15 @@ def create():
                         ui.button("Cancel", on_click=lambda: dialog.close()).props("outline")
                         ui.button("Save", on_click=lambda: save_team_member()).classes("bg-info text-white")
 
-                    def save_team_member():
+                    async def save_team_member():
                         if not name_input.value.strip():
                             ui.notify("Please enter a team member name", type="negative")
                             return
 
                         try:
                             if team_member and team_member.id is not None:
-                                result = update_team_member(
-                                    team_member.id, TeamMemberUpdate(name=name_input.value.strip())
+                                result = await run.io_bound(
+                                    update_team_member, team_member.id, TeamMemberUpdate(name=name_input.value.strip())
                                 )
                                 if result:
                                     ui.notify("Team member updated successfully", type="positive")
@@ -259,7 +308,9 @@ def create():
                                     ui.notify("Failed to update team member", type="negative")
                                     return
                             else:
-                                result = create_team_member(TeamMemberCreate(name=name_input.value.strip()))
+                                result = await run.io_bound(
+                                    create_team_member, TeamMemberCreate(name=name_input.value.strip())
+                                )
                                 if result:
                                     ui.notify("Team member created successfully", type="positive")
                                 else:
@@ -267,13 +318,16 @@ def create():
                                     return
 
                             dialog.close()
-                            show_team_members_section.refresh()
+                            show_saved_team_member(result)
                         except Exception as e:
                             ui.notify(f"Error: {str(e)}", type="negative")
 
                 dialog.open()
 
-            def show_team_member_delete_confirmation(team_member_id: int, name: str):
+            async def show_team_member_delete_confirmation(team_member_id: int, name: str):
+                # The table's counts may be stale, so ask the database again before offering the delete
+                in_use = await team_member_has_requirements_async(team_member_id)
+
                 with ui.dialog() as dialog, ui.card():
                     ui.label("Confirm Deletion").classes("text-lg font-bold mb-4")
                     ui.label(f'Are you sure you want to delete the team member "{name}"?').classes("mb-2")
@@ -285,13 +339,13 @@ def create():
                         ui.button("Cancel", on_click=lambda: dialog.close()).props("outline")
                         ui.button("Delete", on_click=lambda: delete_team_member_and_refresh()).classes(
                             "bg-negative text-white"
-                        )
+                        ).set_enabled(not in_use)
 
-                    def delete_team_member_and_refresh():
-                        if delete_team_member(team_member_id):
+                    async def delete_team_member_and_refresh():
+                        if await run.io_bound(delete_team_member, team_member_id):
                             ui.notify("Team member deleted successfully", type="positive")
                             dialog.close()
-                            show_team_members_section.refresh()
+                            remove_team_member_row(team_member_id)
                         else:
                             ui.notify("Cannot delete team member with assigned requirements", type="negative")
 
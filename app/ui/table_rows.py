@@ -0,0 +1,25 @@
+"""In-place row operations for tables whose rows are keyed by ``id``.
+
+Changing ``table.rows`` and calling ``update()`` keeps the table element, its slots and event handlers; only the
+table's props are sent to the browser again.
+"""
+
+from bisect import bisect
+from nicegui import ui
+
+
+def put_row(table: ui.table, row: dict, sort_key: str) -> None:
+    """Replace the row with the same id, or insert it, at the position ``sort_key`` orders it to."""
+    rows = [existing for existing in table.rows if existing["id"] != row["id"]]
+    rows.insert(bisect(rows, row[sort_key], key=lambda existing: existing[sort_key]), row)
+    table.rows[:] = rows
+    table.update()
+
+
+def drop_row(table: ui.table, row_id: int) -> None:
+    table.rows[:] = [row for row in table.rows if row["id"] != row_id]
+    table.update()
+
+
+def find_row(table: ui.table, row_id: int) -> dict | None:
+    return next((row for row in table.rows if row["id"] == row_id), None)
@@ -1,5 +1,7 @@
 import logging
 import os
+from app.cache import DASHBOARD, LOOKUPS
+from app.database import pool_stats
 from app.startup import startup
 from nicegui import app, ui
 from fastapi import FastAPI
@@ -23,7 +25,13 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "service": "nicegui-app"}
+    return {
+        "status": "healthy",
+        "service": "nicegui-app",
+        "pools": pool_stats(),
+        "lookup_cache": LOOKUPS.stats(),
+        "dashboard_cache": DASHBOARD.stats(),
+    }
 
 
 # suppress sqlalchemy engine logs below warning level
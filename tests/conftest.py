@@ -1,5 +1,9 @@
-from typing import Generator
+from contextlib import contextmanager
+from typing import Any, AsyncGenerator, Callable, ContextManager, Generator, Optional
 import pytest
+from sqlalchemy import event
+from sqlmodel import text
+from app.database import ASYNC_ENGINE, ENGINE
 from app.startup import startup
 from nicegui.testing import User
 
@@ -10,3 +14,104 @@ pytest_plugins = ["nicegui.testing.plugin"]
 def user(user: User) -> Generator[User, None, None]:
     startup()
     yield user
+
+
+@pytest.fixture(autouse=True)
+async def dispose_async_engine() -> AsyncGenerator[None, None]:
+    """Drop pooled asyncpg connections, which are bound to the event loop of the test that opened them."""
+    yield
+    await ASYNC_ENGINE.dispose()
+
+
+@pytest.fixture
+def query_count():
+    """Count statements sent to the database through either engine."""
+    counter = {"queries": 0}
+
+    def before_cursor_execute(*args):
+        counter["queries"] += 1
+
+    engines = [ENGINE, ASYNC_ENGINE.sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield counter
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+Captured = list[tuple[str, Any]]
+
+
+@pytest.fixture
+def capture_queries() -> Callable[..., ContextManager[Captured]]:
+    """Return a context manager collecting ``(statement, parameters)`` of the queries sent through ``ENGINE``.
+
+    With ``table``, only the queries reading from that table are collected.
+    """
+
+    @contextmanager
+    def capture(table: Optional[str] = None) -> Generator[Captured, None, None]:
+        captured: Captured = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if table is None or f"FROM {table}" in statement:
+                captured.append((statement, parameters))
+
+        event.listen(ENGINE, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield captured
+        finally:
+            event.remove(ENGINE, "before_cursor_execute", before_cursor_execute)
+
+    return capture
+
+
+@pytest.fixture
+def seed_requirements() -> Callable[[int], None]:
+    """Return a function that bulk-fills the requirements table up to ``count`` rows in SQL."""
+
+    def seed(count: int) -> None:
+        with ENGINE.begin() as conn:
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+            conn.execute(
+                text(
+                    "INSERT INTO clients (agency_name, contact_person, email, phone, address, website, created_at) "
+                    "SELECT 'Seed Agency ' || g, 'Contact ' || g, 'seed' || g || '@example.com', '555', '', '', now() "
+                    "FROM generate_series(1, 200) g WHERE NOT EXISTS (SELECT 1 FROM clients)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO categories (name, created_at) SELECT 'Seed Category ' || g, now() "
+                    "FROM generate_series(1, 20) g WHERE NOT EXISTS (SELECT 1 FROM categories)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO team_members (name, created_at) SELECT 'Seed Member ' || g, now() "
+                    "FROM generate_series(1, 50) g WHERE NOT EXISTS (SELECT 1 FROM team_members)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO requirements (title, description, priority, status, due_date, client_id, "
+                    "category_id, team_member_id, created_at, updated_at) "
+                    "SELECT 'Seed requirement ' || g, 'Generated for large-table tests', "
+                    "(ARRAY['LOW', 'MEDIUM', 'HIGH'])[g % 3 + 1]::priority, "
+                    "(ARRAY['TODO', 'IN_PROGRESS', 'DONE'])[g % 5 % 3 + 1]::status, "
+                    "CASE WHEN g % 4 = 0 THEN NULL ELSE current_date + (g % 180 - 90)::int END, "
+                    "c.ids[g % cardinality(c.ids) + 1], k.ids[g % cardinality(k.ids) + 1], "
+                    "CASE WHEN g % 7 = 0 THEN NULL ELSE m.ids[g % cardinality(m.ids) + 1] END, "
+                    "now() - g * interval '1 minute', now() - g * interval '30 seconds' "
+                    "FROM generate_series((SELECT count(*) FROM requirements) + 1, :count) g, "
+                    "(SELECT array_agg(id) AS ids FROM clients) c, "
+                    "(SELECT array_agg(id) AS ids FROM categories) k, "
+                    "(SELECT array_agg(id) AS ids FROM team_members) m"
+                ),
+                {"count": count},
+            )
+            # Merge the rows queued in the search index's pending list, as autovacuum does after a bulk load
+            conn.execute(text("SELECT gin_clean_pending_list('ix_requirements_search_vector')"))
+            conn.execute(text("ANALYZE requirements, clients, categories, team_members"))
+
+    return seed
@@ -0,0 +1,302 @@
+"""Large-table benchmarks for the service layer (run with ``pytest -m benchmark``)."""
+
+import asyncio
+import io
+import logging
+import time
+import tracemalloc
+import statistics
+from typing import Callable
+import pytest
+from sqlmodel import text
+from app.database import ENGINE, reset_db
+from app.models import RequirementCreate, RequirementFilter, RequirementUpdate, Status
+from app.services.category_service import get_categories_with_requirement_counts
+from app.services.client_service import get_clients_with_requirement_counts
+from app.services.dashboard_service import get_dashboard_summary
+from app.services.import_service import import_requirements
+from app.services.requirement_service import (
+    create_requirement,
+    create_requirements,
+    delete_requirement,
+    delete_requirements,
+    export_requirements,
+    find_similar_requirements,
+    get_requirements_page,
+    get_requirements_summary,
+    update_requirement,
+    update_requirements,
+)
+from app.services.team_member_service import get_team_members_with_requirement_counts
+from app.services.trend_service import TREND_RANGES, get_overdue_by_client, get_requirement_trends, get_team_member_load
+
+logger = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+def test_requirements_summary_memory_is_constant(new_db, seed_requirements):
+    get_requirements_summary()  # warm up statement compilation caches
+    peaks, times = {}, {}
+    for size in (1_000, 10_000, 100_000, 1_000_000):
+        seed_requirements(size)
+        tracemalloc.start()
+        started = time.perf_counter()
+        summary = get_requirements_summary()
+        times[size] = time.perf_counter() - started
+        _, peaks[size] = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert summary["total"] == size
+        logger.info(f"summary over {size:>9} rows: {times[size] * 1000:8.1f} ms, peak {peaks[size] / 1024:8.1f} KiB")
+
+    # Only a handful of aggregate rows cross the wire, so memory must not grow with the table
+    assert max(peaks.values()) < 2 * min(peaks.values())
+    # The counts are maintained on write, so reading them does not scan the table either
+    assert max(times.values()) < 0.05
+
+
+@pytest.mark.parametrize(
+    "get_rows",
+    [
+        get_clients_with_requirement_counts,
+        get_categories_with_requirement_counts,
+        get_team_members_with_requirement_counts,
+    ],
+)
+def test_requirement_counts_do_not_load_requirements(new_db, seed_requirements, get_rows):
+    seed_requirements(100_000)
+    get_rows()  # warm up statement compilation caches
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = get_rows()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Unassigned requirements are not counted for any team member
+    assert 0 < sum(row["requirement_count"] for row in rows) <= 100_000
+    logger.info(f"{get_rows.__name__} over 100000 rows: {elapsed * 1000:8.1f} ms, peak {peak / 1024:8.1f} KiB")
+    # One row per entity crosses the wire; loading the requirements themselves would take tens of MiB
+    assert peak < 1024 * 1024
+
+
+def test_requirement_saves_take_one_statement_plus_notification(new_db, seed_requirements, query_count):
+    seed_requirements(1)
+    data = RequirementCreate(title="Benchmark", client_id=1, category_id=1, team_member_id=1)
+    create_requirement(data)  # warm up statement compilation caches
+
+    for name, save in (
+        ("create_requirement", lambda: create_requirement(data)),
+        ("update_requirement", lambda: update_requirement(1, RequirementUpdate(status=Status.DONE))),
+    ):
+        before = query_count["queries"]
+        started = time.perf_counter()
+        for _ in range(100):
+            requirement = save()
+            assert requirement is not None and requirement.client.agency_name and requirement.team_member
+        elapsed = time.perf_counter() - started
+        statements = (query_count["queries"] - before) / 100
+        logger.info(f"{name}: {statements:.0f} statements, {elapsed * 10:6.2f} ms per save")
+
+        # The write with its display names, then pg_notify; validating and reloading used to take up to 8 more
+        assert statements == 2
+
+
+def test_bulk_requirement_writes_outpace_single_item_writes(new_db, seed_requirements):
+    seed_requirements(1)
+    count = 500
+    items = [
+        RequirementCreate(title=f"Onboarding {i}", client_id=i % 200 + 1, category_id=i % 20 + 1, team_member_id=1)
+        for i in range(count)
+    ]
+    create_requirements(items[:2])  # warm up statement compilation caches
+
+    def timed(save) -> float:
+        started = time.perf_counter()
+        save()
+        return time.perf_counter() - started
+
+    single: dict[str, float] = {}
+    single["create"] = timed(lambda: [create_requirement(item) for item in items])
+    single_ids = list(range(4, count + 4))
+    single["update"] = timed(lambda: [update_requirement(i, RequirementUpdate(status=Status.DONE)) for i in single_ids])
+    single["delete"] = timed(lambda: [delete_requirement(i) for i in single_ids])
+
+    bulk: dict[str, float] = {}
+    created: list = []
+    bulk["create"] = timed(lambda: created.extend(create_requirements(items)["items"]))
+    bulk_ids = [requirement.id for requirement in created]
+    bulk["update"] = timed(lambda: update_requirements({i: RequirementUpdate(status=Status.DONE) for i in bulk_ids}))
+    bulk["delete"] = timed(lambda: delete_requirements(bulk_ids))
+
+    for operation in single:
+        speedup = single[operation] / bulk[operation]
+        logger.info(
+            f"{operation} {count} requirements: {count / single[operation]:8.0f}/s one at a time, "
+            f"{count / bulk[operation]:8.0f}/s in bulk ({speedup:.1f}x)"
+        )
+        # One transaction and a few multi-row statements instead of a transaction per requirement
+        assert speedup > 3
+
+
+def test_requirements_export_memory_is_flat(new_db, seed_requirements):
+    peaks = {}
+    for size in (10_000, 100_000):
+        seed_requirements(size)
+        tracemalloc.start()
+        started = time.perf_counter()
+        exported = sum(chunk.count("\n") for chunk in export_requirements("ndjson"))
+        elapsed = time.perf_counter() - started
+        _, peaks[size] = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert exported == size
+        logger.info(f"export of {size:>7} rows: {elapsed * 1000:8.1f} ms, peak {peaks[size] / 1024:8.1f} KiB")
+
+    # One batch of rows is held at a time, whatever the table size
+    assert peaks[100_000] < 1.5 * peaks[10_000]
+
+
+def test_requirements_import_loads_100k_rows_in_seconds(new_db, seed_requirements):
+    seed_requirements(1)  # clients, categories and team members to refer to
+    size = 100_000
+    lines = ["title,description,priority,status,due_date,client,category,assigned_to"]
+    for i in range(size):
+        assignee = f"Seed Member {i % 50 + 1}" if i % 7 else ""
+        lines.append(
+            f"Imported {i},Row {i},High,In Progress,2025-01-{i % 28 + 1:02d},"
+            f"Seed Agency {i % 200 + 1},Seed Category {i % 20 + 1},{assignee}"
+        )
+    csv_file = io.StringIO("\n".join(lines) + "\n")
+
+    started = time.perf_counter()
+    result = import_requirements(csv_file)
+    elapsed = time.perf_counter() - started
+
+    assert result == {"imported": size, "errors": {}}
+    logger.info(f"import of {size} requirements: {elapsed:6.2f} s ({size / elapsed:8.0f} rows/s)")
+    assert elapsed < 30
+
+
+def test_requirement_search_is_index_backed(new_db, seed_requirements):
+    size = 100_000
+    seed_requirements(size)
+    with ENGINE.begin() as conn:
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        # Words of realistic selectivity: each topic appears in about 0.2% of the descriptions
+        conn.execute(
+            text(
+                "UPDATE requirements SET description = 'Brief for topic' || id % 997 || ' with notes on topic' "
+                "|| id * 7 % 997 || ' from the client workshop'"
+            )
+        )
+        conn.execute(text("SELECT gin_clean_pending_list('ix_requirements_search_vector')"))
+        conn.execute(text("ANALYZE requirements"))
+
+    # What each keystroke of "topic42 workshop" would send without the debounce
+    typed = "topic42 workshop"
+    keystrokes = [typed[:end] for end in range(5, len(typed) + 1) if not typed[:end].endswith(" ")]
+
+    def timed(search) -> float:
+        started = time.perf_counter()
+        search()
+        return time.perf_counter() - started
+
+    def indexed(prefix: str) -> None:
+        get_requirements_page(sort_by="relevance", filters=RequirementFilter(search=prefix))
+
+    def ilike(prefix: str) -> None:
+        with ENGINE.connect() as conn:
+            pattern = {"pattern": f"%{prefix}%"}
+            where = "WHERE title ILIKE :pattern OR description ILIKE :pattern"
+            conn.execute(text(f"SELECT count(*) FROM requirements {where}"), pattern).one()
+            conn.execute(text(f"SELECT id FROM requirements {where} ORDER BY created_at DESC LIMIT 25"), pattern).all()
+
+    indexed(typed)  # warm up statement compilation caches
+    search_times = [timed(lambda: indexed(prefix)) for prefix in keystrokes]
+    ilike_times = [timed(lambda: ilike(prefix)) for prefix in keystrokes]
+
+    search_median, ilike_median = statistics.median(search_times), statistics.median(ilike_times)
+    logger.info(
+        f"search over {size} requirements, {len(keystrokes)} keystrokes: median {search_median * 1000:6.1f} ms "
+        f"(max {max(search_times) * 1000:6.1f} ms) with the GIN index, "
+        f"{ilike_median * 1000:6.1f} ms with ILIKE"
+    )
+    assert search_median < ilike_median
+    assert search_median < 0.1
+
+
+def test_duplicate_checks_stay_fast_on_large_clients(new_db, seed_requirements):
+    size = 100_000
+    seed_requirements(size)
+    with ENGINE.begin() as conn:
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        # Every client has about 500 requirements; give them varied wording
+        conn.execute(
+            text(
+                "UPDATE requirements SET title = 'Deliver topic' || id % 997 || ' for campaign' || id % 89, "
+                "description = 'Brief for topic' || id * 7 % 997 || ' from the client workshop'"
+            )
+        )
+        conn.execute(text("SELECT gin_clean_pending_list('ix_requirements_search_vector')"))
+        conn.execute(text("ANALYZE requirements"))
+        client_ids = [row[0] for row in conn.execute(text("SELECT id FROM clients ORDER BY id LIMIT 20"))]
+
+    find_similar_requirements(client_ids[0], "warm up")
+    times = []
+    for client_id in client_ids:
+        started = time.perf_counter()
+        find_similar_requirements(client_id, f"Deliver topic{client_id * 31} for the campaign", "Workshop brief")
+        times.append(time.perf_counter() - started)
+
+    median = statistics.median(times)
+    logger.info(
+        f"duplicate check over {size} requirements: median {median * 1000:6.1f} ms (max {max(times) * 1000:6.1f} ms)"
+    )
+    assert median < 0.05
+
+
+async def test_dashboard_bursts_share_one_query(new_db, seed_requirements, query_count):
+    seed_requirements(100_000)
+    before = query_count["queries"]
+    started = time.perf_counter()
+    # Everybody opening the dashboard at the start of the day
+    summaries = await asyncio.gather(*(get_dashboard_summary() for _ in range(500)))
+    elapsed = time.perf_counter() - started
+
+    logger.info(f"500 concurrent dashboard loads: {elapsed * 1000:6.1f} ms, {query_count['queries'] - before} queries")
+    assert all(summary["total"] == 100_000 for summary in summaries)
+    assert query_count["queries"] - before == 1
+
+
+def test_dashboard_charts_load_in_bounded_time(new_db, seed_requirements):
+    # Two years of requirements, one every minute
+    size = 1_000_000
+    seed_requirements(size)
+    charts: dict[str, Callable[[], object]] = {
+        f"trends {key}": lambda days=days: get_requirement_trends(days) for key, (_, days) in TREND_RANGES.items()
+    }
+    charts.update({"overdue by client": get_overdue_by_client, "team member load": get_team_member_load})
+
+    for name, load in charts.items():
+        load()  # warm up statement compilation caches
+        times = []
+        for _ in range(5):
+            started = time.perf_counter()
+            load()
+            times.append(time.perf_counter() - started)
+        median = statistics.median(times)
+        logger.info(f"{name} over {size} requirements: median {median * 1000:6.1f} ms")
+        # All read the trigger-maintained counts: a few thousand rows at most, whatever the table size
+        assert median < 0.05, name
+
+    trends = get_requirement_trends(TREND_RANGES["3y"][1])
+    assert len(trends["buckets"]) == 37 and sum(trends["created"]) == size
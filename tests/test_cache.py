@@ -0,0 +1,227 @@
+import asyncio
+import io
+import pytest
+from app import changes
+from app.cache import DASHBOARD, LOOKUPS, LookupCache, SingleFlightCache
+from app.database import reset_db
+from app.models import CategoryCreate, CategoryUpdate, ClientCreate, RequirementCreate, TeamMemberCreate
+from app.services.dashboard_service import get_dashboard_summary
+from app.services.requirement_service import create_requirement
+from app.services.category_service import create_category, get_all_categories, update_category
+from app.services.client_service import (
+    create_client,
+    delete_client,
+    get_all_clients,
+    get_all_clients_async,
+    search_clients,
+    search_clients_async,
+)
+from app.services.import_service import import_clients
+from app.services.team_member_service import create_team_member, get_all_team_members_async
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+def test_lookup_cache_counts_hits_and_misses():
+    cache = LookupCache()
+    found, _, generation = cache.get("clients")
+    assert not found
+    cache.put("clients", ["a"], generation)
+
+    assert cache.get("clients")[:2] == (True, ["a"])
+    cache.invalidate("clients")
+    assert not cache.get("clients")[0]
+    assert cache.stats() == {"entries": 0, "hits": 1, "misses": 2, "invalidations": 1}
+
+
+def test_lookup_cache_drops_loads_that_raced_with_a_write():
+    cache = LookupCache()
+    _, _, generation = cache.get("clients")
+    cache.invalidate("clients")  # a write commits while the stale list is being loaded
+    cache.put("clients", ["stale"], generation)
+    assert not cache.get("clients")[0]
+
+    _, _, generation = cache.get("clients")
+    cache.clear()
+    cache.put("clients", ["stale"], generation)
+    assert not cache.get("clients")[0]
+
+
+async def test_lookup_lists_are_served_without_queries(new_db, query_count):
+    create_client(
+        ClientCreate(agency_name="Agency", contact_person="Ann", email="a@a.com", phone="1", address="", website="")
+    )
+    create_team_member(TeamMemberCreate(name="Bob"))
+    get_all_clients()
+    await get_all_team_members_async()
+
+    before_stats, before_queries = LOOKUPS.stats(), query_count["queries"]
+    assert [c.agency_name for c in await get_all_clients_async()] == ["Agency"]
+    assert [m.name for m in await get_all_team_members_async()] == ["Bob"]
+    assert query_count["queries"] == before_queries
+    assert LOOKUPS.stats()["hits"] == before_stats["hits"] + 2
+
+
+def test_writes_invalidate_lookup_lists(new_db):
+    category = create_category(CategoryCreate(name="Design"))
+    assert category.id is not None
+    assert [c.name for c in get_all_categories()] == ["Design"]
+
+    update_category(category.id, CategoryUpdate(name="Branding"))
+    assert [c.name for c in get_all_categories()] == ["Branding"]
+
+    client = create_client(
+        ClientCreate(agency_name="Agency", contact_person="Ann", email="a@a.com", phone="1", address="", website="")
+    )
+    assert client.id is not None
+    clients = get_all_clients()
+    clients.clear()  # callers get a copy of the cached list
+    assert len(get_all_clients()) == 1
+
+    assert delete_client(client.id)
+    assert get_all_clients() == []
+
+
+async def test_first_lookup_page_is_cached_until_a_write(new_db, query_count):
+    create_client(
+        ClientCreate(agency_name="Globex", contact_person="Ann", email="a@a.com", phone="1", address="", website="")
+    )
+    assert [c.agency_name for c in search_clients("")] == ["Globex"]
+
+    before = query_count["queries"]
+    assert [c.agency_name for c in await search_clients_async(" ")] == ["Globex"]
+    assert query_count["queries"] == before
+    # Searches and other page sizes are not cached
+    search_clients("glo")
+    search_clients("", limit=5)
+    assert query_count["queries"] == before + 2
+
+    create_client(
+        ClientCreate(agency_name="Acme", contact_person="Ann", email="a@a.com", phone="1", address="", website="")
+    )
+    assert [c.agency_name for c in search_clients("")] == ["Acme", "Globex"]
+    import_clients(io.StringIO("agency_name,contact_person,email\nBrand Co,Bo,bo@brand.com\n"))
+    assert [c.agency_name for c in await search_clients_async("")] == ["Acme", "Brand Co", "Globex"]
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class GatedLoad:
+    """A load that returns 1, 2, ... but only once ``release`` is set."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        return call
+
+
+async def test_single_flight_cache_shares_one_load_between_concurrent_calls():
+    cache, load = SingleFlightCache(ttl=5), GatedLoad()
+    waiting = [asyncio.create_task(cache.get("summary", load)) for _ in range(10)]
+    await asyncio.sleep(0)
+    load.release.set()
+
+    assert await asyncio.gather(*waiting) == [1] * 10
+    assert await cache.get("summary", load) == 1
+    assert cache.stats() == {
+        "entries": 1,
+        "hits": 1,
+        "stale_hits": 0,
+        "loads": 1,
+        "coalesced": 9,
+        "errors": 0,
+        "invalidations": 0,
+    }
+
+
+async def test_single_flight_cache_serves_stale_values_while_refreshing():
+    clock, load = Clock(), GatedLoad()
+    cache = SingleFlightCache(ttl=5, stale_ttl=60, clock=clock)
+    load.release.set()
+    assert await cache.get("summary", load) == 1
+
+    load.release.clear()
+    clock.now = 10
+    # Stale: answered at once, and only the first of these calls starts a refresh
+    assert [await cache.get("summary", load) for _ in range(3)] == [1, 1, 1]
+    load.release.set()
+    await asyncio.sleep(0.01)
+    assert await cache.get("summary", load) == 2
+    assert cache.stats()["loads"] == 2 and cache.stats()["stale_hits"] == 3
+
+    # Too old to be served: callers wait for the load
+    clock.now = 100
+    assert await cache.get("summary", load) == 3
+
+
+async def test_single_flight_cache_never_serves_invalidated_values():
+    cache, load = SingleFlightCache(ttl=5, stale_ttl=60), GatedLoad()
+    before_write = asyncio.create_task(cache.get("summary", load))
+    await asyncio.sleep(0)
+    cache.invalidate("summary")  # a write commits while the first load runs
+    after_write = asyncio.create_task(cache.get("summary", load))
+    await asyncio.sleep(0)
+    load.release.set()
+
+    assert (await before_write, await after_write) == (1, 2)
+    assert await cache.get("summary", load) == 2
+    assert cache.stats()["loads"] == 2
+
+
+async def test_single_flight_cache_does_not_keep_failures():
+    cache = SingleFlightCache(ttl=5)
+
+    async def failing() -> int:
+        raise RuntimeError("database unavailable")
+
+    async def working() -> int:
+        return 1
+
+    with pytest.raises(RuntimeError):
+        await cache.get("summary", failing)
+    assert await cache.get("summary", working) == 1
+    assert cache.stats()["errors"] == 1
+
+
+async def test_dashboard_summary_follows_writes(new_db, query_count):
+    listener = changes.ChangeListener()
+    listener.start()
+    assert listener.listening.wait(5)
+    try:
+        client = create_client(
+            ClientCreate(agency_name="Agency", contact_person="Ann", email="a@a.com", phone="1", address="", website="")
+        )
+        category = create_category(CategoryCreate(name="Design"))
+        assert client.id is not None and category.id is not None
+        await asyncio.sleep(0.5)  # let the notifications of the setup arrive
+
+        before = query_count["queries"]
+        summaries = await asyncio.gather(*(get_dashboard_summary() for _ in range(20)))
+        assert query_count["queries"] == before + 1
+        assert all(summary["clients"] == 1 and summary["total"] == 0 for summary in summaries)
+
+        create_requirement(RequirementCreate(title="Logo", client_id=client.id, category_id=category.id))
+        for _ in range(50):
+            if (await get_dashboard_summary())["total"] == 1:
+                break
+            await asyncio.sleep(0.1)
+        assert (await get_dashboard_summary())["total"] == 1
+        assert DASHBOARD.stats()["coalesced"] >= 19
+    finally:
+        listener.stop()
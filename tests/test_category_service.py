@@ -6,7 +6,9 @@ from app.services.category_service import (
     create_category,
     update_category,
     delete_category,
+    category_has_requirements,
     get_categories_with_requirement_counts,
+    search_categories,
 )
 from app.services.client_service import create_client
 from app.services.requirement_service import create_requirement
@@ -121,7 +123,9 @@ def test_delete_category_with_requirements_fails(new_db):
 
     # Create requirement
     req_data = RequirementCreate(title="Test Requirement", client_id=client.id, category_id=category.id)
+    assert not category_has_requirements(category.id)
     create_requirement(req_data)
+    assert category_has_requirements(category.id)
 
     # Try to delete category - should fail
     result = delete_category(category.id)
@@ -207,3 +211,16 @@ def test_category_update_partial_data(new_db):
     # Should return the updated category
     assert result is not None
     assert result.name == "Updated Name"
+
+
+def test_search_categories(new_db):
+    for name in ["Web Development", "Mobile Development", "Design"]:
+        create_category(CategoryCreate(name=name))
+
+    assert [category.name for category in search_categories("dev")] == ["Mobile Development", "Web Development"]
+    assert [category.name for category in search_categories("DE")] == [
+        "Design",
+        "Mobile Development",
+        "Web Development",
+    ]
+    assert search_categories("marketing") == []
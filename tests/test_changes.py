@@ -0,0 +1,109 @@
+import json
+import select
+import time
+import pytest
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy.engine import make_url
+from sqlmodel import text
+from app import changes
+from app.cache import LOOKUPS
+from app.database import DATABASE_URL, ENGINE, get_session, reset_db
+from app.models import ClientCreate
+from app.services.client_service import create_client, delete_client, get_all_clients
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def listener():
+    listener = changes.ChangeListener()
+    listener.start()
+    assert listener.listening.wait(5)
+    yield listener
+    listener.stop()
+
+
+@pytest.fixture()
+def notifications():
+    """Return a function that collects what a separate LISTEN connection (another process) received."""
+    conn = psycopg2.connect(make_url(DATABASE_URL).render_as_string(hide_password=False))
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    with conn.cursor() as cursor:
+        cursor.execute(f"LISTEN {changes.CHANNEL}")
+
+    def received(timeout: float = 2) -> list[dict]:
+        select.select([conn], [], [], timeout)
+        conn.poll()
+        payloads = [json.loads(notify.payload) for notify in conn.notifies]
+        conn.notifies.clear()
+        return payloads
+
+    yield received
+    conn.close()
+
+
+def notify(payload: str) -> None:
+    with ENGINE.begin() as conn:
+        conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": changes.CHANNEL, "payload": payload})
+
+
+def notify_from_other_process(entity: str, entity_id: int) -> None:
+    notify(json.dumps({"entity": entity, "id": entity_id, "origin": "another-process"}))
+
+
+def eventually(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def test_writes_publish_changes_on_commit(new_db, notifications):
+    client = create_client(
+        ClientCreate(agency_name="Agency", contact_person="Ann", email="a@a.com", phone="1", address="", website="")
+    )
+    assert client.id is not None
+    assert delete_client(client.id)
+    assert [(n["entity"], n["id"], n["origin"]) for n in notifications()] == [
+        ("client", client.id, changes.ORIGIN),
+        ("client", client.id, changes.ORIGIN),
+    ]
+
+    # Nothing is announced for a delete that does not happen or a transaction that rolls back
+    assert not delete_client(client.id)
+    with get_session() as session:
+        changes.publish(session, "client", client.id)
+        session.rollback()
+    assert notifications(timeout=0.2) == []
+
+
+def test_listener_evicts_lookup_lists_changed_elsewhere(new_db, listener):
+    get_all_clients()
+    assert LOOKUPS.get("clients")[0]
+
+    notify_from_other_process("client", 1)
+    assert eventually(lambda: not LOOKUPS.get("clients")[0])
+
+
+def test_listener_ignores_own_and_malformed_notifications(new_db, listener):
+    received = []
+    changes.subscribe("test_entity", received.append)
+    try:
+        notify("not json")
+        with get_session() as session:
+            changes.publish(session, "test_entity", 1)
+            session.commit()
+        notify_from_other_process("test_entity", 2)
+
+        assert eventually(lambda: received)
+        assert received == [2]
+    finally:
+        changes._subscribers.pop("test_entity")
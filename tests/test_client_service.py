@@ -6,7 +6,14 @@ from app.services.client_service import (
     create_client,
     update_client,
     delete_client,
+    client_has_requirements,
     get_clients_with_requirement_counts,
+    get_all_clients_async,
+    get_client_by_id_async,
+    get_clients_with_requirement_counts_async,
+    client_has_requirements_async,
+    search_clients,
+    search_clients_async,
 )
 from app.services.category_service import create_category
 from app.services.requirement_service import create_requirement
@@ -167,7 +174,9 @@ def test_delete_client_with_requirements_fails(new_db):
     req_data = RequirementCreate(
         title="Test Requirement", description="Test", client_id=client.id, category_id=category.id
     )
+    assert not client_has_requirements(client.id)
     create_requirement(req_data)
+    assert client_has_requirements(client.id)
 
     # Try to delete client - should fail
     result = delete_client(client.id)
@@ -223,3 +232,49 @@ def test_client_data_validation(new_db):
     )
     client = create_client(client_data)
     assert client.agency_name == "Test Agency"
+
+
+async def test_async_client_reads(new_db):
+    client = create_client(
+        ClientCreate(
+            agency_name="Async Agency",
+            contact_person="Jane",
+            email="jane@test.com",
+            phone="555",
+            address="",
+            website="",
+        )
+    )
+    assert client.id is not None
+    category = create_category(CategoryCreate(name="Async Category"))
+    assert category.id is not None
+    create_requirement(RequirementCreate(title="Requirement", client_id=client.id, category_id=category.id))
+
+    assert [c.id for c in await get_all_clients_async()] == [client.id]
+    retrieved = await get_client_by_id_async(client.id)
+    assert retrieved is not None and retrieved.agency_name == "Async Agency"
+    assert await get_client_by_id_async(999) is None
+    assert await get_clients_with_requirement_counts_async() == get_clients_with_requirement_counts()
+    assert await client_has_requirements_async(client.id)
+    assert not await client_has_requirements_async(999)
+
+
+async def test_search_clients(new_db):
+    for agency_name in ["Globex", "Acme Global", "Initech", "100% Design", "Glob_al Partners"]:
+        create_client(
+            ClientCreate(
+                agency_name=agency_name, contact_person="C", email="c@test.com", phone="1", address="", website=""
+            )
+        )
+
+    def names(search: str, limit: int = 20) -> list[str]:
+        return [client.agency_name for client in search_clients(search, limit)]
+
+    # Names starting with the search come first, then any other name containing it
+    assert names("glob") == ["Glob_al Partners", "Globex", "Acme Global"]
+    assert names(" GLOBEX ") == ["Globex"]
+    # LIKE wildcards in the search are matched literally
+    assert names("%") == ["100% Design"]
+    assert names("b_a") == ["Glob_al Partners"]
+    assert names("", limit=2) == ["100% Design", "Acme Global"]
+    assert [client.agency_name for client in await search_clients_async("tech")] == ["Initech"]
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+import pytest
+from nicegui.testing import User
+from app.database import reset_db
+from app.models import CategoryCreate, ClientCreate, RequirementCreate, RequirementFilter, Status, TeamMemberCreate
+from app.services.category_service import create_category
+from app.services.client_service import create_client
+from app.services.requirement_service import create_requirements, export_requirements, export_requirements_async
+from app.services.team_member_service import create_team_member
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def requirements(new_db):
+    client = create_client(
+        ClientCreate(
+            agency_name="Agency, Inc", contact_person="Ann", email="a@a.com", phone="1", address="", website=""
+        )
+    )
+    category = create_category(CategoryCreate(name="Design"))
+    member = create_team_member(TeamMemberCreate(name="Bob"))
+    assert client.id is not None and category.id is not None
+    create_requirements(
+        [
+            RequirementCreate(
+                title="Logo", description='Say "hello"\non two lines', client_id=client.id, category_id=category.id
+            ),
+            RequirementCreate(
+                title="Website",
+                status=Status.DONE,
+                team_member_id=member.id,
+                client_id=client.id,
+                category_id=category.id,
+            ),
+        ]
+    )
+
+
+def test_export_requirements_as_csv(requirements):
+    rows = list(csv.DictReader(io.StringIO("".join(export_requirements("csv")))))
+
+    assert [row["title"] for row in rows] == ["Website", "Logo"]
+    assert rows[0]["client"] == "Agency, Inc" and rows[0]["category"] == "Design"
+    assert (rows[0]["assigned_to"], rows[0]["status"]) == ("Bob", "Done")
+    assert (rows[1]["assigned_to"], rows[1]["due_date"]) == ("", "")
+    assert rows[1]["description"] == 'Say "hello"\non two lines'
+
+
+async def test_export_requirements_as_ndjson_with_filters(requirements):
+    chunks = [chunk async for chunk in export_requirements_async("ndjson", RequirementFilter(status=Status.TODO))]
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+
+    assert [(row["title"], row["status"], row["assigned_to"]) for row in rows] == [("Logo", "To Do", None)]
+
+
+def test_export_requirements_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        export_requirements("xlsx")
+
+
+async def test_export_endpoint_streams_a_download(user: User, requirements) -> None:
+    response = await user.http_client.get("/export/requirements", params={"format": "ndjson", "status": "Done"})
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="requirements.ndjson"'
+    assert [json.loads(line)["title"] for line in response.text.splitlines()] == ["Website"]
+
+    response = await user.http_client.get("/export/requirements")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0].startswith("id,title,description,client,category")
+    assert (await user.http_client.get("/export/requirements", params={"format": "xml"})).status_code == 422
@@ -0,0 +1,130 @@
+import io
+import logging
+import pytest
+from sqlmodel import text
+from app.database import ENGINE, reset_db
+from app.importer import main
+from app.models import CategoryCreate, ClientCreate, Priority, Status, TeamMemberCreate
+from app.services.category_service import create_category
+from app.services.client_service import create_client, get_all_clients
+from app.services.import_service import import_clients, import_requirements
+from app.services.requirement_service import export_requirements, get_all_requirements
+from app.services.team_member_service import create_team_member
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def lookups(new_db):
+    create_client(
+        ClientCreate(agency_name="Acme", contact_person="Ann", email="ann@acme.com", phone="1", address="", website="")
+    )
+    create_category(CategoryCreate(name="Design"))
+    create_team_member(TeamMemberCreate(name="Bob"))
+    create_team_member(TeamMemberCreate(name="Sam"))
+    create_team_member(TeamMemberCreate(name="Sam"))
+
+
+def test_import_clients(new_db):
+    create_client(
+        ClientCreate(agency_name="Acme", contact_person="Ann", email="ann@acme.com", phone="1", address="", website="")
+    )
+    assert len(get_all_clients()) == 1  # cached; the import must invalidate it
+
+    result = import_clients(
+        io.StringIO(
+            "agency_name,contact_person,email,phone\n"
+            'Globex,"Hank, Jr.",hank@globex.com,555\n'
+            "Acme,Ann,ann@acme.com,1\n"
+            ",Nobody,no@body.com,\n"
+            "Initech,Bill,bill@initech.com," + "1" * 30 + "\n"
+            "Globex,Hank,hank@globex.com,555\n"
+        )
+    )
+
+    assert result["imported"] == 1
+    assert set(result["errors"]) == {3, 4, 5, 6}
+    assert result["errors"][3] == "Client 'Acme' already exists"
+    assert result["errors"][6] == "Client 'Globex' appears more than once"
+    assert result["errors"][5].startswith("phone:")
+    globex = next(client for client in get_all_clients() if client.agency_name == "Globex")
+    assert (globex.contact_person, globex.address, globex.website) == ("Hank, Jr.", "", "")
+
+
+def test_import_requirements_resolves_names(lookups):
+    result = import_requirements(
+        io.StringIO(
+            "title,description,priority,status,due_date,client,category,assigned_to\n"
+            'Logo,"Two\nlines",High,Done,2025-03-01,Acme,Design,Bob\n'
+            "Website,,,,,Acme,Design,\n"
+            "Banner,,Urgent,,,Acme,Design,\n"
+            "Flyer,,,,,Unknown Co,Design,\n"
+            "Poster,,,,,Acme,Design,Sam\n"
+            "Menu,,,,not a date,Acme,Design,\n"
+            ",,,,,Acme,Design,\n"
+        )
+    )
+
+    assert result["imported"] == 2
+    assert result["errors"][5] == "Unknown client 'Unknown Co'"
+    assert result["errors"][6] == "More than one team member is named 'Sam'"
+    assert result["errors"][8] == "title is required"
+    assert result["errors"][4].startswith("priority:") and result["errors"][7].startswith("due_date:")
+    logo, website = sorted(get_all_requirements(), key=lambda requirement: requirement.id or 0)
+    assert logo.team_member is not None
+    assert (logo.description, logo.priority, logo.status, logo.team_member.name) == (
+        "Two\nlines",
+        Priority.HIGH,
+        Status.DONE,
+        "Bob",
+    )
+    assert (website.priority, website.status, website.due_date, website.team_member) == (
+        Priority.MEDIUM,
+        Status.TODO,
+        None,
+        None,
+    )
+
+
+def test_requirements_export_can_be_imported_again(lookups):
+    import_requirements(io.StringIO("title,client,category,assigned_to\nLogo,Acme,Design,Bob\nWebsite,Acme,Design,\n"))
+    exported = "".join(export_requirements("csv"))
+
+    assert import_requirements(io.StringIO(exported)) == {"imported": 2, "errors": {}}
+    assert sorted(requirement.title for requirement in get_all_requirements()) == ["Logo", "Logo", "Website", "Website"]
+
+
+def test_import_rejects_files_without_required_columns(lookups):
+    with pytest.raises(ValueError, match="Missing columns: category"):
+        import_requirements(io.StringIO("title,client\nLogo,Acme\n"))
+    assert get_all_requirements() == []
+
+
+def test_importer_command_line(lookups, tmp_path, caplog):
+    path = tmp_path / "clients.csv"
+    path.write_text("﻿agency_name,contact_person,email\nGlobex,Hank,hank@globex.com\nAcme,Ann,ann@acme.com\n")
+
+    with caplog.at_level(logging.INFO, logger="app.importer"):
+        assert main(["clients", str(path)]) == 1
+    records = [(record.levelname, record.message) for record in caplog.records]
+    assert ("ERROR", "Row 3: Client 'Acme' already exists") in records
+    assert ("INFO", "Imported 1 clients, skipped 1 rows") in records
+    assert main(["clients", str(tmp_path / "missing.csv")]) == 2
+
+
+def test_importer_command_line_reports_database_errors(lookups, tmp_path, caplog):
+    path = tmp_path / "clients.csv"
+    path.write_text("agency_name,contact_person,email\nGlobex,Hank,hank@globex.com\n")
+    with ENGINE.begin() as conn:
+        conn.execute(text("ALTER TABLE clients ADD CONSTRAINT no_globex CHECK (agency_name <> 'Globex')"))
+
+    with caplog.at_level(logging.INFO, logger="app.importer"):
+        assert main(["clients", str(path)]) == 2
+    assert [(record.levelname, record.message) for record in caplog.records] == [("ERROR", "Import failed")]
+    assert caplog.records[0].exc_info is not None
+    assert [client.agency_name for client in get_all_clients()] == ["Acme"]
@@ -0,0 +1,118 @@
+import pytest
+from sqlmodel import SQLModel, text
+from app.database import ENGINE, reset_db, run_migrations
+from app.migrations import MIGRATIONS, get_schema_version
+from app.services.requirement_service import get_requirements_summary
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+def requirement_indexes() -> set[str]:
+    with ENGINE.connect() as conn:
+        return set(conn.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'requirements'")).scalars())
+
+
+def test_fresh_database_is_migrated_to_latest_version(new_db):
+    assert get_schema_version(ENGINE) == MIGRATIONS[-1].version
+    with ENGINE.connect() as conn:
+        tables = set(conn.execute(text("SELECT tablename FROM pg_tables WHERE schemaname = 'public'")).scalars())
+        versions = list(conn.execute(text("SELECT version FROM schema_migrations ORDER BY version")).scalars())
+    assert set(SQLModel.metadata.tables) <= tables
+    assert versions == [migration.version for migration in MIGRATIONS]
+
+
+def test_current_schema_costs_a_single_version_check(new_db, capture_queries):
+    with capture_queries() as captured:
+        run_migrations()
+    assert [statement for statement, _ in captured] == ["SELECT max(version) FROM schema_migrations"]
+
+
+def test_pending_migration_is_applied(new_db):
+    with ENGINE.begin() as conn:
+        conn.execute(text("DROP INDEX ix_requirements_open_due_date"))
+        conn.execute(text("ALTER TABLE requirements DROP COLUMN search_vector"))
+        conn.execute(text("DELETE FROM schema_migrations WHERE version >= 2"))
+
+    run_migrations()
+
+    assert {"ix_requirements_open_due_date", "ix_requirements_search_vector"} <= requirement_indexes()
+    assert get_schema_version(ENGINE) == MIGRATIONS[-1].version
+
+
+def test_unversioned_database_is_brought_under_migrations(new_db):
+    # A database created before migrations existed: tables without indexes or version table
+    with ENGINE.begin() as conn:
+        conn.execute(text("DROP TABLE schema_migrations"))
+        conn.execute(text("DROP INDEX ix_requirements_client_id_created_at_id"))
+    assert get_schema_version(ENGINE) == 0
+
+    run_migrations()
+
+    assert "ix_requirements_client_id_created_at_id" in requirement_indexes()
+    assert get_schema_version(ENGINE) == MIGRATIONS[-1].version
+
+
+def test_lookup_indexes_are_created(new_db):
+    with ENGINE.connect() as conn:
+        indexes = set(
+            conn.execute(
+                text("SELECT indexname FROM pg_indexes WHERE tablename IN ('clients', 'categories', 'team_members')")
+            ).scalars()
+        )
+        has_trigrams = conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+    trigram_indexes = {"ix_clients_agency_name_trgm", "ix_categories_name_trgm", "ix_team_members_name_trgm"}
+
+    assert {"ix_clients_agency_name", "ix_team_members_name"} <= indexes
+    # Servers without the pg_trgm extension are still migrated, without the trigram indexes
+    assert (trigram_indexes <= indexes) if has_trigrams else not (trigram_indexes & indexes)
+
+
+def test_summary_counts_are_backfilled(new_db, seed_requirements):
+    seed_requirements(1_000)
+    with ENGINE.begin() as conn:
+        # A database from before the counts: no table, no triggers, no completion times
+        conn.execute(text("DROP TABLE summary_counts"))
+        conn.execute(text("DROP TRIGGER requirements_completed_at ON requirements"))
+        conn.execute(text("ALTER TABLE requirements DROP COLUMN completed_at CASCADE"))
+        for table in ("requirements", "clients", "categories"):
+            for operation in ("insert", "update", "delete"):
+                conn.execute(text(f"DROP TRIGGER IF EXISTS summary_counts_{operation} ON {table}"))
+        conn.execute(text("DELETE FROM schema_migrations WHERE version >= 5"))
+        conn.execute(text("UPDATE requirements SET status = 'DONE' WHERE id <= 100"))
+
+    run_migrations()
+
+    summary = get_requirements_summary()
+    assert (summary["total"], summary["clients"], summary["categories"]) == (1_000, 200, 20)
+    with ENGINE.connect() as conn:
+        done = conn.execute(text("SELECT count(*) FROM requirements WHERE status = 'DONE'")).scalar()
+        completed = conn.execute(
+            text("SELECT sum(count) FROM summary_counts WHERE dimension = 'completed_day'")
+        ).scalar()
+    assert summary["by_status"]["Done"] == done == completed
+
+
+def test_completion_times_are_backfilled(new_db, seed_requirements):
+    seed_requirements(1_000)
+    with ENGINE.begin() as conn:
+        # A database from before completion times were recorded
+        conn.execute(text("DROP TRIGGER requirements_completed_at ON requirements"))
+        conn.execute(text("ALTER TABLE requirements DROP COLUMN completed_at CASCADE"))
+        conn.execute(text("DELETE FROM schema_migrations WHERE version >= 6"))
+
+    run_migrations()
+
+    with ENGINE.connect() as conn:
+        missing = conn.execute(
+            text("SELECT count(*) FROM requirements WHERE (status = 'DONE') <> (completed_at IS NOT NULL)")
+        ).scalar()
+        completed = conn.execute(
+            text("SELECT sum(count) FROM summary_counts WHERE dimension = 'completed_day'")
+        ).scalar()
+    assert missing == 0
+    assert completed == get_requirements_summary()["by_status"]["Done"]
@@ -4,7 +4,7 @@ import pytest
 from sqlmodel import SQLModel, text
 import os
 
-from app.database import create_tables, ENGINE
+from app.database import run_migrations, ENGINE
 from app import models
 
 
@@ -12,7 +12,7 @@ from app import models
 def test_sqlmodel_smoke():
     """Single smoke test to validate SQLModel setup works end-to-end."""
 
-    create_tables()
+    run_migrations()
 
     # Check tables actually exist in the database
     with ENGINE.connect() as conn:
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.database import DATABASE_URL, ENGINE, pool_stats
+from app.pool import PoolMetrics, TimedQueuePool, pool_status
+
+
+def test_pool_metrics_histogram_buckets():
+    metrics = PoolMetrics()
+    metrics.observe(0.5)
+    metrics.observe(1.0)
+    metrics.observe(7.0)
+    metrics.observe(6000.0, timed_out=True)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 3
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_ms_max"] == 6000.0
+    assert snapshot["wait_ms_histogram"]["le_1"] == 2
+    assert snapshot["wait_ms_histogram"]["le_10"] == 1
+    assert snapshot["wait_ms_histogram"]["le_inf"] == 1
+    assert sum(snapshot["wait_ms_histogram"].values()) == 4
+
+
+def test_pool_stats_track_checked_out_connections():
+    before = pool_stats()["sync"]["checkouts"]
+
+    with ENGINE.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        during = pool_stats()["sync"]
+        assert during["class"] == "TimedQueuePool"
+        assert during["checked_out"] >= 1
+
+    after = pool_stats()
+    assert after["sync"]["checkouts"] == before + 1
+    assert after["async"]["class"] == "TimedAsyncQueuePool"
+
+
+def test_pool_timeout_is_counted_and_metrics_survive_dispose():
+    engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    try:
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+            status = pool_status(engine.pool)
+            assert status["checked_out"] == 1
+            assert status["overflow"] == 0
+
+        status = pool_status(engine.pool)
+        assert status["checkouts"] == 1
+        assert status["timeouts"] == 1
+        assert status["wait_ms_max"] >= 50
+
+        engine.dispose()
+        assert pool_status(engine.pool)["timeouts"] == 1
+    finally:
+        engine.dispose()
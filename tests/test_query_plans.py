@@ -0,0 +1,108 @@
+"""EXPLAIN checks that the main service queries are served by indexes on a large table."""
+
+import pytest
+from typing import Any
+from sqlmodel import text
+from app.database import ENGINE, reset_db
+from app.models import Priority, RequirementFilter, Status
+from app.services.category_service import category_has_requirements
+from app.services.client_service import client_has_requirements, search_clients
+from app.services.requirement_service import (
+    find_similar_requirements,
+    get_requirements_by_client,
+    get_requirements_by_cursor,
+    get_requirements_by_team_member,
+    get_requirements_page,
+)
+from app.services.team_member_service import team_member_has_requirements
+
+
+@pytest.fixture()
+def large_db(seed_requirements):
+    reset_db()
+    seed_requirements(20_000)
+    yield
+    reset_db()
+
+
+def explain(statement: str, parameters: Any) -> str:
+    connection = ENGINE.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("EXPLAIN " + statement, parameters)
+        return "\n".join(row[0] for row in cursor.fetchall())
+    finally:
+        connection.close()
+
+
+def assert_no_sequential_scans(captured: list[tuple[str, Any]], table: str = "requirements") -> None:
+    assert captured, "No queries were captured"
+    for statement, parameters in captured:
+        plan = explain(statement, parameters)
+        assert f"Seq Scan on {table}" not in plan, f"{statement}\n{plan}"
+
+
+def test_listings_by_client_and_team_member_use_indexes(large_db, capture_queries):
+    with capture_queries("requirements") as captured:
+        assert get_requirements_by_client(1)
+        assert get_requirements_by_team_member(1)
+    assert_no_sequential_scans(captured)
+
+
+@pytest.mark.parametrize("sort_by", ["created_at", "updated_at", "due_date", "priority"])
+def test_sorted_pages_use_indexes(large_db, sort_by, capture_queries):
+    with capture_queries("requirements") as captured:
+        first = get_requirements_by_cursor(limit=25, sort_by=sort_by)
+        get_requirements_by_cursor(first["next_cursor"], limit=25)
+    assert_no_sequential_scans(captured)
+
+
+def test_filtered_pages_use_indexes(large_db, capture_queries):
+    with capture_queries("requirements") as captured:
+        get_requirements_page(page=3, filters=RequirementFilter(client_id=2))
+        get_requirements_page(sort_by="due_date", filters=RequirementFilter(team_member_id=3))
+        get_requirements_page(filters=RequirementFilter(status=Status.IN_PROGRESS, priority=Priority.HIGH))
+    assert_no_sequential_scans(captured)
+
+
+def test_searches_use_the_search_index(large_db, capture_queries):
+    with capture_queries("requirements") as captured:
+        result = get_requirements_page(sort_by="relevance", filters=RequirementFilter(search="requirement 1234"))
+        assert result["items"][0].title.startswith("Seed requirement 1234")
+        get_requirements_page(filters=RequirementFilter(search="seed 777", client_id=2))
+    assert_no_sequential_scans(captured)
+
+
+def test_duplicate_checks_use_indexes(large_db, capture_queries):
+    with capture_queries("requirements") as captured:
+        similar = find_similar_requirements(1, "Seed requirement 400", "Generated for large-table tests")
+        assert similar and similar[0][1] == 1.0
+        find_similar_requirements(2, "Quarterly newsletter")
+    assert_no_sequential_scans(captured)
+
+
+def test_in_use_checks_use_indexes(large_db, capture_queries):
+    # The expensive answer is "not in use": without an index it means reading the whole table
+    with capture_queries("requirements") as captured:
+        assert not client_has_requirements(0)
+        assert not category_has_requirements(0)
+        assert not team_member_has_requirements(0)
+    assert_no_sequential_scans(captured)
+
+
+def test_client_lookups_use_the_trigram_index(large_db, capture_queries):
+    with ENGINE.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is None:
+            pytest.skip("The pg_trgm extension is not installed")
+        conn.execute(
+            text(
+                "INSERT INTO clients (agency_name, contact_person, email, phone, address, website, created_at) "
+                "SELECT 'Lookup Agency ' || g, 'Contact', 'lookup' || g || '@example.com', '555', '', '', now() "
+                "FROM generate_series(1, 20000) g"
+            )
+        )
+        conn.execute(text("ANALYZE clients"))
+
+    with capture_queries("clients") as captured:
+        assert [client.agency_name for client in search_clients("agency 12345")] == ["Lookup Agency 12345"]
+    assert_no_sequential_scans(captured, "clients")
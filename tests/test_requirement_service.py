@@ -1,15 +1,29 @@
 import pytest
 from datetime import date
-from app.database import reset_db
+from sqlalchemy import event, text
+from app.database import ENGINE, reset_db
 from app.services.requirement_service import (
     get_all_requirements,
     get_requirement_by_id,
     create_requirement,
     update_requirement,
     delete_requirement,
+    create_requirements,
+    update_requirements,
+    delete_requirements,
     get_requirements_by_client,
     get_requirements_by_team_member,
     get_requirements_summary,
+    get_requirements_page,
+    get_requirements_by_cursor,
+    get_requirement_by_id_async,
+    get_requirements_summary_async,
+    get_requirements_page_async,
+    get_requirements_by_cursor_async,
+    find_similar_requirements,
+    find_similar_requirements_async,
+    DuplicateRequirementError,
+    KEYSET_COLUMNS,
 )
 from app.services.client_service import create_client
 from app.services.category_service import create_category
@@ -20,6 +34,7 @@ from app.models import (
     ClientCreate,
     CategoryCreate,
     TeamMemberCreate,
+    RequirementFilter,
     Priority,
     Status,
 )
@@ -32,6 +47,34 @@ def new_db():
     reset_db()
 
 
+def create_requirements_with_distinct_relations(start: int, count: int, team_member_id: int | None = None) -> int:
+    """Create requirements that each point at their own client, category and team member."""
+    client_id = 0
+    for i in range(start, start + count):
+        client = create_client(
+            ClientCreate(
+                agency_name=f"Agency {i}",
+                contact_person="Contact",
+                email=f"agency{i}@test.com",
+                phone="123",
+                address="Address",
+                website="https://test.com",
+            )
+        )
+        category = create_category(CategoryCreate(name=f"Category {i}"))
+        assignee_id = team_member_id
+        if assignee_id is None:
+            assignee_id = create_team_member(TeamMemberCreate(name=f"Member {i}")).id
+        assert client.id is not None and category.id is not None
+        create_requirement(
+            RequirementCreate(
+                title=f"Requirement {i}", client_id=client.id, category_id=category.id, team_member_id=assignee_id
+            )
+        )
+        client_id = client.id
+    return client_id
+
+
 @pytest.fixture()
 def test_data(new_db):
     # Create test client
@@ -252,6 +295,69 @@ def test_delete_requirement_not_found(new_db):
     assert result is False
 
 
+def test_create_requirements_reports_invalid_items(test_data, capture_queries):
+    client_id, category_id = test_data["client"].id, test_data["category"].id
+    items = [
+        RequirementCreate(title="First", client_id=client_id, category_id=category_id),
+        RequirementCreate(title="Bad client", client_id=999, category_id=category_id),
+        RequirementCreate(
+            title="Assigned", client_id=client_id, category_id=category_id, team_member_id=test_data["team_member"].id
+        ),
+        RequirementCreate(title="Bad member", client_id=client_id, category_id=category_id, team_member_id=999),
+    ]
+
+    with capture_queries() as statements:
+        result = create_requirements(items)
+
+    assert result["errors"] == {1: "Client 999 does not exist", 3: "Team member 999 does not exist"}
+    created = result["items"]
+    assert [r.title if r else None for r in created] == ["First", None, "Assigned", None]
+    assert created[2].team_member.name == "Alice" and created[0].client.agency_name == "Test Agency"
+    assert {r.title for r in get_all_requirements()} == {"First", "Assigned"}
+    # Reference check, one multi-row INSERT and one statement for all change notifications
+    assert len(statements) == 3
+
+
+def test_update_requirements(test_data):
+    client_id, category_id = test_data["client"].id, test_data["category"].id
+    created = create_requirements(
+        [RequirementCreate(title=f"Requirement {i}", client_id=client_id, category_id=category_id) for i in range(3)]
+    )["items"]
+    first, second, third = (r.id for r in created)
+
+    result = update_requirements(
+        {
+            first: RequirementUpdate(status=Status.DONE, priority=Priority.HIGH),
+            second: RequirementUpdate(status=Status.IN_PROGRESS, priority=Priority.LOW),
+            third: RequirementUpdate(due_date=date(2025, 1, 31), team_member_id=test_data["team_member"].id),
+            999: RequirementUpdate(status=Status.DONE),
+            -1: RequirementUpdate(category_id=999),
+        }
+    )
+
+    assert result["errors"] == {999: "Requirement not found", -1: "Category 999 does not exist"}
+    updated = result["items"]
+    assert (updated[first].status, updated[first].priority) == (Status.DONE, Priority.HIGH)
+    assert (updated[second].status, updated[second].priority) == (Status.IN_PROGRESS, Priority.LOW)
+    assert updated[third].due_date == date(2025, 1, 31) and updated[third].team_member.name == "Alice"
+    assert updated[third].status == Status.TODO  # fields that were not set keep their values
+    stored = get_requirement_by_id(second)
+    assert stored is not None and stored.status == Status.IN_PROGRESS and stored.updated_at > stored.created_at
+
+
+def test_delete_requirements(test_data):
+    client_id, category_id = test_data["client"].id, test_data["category"].id
+    created = create_requirements(
+        [RequirementCreate(title=f"Requirement {i}", client_id=client_id, category_id=category_id) for i in range(3)]
+    )["items"]
+
+    result = delete_requirements([created[0].id, created[2].id, 999])
+
+    assert sorted(result["deleted"]) == sorted([created[0].id, created[2].id])
+    assert result["errors"] == {999: "Requirement not found"}
+    assert [r.id for r in get_all_requirements()] == [created[1].id]
+
+
 def test_get_requirements_by_client(test_data):
     # Create requirements for the client
     req1_data = RequirementCreate(
@@ -367,3 +473,358 @@ def test_get_requirements_summary(test_data):
     assert summary["by_priority"]["Medium"] == 1
     assert summary["by_priority"]["Low"] == 1
     assert summary["overdue"] == 1  # Only the todo with past due date
+
+
+def test_get_all_requirements_query_count_is_constant(new_db, capture_queries):
+    create_requirements_with_distinct_relations(0, 2)
+    with capture_queries() as few:
+        requirements = get_all_requirements()
+    assert len(requirements) == 2
+
+    create_requirements_with_distinct_relations(2, 10)
+    with capture_queries() as many:
+        requirements = get_all_requirements()
+    assert len(requirements) == 12
+
+    assert len(many) == len(few)
+    assert len(many) <= 4
+
+    # Relationships are usable after the session closed without further queries
+    with capture_queries() as after:
+        names = {
+            (req.client.agency_name, req.category.name, req.team_member.name if req.team_member else None)
+            for req in requirements
+        }
+    assert len(names) == 12
+    assert after == []
+
+
+def test_get_requirements_by_team_member_query_count_is_constant(test_data, capture_queries):
+    team_member_id = test_data["team_member"].id
+    create_requirements_with_distinct_relations(0, 2, team_member_id=team_member_id)
+    with capture_queries() as few:
+        assert len(get_requirements_by_team_member(team_member_id)) == 2
+
+    create_requirements_with_distinct_relations(2, 8, team_member_id=team_member_id)
+    with capture_queries() as many:
+        requirements = get_requirements_by_team_member(team_member_id)
+    assert len(requirements) == 10
+    assert len(many) == len(few)
+    assert {req.client.agency_name for req in requirements} == {f"Agency {i}" for i in range(10)}
+
+
+def test_get_requirements_by_client_and_by_id_are_bounded(test_data, capture_queries):
+    client_id = create_requirements_with_distinct_relations(0, 3)
+    with capture_queries() as statements:
+        requirements = get_requirements_by_client(client_id)
+    assert len(requirements) == 1
+    assert len(statements) <= 4
+
+    requirement_id = requirements[0].id
+    assert requirement_id is not None
+    with capture_queries() as statements:
+        requirement = get_requirement_by_id(requirement_id)
+    assert requirement is not None
+    assert requirement.team_member is not None
+    assert len(statements) == 1
+
+
+def test_get_requirements_page_paginates_newest_first(test_data):
+    for i in range(5):
+        create_requirement(
+            RequirementCreate(
+                title=f"Requirement {i}", client_id=test_data["client"].id, category_id=test_data["category"].id
+            )
+        )
+
+    first = get_requirements_page(page=1, page_size=2)
+    second = get_requirements_page(page=2, page_size=2)
+    last = get_requirements_page(page=3, page_size=2)
+
+    assert first["total"] == 5
+    assert [req.title for req in first["items"]] == ["Requirement 4", "Requirement 3"]
+    assert [req.title for req in second["items"]] == ["Requirement 2", "Requirement 1"]
+    assert [req.title for req in last["items"]] == ["Requirement 0"]
+    assert first["items"][0].client.agency_name == "Test Agency"
+
+
+def test_get_requirements_page_sorting(test_data):
+    other_member = create_team_member(TeamMemberCreate(name="Bob"))
+    for title, priority, member_id in [
+        ("B", Priority.LOW, other_member.id),
+        ("C", Priority.HIGH, None),
+        ("A", Priority.MEDIUM, test_data["team_member"].id),
+    ]:
+        create_requirement(
+            RequirementCreate(
+                title=title,
+                priority=priority,
+                client_id=test_data["client"].id,
+                category_id=test_data["category"].id,
+                team_member_id=member_id,
+            )
+        )
+
+    by_title = get_requirements_page(sort_by="title", descending=False)
+    assert [req.title for req in by_title["items"]] == ["A", "B", "C"]
+
+    by_priority = get_requirements_page(sort_by="priority", descending=True)
+    assert [req.title for req in by_priority["items"]] == ["C", "A", "B"]
+
+    by_assignee = get_requirements_page(sort_by="assigned_to", descending=False)
+    assert [req.title for req in by_assignee["items"]] == ["A", "B", "C"]  # Alice, Bob, unassigned last
+    assert by_assignee["total"] == 3
+
+
+def test_get_requirements_page_filters(test_data):
+    other_client = create_client(
+        ClientCreate(
+            agency_name="Other Agency",
+            contact_person="Jane",
+            email="jane@other.com",
+            phone="456",
+            address="Other Address",
+            website="https://other.com",
+        )
+    )
+    assert other_client.id is not None
+    create_requirement(
+        RequirementCreate(
+            title="Due soon",
+            status=Status.IN_PROGRESS,
+            due_date=date(2030, 1, 10),
+            client_id=test_data["client"].id,
+            category_id=test_data["category"].id,
+            team_member_id=test_data["team_member"].id,
+        )
+    )
+    create_requirement(
+        RequirementCreate(
+            title="Due later",
+            due_date=date(2030, 6, 1),
+            client_id=other_client.id,
+            category_id=test_data["category"].id,
+        )
+    )
+    create_requirement(
+        RequirementCreate(title="No due date", client_id=other_client.id, category_id=test_data["category"].id)
+    )
+
+    def titles(filters: RequirementFilter) -> set[str]:
+        result = get_requirements_page(filters=filters)
+        assert result["total"] == len(result["items"])
+        return {req.title for req in result["items"]}
+
+    assert titles(RequirementFilter(status=Status.IN_PROGRESS)) == {"Due soon"}
+    assert titles(RequirementFilter(client_id=other_client.id)) == {"Due later", "No due date"}
+    assert titles(RequirementFilter(team_member_id=test_data["team_member"].id)) == {"Due soon"}
+    assert titles(RequirementFilter(due_from=date(2030, 1, 1), due_to=date(2030, 2, 1))) == {"Due soon"}
+    assert titles(RequirementFilter(due_from=date(2030, 2, 1))) == {"Due later"}
+    assert titles(RequirementFilter(priority=Priority.HIGH)) == set()
+
+
+def test_get_requirements_page_searches_titles_and_descriptions(test_data):
+    def create(title: str, description: str = "") -> int:
+        requirement = create_requirement(
+            RequirementCreate(
+                title=title,
+                description=description,
+                client_id=test_data["client"].id,
+                category_id=test_data["category"].id,
+            )
+        )
+        assert requirement is not None and requirement.id is not None
+        return requirement.id
+
+    create("Landing page", "Hero banner with the spring campaign")
+    create("Campaign reports", "Monthly numbers")
+    create("Newsletter", "Announce the new campaign to subscribers")
+    logo_id = create("Logo", "Vector files")
+
+    def titles(search: str, sort_by: str = "relevance") -> list[str]:
+        result = get_requirements_page(sort_by=sort_by, filters=RequirementFilter(search=search))
+        assert result["total"] == len(result["items"])
+        return [req.title for req in result["items"]]
+
+    # Stemmed words; title matches rank above description matches
+    assert titles("campaigns")[0] == "Campaign reports"
+    assert set(titles("campaigns")) == {"Campaign reports", "Landing page", "Newsletter"}
+    # Every word must match; the last one may be incomplete
+    assert titles("campaign subscr") == ["Newsletter"]
+    assert titles("new campaign", sort_by="title") == ["Newsletter"]
+    # Punctuation is ignored rather than read as query syntax
+    assert titles("banner & (hero") == ["Landing page"]
+    assert titles("!!!", sort_by="created_at") == ["Logo", "Newsletter", "Campaign reports", "Landing page"]
+
+    # The search vector follows updates, single and bulk
+    update_requirement(logo_id, RequirementUpdate(description="For the campaign"))
+    assert "Logo" in titles("campaign")
+    update_requirements({logo_id: RequirementUpdate(title="Mark", description="Vector files")})
+    assert titles("mark") == ["Mark"] and "Mark" not in titles("campaign")
+
+    with pytest.raises(ValueError, match="needs a search"):
+        get_requirements_page(sort_by="relevance")
+
+
+async def test_find_similar_requirements(test_data):
+    client_id, category_id = test_data["client"].id, test_data["category"].id
+    other_client = create_client(
+        ClientCreate(
+            agency_name="Other Agency",
+            contact_person="Jane",
+            email="jane@other.com",
+            phone="456",
+            address="",
+            website="",
+        )
+    )
+    assert other_client.id is not None
+    logo = create_requirement(
+        RequirementCreate(
+            title="Logo design for the website",
+            description="New vector logo",
+            client_id=client_id,
+            category_id=category_id,
+        )
+    )
+    create_requirement(RequirementCreate(title="Website hosting", client_id=client_id, category_id=category_id))
+    create_requirement(
+        RequirementCreate(title="Logo design", status=Status.DONE, client_id=client_id, category_id=category_id)
+    )
+    create_requirement(RequirementCreate(title="Logo design", client_id=other_client.id, category_id=category_id))
+    assert logo is not None
+
+    # Only open requirements of the same client, scored by stemmed word overlap
+    similar = find_similar_requirements(client_id, "A logo for our website")
+    assert [(requirement.id, round(score, 2)) for requirement, score in similar] == [(logo.id, 0.67)]
+    assert [requirement.id for requirement, _ in await find_similar_requirements_async(client_id, "Logo")] == []
+    assert find_similar_requirements(client_id, "Annual report") == []
+    assert find_similar_requirements(client_id, "the, and!") == []
+
+    data = RequirementCreate(title="New logo design", client_id=client_id, category_id=category_id)
+    with pytest.raises(DuplicateRequirementError) as raised:
+        create_requirement(data, check_duplicates=True)
+    assert [requirement.id for requirement, _ in raised.value.duplicates] == [logo.id]
+    # The check is optional
+    assert create_requirement(data) is not None
+
+
+def test_get_requirements_page_rejects_unknown_sort_column(new_db):
+    with pytest.raises(ValueError):
+        get_requirements_page(sort_by="description")
+
+
+@pytest.mark.parametrize("sort_by", KEYSET_COLUMNS)
+@pytest.mark.parametrize("descending", [True, False])
+def test_get_requirements_by_cursor_walks_all_pages(test_data, sort_by, descending):
+    due_dates = [date(2030, 1, 1), None, date(2030, 1, 1), date(2029, 5, 5), None]
+    priorities = [Priority.HIGH, Priority.LOW, Priority.MEDIUM]
+    for i in range(11):
+        create_requirement(
+            RequirementCreate(
+                title=f"Requirement {i}",
+                priority=priorities[i % 3],
+                due_date=due_dates[i % 5],
+                client_id=test_data["client"].id,
+                category_id=test_data["category"].id,
+            )
+        )
+    expected = [req.id for req in get_requirements_page(page_size=100, sort_by=sort_by, descending=descending)["items"]]
+
+    pages = [get_requirements_by_cursor(limit=4, sort_by=sort_by, descending=descending)]
+    assert pages[0]["prev_cursor"] is None
+    while pages[-1]["next_cursor"] is not None:
+        pages.append(get_requirements_by_cursor(pages[-1]["next_cursor"], limit=4))
+    assert [req.id for page in pages for req in page["items"]] == expected
+    assert [len(page["items"]) for page in pages] == [4, 4, 3]
+
+    # Walking back from the last page returns the same pages
+    previous = get_requirements_by_cursor(pages[-1]["prev_cursor"], limit=4)
+    assert [req.id for req in previous["items"]] == [req.id for req in pages[1]["items"]]
+    first = get_requirements_by_cursor(previous["prev_cursor"], limit=4)
+    assert [req.id for req in first["items"]] == [req.id for req in pages[0]["items"]]
+    assert first["prev_cursor"] is None
+    assert first["next_cursor"] is not None
+
+
+def test_get_requirements_page_cursors_continue_with_keyset(test_data):
+    for i in range(5):
+        create_requirement(
+            RequirementCreate(
+                title=f"Requirement {i}", client_id=test_data["client"].id, category_id=test_data["category"].id
+            )
+        )
+
+    second = get_requirements_page(page=2, page_size=2)
+    third = get_requirements_by_cursor(second["next_cursor"], limit=2)
+    first = get_requirements_by_cursor(second["prev_cursor"], limit=2)
+
+    assert [req.title for req in first["items"]] == ["Requirement 4", "Requirement 3"]
+    assert [req.title for req in third["items"]] == ["Requirement 0"]
+    assert third["next_cursor"] is None
+    assert get_requirements_page(page=1, sort_by="title")["items"] != []
+    assert "next_cursor" not in get_requirements_page(sort_by="title")
+
+
+def test_get_requirements_page_survives_rows_deleted_after_counting(test_data):
+    for i in range(3):
+        create_requirement(
+            RequirementCreate(
+                title=f"Requirement {i}", client_id=test_data["client"].id, category_id=test_data["category"].id
+            )
+        )
+
+    def delete_after_count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT count(*)"):
+            # Another user deletes everything between the count and the page query
+            with ENGINE.connect().execution_options(isolation_level="AUTOCOMMIT") as other:
+                other.execute(text("DELETE FROM requirements"))
+
+    event.listen(ENGINE, "after_cursor_execute", delete_after_count)
+    try:
+        result = get_requirements_page(page=1, page_size=2)
+    finally:
+        event.remove(ENGINE, "after_cursor_execute", delete_after_count)
+
+    assert (result["items"], result["total"], result["next_cursor"]) == ([], 3, None)
+
+
+def test_get_requirements_by_cursor_rejects_bad_input(new_db):
+    with pytest.raises(ValueError):
+        get_requirements_by_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        get_requirements_by_cursor(sort_by="title")
+
+
+async def test_async_reads_match_sync_reads(test_data):
+    for i in range(5):
+        create_requirement(
+            RequirementCreate(
+                title=f"Requirement {i}",
+                priority=Priority.HIGH if i % 2 else Priority.LOW,
+                client_id=test_data["client"].id,
+                category_id=test_data["category"].id,
+                team_member_id=test_data["team_member"].id,
+            )
+        )
+
+    page = get_requirements_page(page_size=2, sort_by="priority")
+    async_page = await get_requirements_page_async(page_size=2, sort_by="priority")
+    assert [r.id for r in async_page["items"]] == [r.id for r in page["items"]]
+    assert async_page["total"] == page["total"] == 5
+    assert async_page["next_cursor"] == page["next_cursor"]
+
+    cursor_page = get_requirements_by_cursor(page["next_cursor"], limit=2, sort_by="priority")
+    async_cursor_page = await get_requirements_by_cursor_async(async_page["next_cursor"], limit=2, sort_by="priority")
+    assert [r.id for r in async_cursor_page["items"]] == [r.id for r in cursor_page["items"]]
+
+    first = async_page["items"][0]
+    assert first.client.agency_name == test_data["client"].agency_name
+    assert first.team_member is not None
+
+    requirement = await get_requirement_by_id_async(first.id)
+    assert requirement is not None
+    assert requirement.category.name == test_data["category"].name
+    assert await get_requirement_by_id_async(999) is None
+
+    assert await get_requirements_summary_async() == get_requirements_summary()
@@ -0,0 +1,203 @@
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import pytest
+from sqlmodel import text
+from app.database import ENGINE, reset_db
+from app.models import CategoryCreate, ClientCreate, Priority, RequirementCreate, RequirementUpdate, Status
+from app.services.category_service import create_category
+from app.services.client_service import create_client, delete_client
+from app.services.import_service import import_requirements
+from app.services.requirement_service import (
+    create_requirement,
+    create_requirements,
+    delete_requirement,
+    delete_requirements,
+    get_requirements_summary,
+    update_requirement,
+    update_requirements,
+)
+from app.summary import SummaryReconciler
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def client_and_category(new_db) -> tuple[int, int]:
+    client = create_client(
+        ClientCreate(agency_name="Acme", contact_person="Ann", email="ann@acme.com", phone="1", address="", website="")
+    )
+    category = create_category(CategoryCreate(name="Design"))
+    assert client.id is not None and category.id is not None
+    return client.id, category.id
+
+
+def reconcile() -> dict:
+    return SummaryReconciler(ENGINE).reconcile()
+
+
+def test_counts_follow_every_write_path(client_and_category):
+    client_id, category_id = client_and_category
+    yesterday = date.today() - timedelta(days=1)
+
+    def data(title: str, **fields) -> RequirementCreate:
+        return RequirementCreate(title=title, client_id=client_id, category_id=category_id, **fields)
+
+    first = create_requirement(data("First", due_date=yesterday))
+    created = create_requirements([data("Second", priority=Priority.HIGH), data("Third"), data("Fourth")])["items"]
+    assert first is not None and all(created)
+    update_requirement(first.id, RequirementUpdate(status=Status.IN_PROGRESS))  # type: ignore[arg-type]
+    update_requirements(
+        {
+            created[0].id: RequirementUpdate(status=Status.DONE, due_date=yesterday),
+            created[1].id: RequirementUpdate(priority=Priority.LOW, due_date=yesterday),
+        }
+    )
+    delete_requirement(created[2].id)
+    import_requirements(io.StringIO("title,client,category,status\nImported,Acme,Design,Done\nOther,Acme,Design,\n"))
+    delete_requirements([requirement.id for requirement in created[1:]])
+    other = create_client(
+        ClientCreate(
+            agency_name="Other", contact_person="Bob", email="bob@other.com", phone="2", address="", website=""
+        )
+    )
+    create_client(
+        ClientCreate(agency_name="Third", contact_person="Cy", email="cy@third.com", phone="3", address="", website="")
+    )
+    assert other.id is not None and delete_client(other.id)
+
+    assert get_requirements_summary() == {
+        "total": 4,
+        "by_status": {"To Do": 1, "In Progress": 1, "Done": 2},
+        "by_priority": {"Medium": 3, "High": 1},
+        "overdue": 1,  # The done requirement due yesterday is not overdue
+        "clients": 2,
+        "categories": 1,
+    }
+    assert reconcile() == {}
+
+
+def test_reconcile_repairs_drift(client_and_category):
+    client_id, category_id = client_and_category
+    for title in ("Logo", "Website"):
+        create_requirement(RequirementCreate(title=title, client_id=client_id, category_id=category_id))
+    with ENGINE.begin() as conn:
+        # Changes the triggers do not see: a restore with triggers disabled, or a hand-edited count
+        conn.execute(text("SET LOCAL session_replication_role = replica"))
+        conn.execute(text("UPDATE requirements SET status = 'DONE' WHERE title = 'Logo'"))
+        conn.execute(text("UPDATE summary_counts SET count = 7 WHERE dimension = 'clients'"))
+        conn.execute(text("INSERT INTO summary_counts VALUES ('client', '999', 3)"))
+
+    assert reconcile() == {
+        ("client", "999"): -3,
+        ("clients", ""): -6,
+        ("open_team_member", ""): -1,
+        ("status", "DONE"): 1,
+        ("status", "TODO"): -1,
+    }
+    assert get_requirements_summary()["by_status"] == {"To Do": 1, "Done": 1}
+    assert get_requirements_summary()["clients"] == 1
+    with ENGINE.connect() as conn:
+        assert conn.execute(text("SELECT 1 FROM summary_counts WHERE key = '999'")).first() is None
+    assert reconcile() == {}
+
+
+def test_concurrent_writes_keep_the_counts_exact(client_and_category):
+    client_id, category_id = client_and_category
+
+    def write(worker: int) -> None:
+        for i in range(10):
+            created = create_requirements(
+                [
+                    RequirementCreate(title=f"{worker}-{i}-{n}", client_id=client_id, category_id=category_id)
+                    for n in range(3)
+                ]
+            )["items"]
+            # Different fields per item: several UPDATE statements in one transaction
+            update_requirements(
+                {
+                    created[0].id: RequirementUpdate(status=Status.DONE),
+                    created[1].id: RequirementUpdate(priority=Priority.HIGH),
+                }
+            )
+            delete_requirement(created[2].id)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        writes = [executor.submit(write, worker) for worker in range(4)]
+        while not all(future.done() for future in writes):
+            reconcile()
+        for future in writes:
+            future.result()
+
+    summary = get_requirements_summary()
+    assert (summary["total"], summary["by_status"]["Done"], summary["by_priority"]["High"]) == (80, 40, 40)
+    assert reconcile() == {}
+
+
+def test_writers_lock_only_the_counts_they_change_while_committing(client_and_category):
+    client_id, category_id = client_and_category
+    first = create_requirement(RequirementCreate(title="Logo", client_id=client_id, category_id=category_id))
+    second = create_requirement(RequirementCreate(title="Website", client_id=client_id, category_id=category_id))
+    assert first is not None and first.id is not None and second is not None and second.id is not None
+
+    with ThreadPoolExecutor(max_workers=1) as executor, ENGINE.begin() as conn:
+        # A status change leaves the total alone, so it does not queue behind a writer holding it
+        conn.execute(text("SELECT 1 FROM summary_counts WHERE dimension = 'total' FOR UPDATE"))
+        assert executor.submit(update_requirement, first.id, RequirementUpdate(status=Status.DONE)).result(timeout=5)
+        # Staged counts are only locked at commit: an open transaction changing them holds up no one
+        conn.execute(text("UPDATE requirements SET priority = 'HIGH' WHERE id = :id"), {"id": second.id})
+        changed = executor.submit(update_requirement, first.id, RequirementUpdate(priority=Priority.HIGH))
+        assert changed.result(timeout=5)
+
+    summary = get_requirements_summary()
+    assert (summary["total"], summary["by_status"], summary["by_priority"]) == (2, {"To Do": 1, "Done": 1}, {"High": 2})
+    assert reconcile() == {}
+
+
+def test_reconciler_runs_periodically(client_and_category):
+    client_id, category_id = client_and_category
+    create_requirement(RequirementCreate(title="Logo", client_id=client_id, category_id=category_id))
+    with ENGINE.begin() as conn:
+        conn.execute(text("UPDATE summary_counts SET count = 0 WHERE dimension = 'team_member'"))
+
+    reconciler = SummaryReconciler(ENGINE, interval=0.1)
+    reconciler.start()
+    try:
+        deadline = time.monotonic() + 5
+        repaired = None
+        while time.monotonic() < deadline:
+            with ENGINE.connect() as conn:
+                repaired = conn.execute(
+                    text("SELECT count FROM summary_counts WHERE dimension = 'team_member' AND key = ''")
+                ).scalar()
+            if repaired == 1:
+                break
+            time.sleep(0.05)
+        assert repaired == 1
+    finally:
+        reconciler.stop()
+
+
+def test_completion_times_follow_the_status(client_and_category):
+    client_id, category_id = client_and_category
+    done = create_requirement(
+        RequirementCreate(title="Logo", status=Status.DONE, client_id=client_id, category_id=category_id)
+    )
+    open_one = create_requirement(RequirementCreate(title="Website", client_id=client_id, category_id=category_id))
+    assert done is not None and done.id is not None and open_one is not None and open_one.id is not None
+    assert done.completed_at == done.updated_at and open_one.completed_at is None
+
+    completed = update_requirement(open_one.id, RequirementUpdate(status=Status.DONE))
+    assert completed is not None and completed.completed_at == completed.updated_at
+    # Other changes keep the completion time; reopening clears it
+    renamed = update_requirement(done.id, RequirementUpdate(title="Logo v2", status=Status.DONE))
+    assert renamed is not None and renamed.completed_at == done.completed_at
+    reopened = update_requirement(done.id, RequirementUpdate(status=Status.IN_PROGRESS))
+    assert reopened is not None and reopened.completed_at is None
+    assert reconcile() == {}
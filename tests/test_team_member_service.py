@@ -6,7 +6,10 @@ from app.services.team_member_service import (
     create_team_member,
     update_team_member,
     delete_team_member,
+    team_member_has_requirements,
     get_team_members_with_requirement_counts,
+    search_team_members,
+    search_team_members_async,
 )
 from app.services.client_service import create_client
 from app.services.category_service import create_category
@@ -128,7 +131,9 @@ def test_delete_team_member_with_requirements_fails(new_db):
     req_data = RequirementCreate(
         title="Test Requirement", client_id=client.id, category_id=category.id, team_member_id=team_member.id
     )
+    assert not team_member_has_requirements(team_member.id)
     create_requirement(req_data)
+    assert team_member_has_requirements(team_member.id)
 
     # Try to delete team member - should fail
     result = delete_team_member(team_member.id)
@@ -212,3 +217,12 @@ def test_team_member_update_partial_data(new_db):
     # Should return the updated team member
     assert result is not None
     assert result.name == "Updated Name"
+
+
+async def test_search_team_members(new_db):
+    for name in ["Alice Smith", "Bob Smithers", "Carol Jones"]:
+        create_team_member(TeamMemberCreate(name=name))
+
+    assert [member.name for member in search_team_members("smith")] == ["Alice Smith", "Bob Smithers"]
+    assert [member.name for member in search_team_members("smith", limit=1)] == ["Alice Smith"]
+    assert [member.name for member in await search_team_members_async("car")] == ["Carol Jones"]
@@ -0,0 +1,153 @@
+from datetime import date, datetime, timedelta
+import pytest
+from sqlmodel import text
+from app.database import ENGINE, reset_db
+from app.models import CategoryCreate, ClientCreate, RequirementCreate, RequirementUpdate, Status, TeamMemberCreate
+from app.services.category_service import create_category
+from app.services.client_service import create_client
+from app.services.requirement_service import create_requirement, update_requirement
+from app.services.team_member_service import create_team_member
+from app.services.trend_service import (
+    UNASSIGNED,
+    get_overdue_by_client,
+    get_overdue_by_client_async,
+    get_requirement_trends,
+    get_requirement_trends_async,
+    get_team_member_load,
+    get_team_member_load_async,
+    trend_unit,
+)
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def clients_and_category(new_db) -> tuple[int, int, int]:
+    ids = []
+    for name in ("Acme", "Globex"):
+        client = create_client(
+            ClientCreate(
+                agency_name=name, contact_person="Ann", email="ann@example.com", phone="1", address="", website=""
+            )
+        )
+        ids.append(client.id)
+    category = create_category(CategoryCreate(name="Design"))
+    return ids[0], ids[1], category.id  # type: ignore[return-value]
+
+
+def backdate(requirement_id: int, created: datetime, completed: datetime | None = None) -> None:
+    """Move a requirement's creation (and completion) into the past, as the triggers see any other write."""
+    with ENGINE.begin() as conn:
+        conn.execute(
+            text("UPDATE requirements SET created_at = :created, updated_at = :created WHERE id = :id"),
+            {"id": requirement_id, "created": created},
+        )
+        if completed is not None:
+            conn.execute(
+                text("UPDATE requirements SET status = 'DONE', updated_at = :completed WHERE id = :id"),
+                {"id": requirement_id, "completed": completed},
+            )
+
+
+def test_trend_units_keep_the_series_short():
+    units = [trend_unit(days) for days in (7, 30, 31, 90, 365, 366, 3 * 365)]
+    assert units == ["day"] * 3 + ["week"] * 3 + ["month"]
+
+
+def test_trends_count_created_completed_and_open(clients_and_category):
+    client_id, _, category_id = clients_and_category
+    now = datetime.utcnow()
+
+    def requirement(title: str, created_days_ago: int, completed_days_ago: int | None = None) -> None:
+        created = create_requirement(RequirementCreate(title=title, client_id=client_id, category_id=category_id))
+        assert created is not None and created.id is not None
+        completed = None if completed_days_ago is None else now - timedelta(days=completed_days_ago)
+        if created_days_ago:
+            backdate(created.id, now - timedelta(days=created_days_ago), completed)
+
+    requirement("Done before the range", 40, 35)
+    requirement("Done in the range", 40, 10)
+    requirement("Still open", 20)
+    requirement("Quickly done", 5, 2)
+    requirement("New today", 0)
+
+    trends = get_requirement_trends(30)
+
+    assert trends["unit"] == "day" and len(trends["buckets"]) == 30
+    assert trends["buckets"][-1] == now.date().isoformat()
+    by_day = {
+        series: {bucket: count for bucket, count in zip(trends["buckets"], trends[series]) if count}
+        for series in ("created", "completed")
+    }
+    day = {days_ago: (now - timedelta(days=days_ago)).date().isoformat() for days_ago in (20, 10, 5, 2, 0)}
+    assert by_day == {
+        "created": {day[20]: 1, day[5]: 1, day[0]: 1},
+        "completed": {day[10]: 1, day[2]: 1},
+    }
+    # Open at the end of each day: the requirement done 10 days ago counts until then, the other open ones after
+    opened = dict(zip(trends["buckets"], trends["open"]))
+    assert trends["open"][0] == 1
+    assert [opened[day[days_ago]] for days_ago in (20, 10, 5, 2, 0)] == [2, 1, 2, 1, 2]
+
+
+async def test_trends_are_bucketed_per_week_and_month(clients_and_category):
+    client_id, _, category_id = clients_and_category
+    first = create_requirement(RequirementCreate(title="Old", client_id=client_id, category_id=category_id))
+    create_requirement(RequirementCreate(title="New", status=Status.DONE, client_id=client_id, category_id=category_id))
+    assert first is not None and first.id is not None
+    backdate(first.id, datetime.utcnow() - timedelta(days=60))
+
+    weekly = await get_requirement_trends_async(90)
+    monthly = await get_requirement_trends_async(3 * 365)
+
+    assert weekly["unit"] == "week"
+    assert all(date.fromisoformat(bucket).weekday() == 0 for bucket in weekly["buckets"])
+    assert monthly["unit"] == "month" and len(monthly["buckets"]) == 37
+    assert all(bucket.endswith("-01") for bucket in monthly["buckets"])
+    for trends in (weekly, monthly):
+        assert (sum(trends["created"]), sum(trends["completed"]), trends["open"][-1]) == (2, 1, 1)
+        assert trends["open"][0] in (0, 1)
+
+
+async def test_overdue_by_client(clients_and_category):
+    acme, globex, category_id = clients_and_category
+    yesterday = date.today() - timedelta(days=1)
+    for client_id, status, due_date in [
+        (acme, Status.TODO, yesterday),
+        (globex, Status.TODO, yesterday),
+        (globex, Status.IN_PROGRESS, yesterday - timedelta(days=30)),
+        (globex, Status.DONE, yesterday),  # Done is never overdue
+        (acme, Status.TODO, date.today()),  # Due today is not overdue yet
+        (acme, Status.TODO, None),
+    ]:
+        create_requirement(
+            RequirementCreate(
+                title="Work", status=status, due_date=due_date, client_id=client_id, category_id=category_id
+            )
+        )
+
+    assert get_overdue_by_client() == [("Globex", 2), ("Acme", 1)]
+    assert await get_overdue_by_client_async(limit=1) == [("Globex", 2)]
+
+
+async def test_team_member_load_counts_open_requirements(clients_and_category):
+    client_id, _, category_id = clients_and_category
+    alice = create_team_member(TeamMemberCreate(name="Alice"))
+    bob = create_team_member(TeamMemberCreate(name="Bob"))
+    assigned = [alice.id, alice.id, bob.id, None, bob.id]
+    created = [
+        create_requirement(
+            RequirementCreate(title="Work", client_id=client_id, category_id=category_id, team_member_id=member_id)
+        )
+        for member_id in assigned
+    ]
+    update_requirement(created[-1].id, RequirementUpdate(status=Status.DONE))  # type: ignore[union-attr, arg-type]
+
+    assert get_team_member_load() == [("Alice", 2), ("Bob", 1), (UNASSIGNED, 1)]
+    update_requirement(created[0].id, RequirementUpdate(status=Status.DONE))  # type: ignore[union-attr, arg-type]
+    assert await get_team_member_load_async() == [("Alice", 1), ("Bob", 1), (UNASSIGNED, 1)]
@@ -1,10 +1,22 @@
+import asyncio
+import io
 import pytest
+from datetime import date, timedelta
+from nicegui import ElementFilter, events, ui
 from nicegui.testing import User
+from nicegui.testing.user_interaction import UserInteraction
+from starlette.datastructures import UploadFile
 from app.database import reset_db
 from app.services.client_service import create_client
 from app.services.category_service import create_category
 from app.services.team_member_service import create_team_member
-from app.models import ClientCreate, CategoryCreate, TeamMemberCreate
+from app.services.requirement_service import (
+    create_requirement,
+    delete_requirement,
+    get_all_requirements,
+    update_requirement,
+)
+from app.models import ClientCreate, CategoryCreate, TeamMemberCreate, RequirementCreate, RequirementUpdate, Status
 
 
 @pytest.fixture()
@@ -110,6 +122,37 @@ async def test_category_creation_flow(user: User, new_db) -> None:
     await user.should_see("Save")
 
 
+async def test_saving_a_category_updates_the_table_in_place(user: User, new_db) -> None:
+    create_category(CategoryCreate(name="Web Development"))
+    await user.open("/settings")
+    table = user.find(ui.table).elements.pop()
+
+    user.find("Add Category").click()
+    await user.should_see("Add New Category")
+    user.find(ui.input).type("Branding")
+    user.find("Save").click()
+    await user.should_see("Category created successfully")
+
+    # The row is slotted into the existing table in name order; the table is not rebuilt
+    assert [row["name"] for row in table.rows] == ["Branding", "Web Development"]
+    assert user.find(ui.table).elements == {table}
+
+
+async def test_clients_can_be_imported_from_csv(user: User, new_db) -> None:
+    await user.open("/clients")
+    user.find("Import CSV").click()
+    await user.should_see("Import Clients")
+
+    csv_file = b"agency_name,contact_person,email\nGlobex,Hank,hank@globex.com\nGlobex,Hank,hank@globex.com\n"
+    upload = user.find(ui.upload).elements.pop()
+    upload.handle_uploads([UploadFile(io.BytesIO(csv_file), filename="clients.csv")])
+
+    await user.should_see("Imported 1 rows")
+    await user.should_see("Row 3: Client 'Globex' appears more than once")
+    table = user.find(ui.table).elements.pop()
+    assert [row["agency_name"] for row in table.rows] == ["Globex"]
+
+
 async def test_team_member_creation_flow(user: User, new_db) -> None:
     await user.open("/settings")
 
@@ -144,7 +187,277 @@ async def test_requirement_creation_flow(user: User, test_data) -> None:
     await user.should_see("Status")
 
 
+def type_into_select(user: User, select: ui.select, text: str) -> None:
+    """Type into a select's input the way the browser reports it once the input debounce has passed."""
+    assert user.client
+    with user.client:
+        for listener in select._event_listeners.values():
+            if listener.type == "filter":
+                events.handle_event(
+                    listener.handler, events.GenericEventArguments(sender=select, client=user.client, args=text)
+                )
+
+
+async def test_requirement_form_looks_up_clients_while_typing(user: User, test_data) -> None:
+    for i in range(30):
+        create_client(
+            ClientCreate(
+                agency_name=f"Agency {i:02d}", contact_person="C", email="c@test.com", phone="1", address="", website=""
+            )
+        )
+
+    await user.open("/requirements")
+    user.find("Add New Requirement").click()
+    await user.should_see(kind=ui.input, content="Title")
+    client_select = form_field(user, ui.select, "Client")
+    team_member_select = form_field(user, ui.select, "Assigned To")
+
+    # Only the first page of options is sent when the dialog opens
+    assert len(client_select.options) == 20
+    assert "Test Agency" not in client_select.options.values()
+    assert list(team_member_select.options.values()) == ["Unassigned", "Alice Smith"]
+
+    type_into_select(user, client_select, "test")
+    assert await wait_until(lambda: list(client_select.options.values()) == ["Test Agency"])
+    client_select.value = test_data["client"].id
+
+    # The selected client stays available while other names are looked up
+    type_into_select(user, client_select, "agency 2")
+    assert await wait_until(lambda: len(client_select.options) == 11)
+    assert client_select.value == test_data["client"].id
+
+
+async def test_reopening_the_requirement_form_costs_no_lookup_queries(user: User, test_data, query_count) -> None:
+    await user.open("/requirements")
+    user.find("Add New Requirement").click()
+    await user.should_see(kind=ui.input, content="Title")
+    user.find("Cancel").click()
+    await asyncio.sleep(0.5)  # let the notifications of the setup arrive
+
+    first_form = user.find(kind=ui.input, content="Title").elements
+    before = query_count["queries"]
+    user.find("Add New Requirement").click()
+    assert await wait_until(lambda: user.find(kind=ui.input, content="Title").elements - first_form)
+    # The first options of the clients, categories and team members come from the lookup cache
+    assert query_count["queries"] == before
+
+
+def form_field(user: User, kind: type, label: str):
+    """The field of the open dialog with this label; the filter bar has fields with the same labels."""
+    assert user.client
+    with user.client:
+        return next(iter(ElementFilter(kind=kind, content=label).within(kind=ui.dialog)))
+
+
+async def test_requirement_form_warns_about_duplicates(user: User, test_data) -> None:
+    client_id, category_id = test_data["client"].id, test_data["category"].id
+    create_requirement(
+        RequirementCreate(title="Logo design for the website", client_id=client_id, category_id=category_id)
+    )
+
+    await user.open("/requirements")
+    user.find("Add New Requirement").click()
+    await user.should_see(kind=ui.input, content="Title")
+    form_field(user, ui.input, "Title").value = "Website logo"
+    form_field(user, ui.select, "Category").value = category_id
+    # Choosing the client runs the check
+    form_field(user, ui.select, "Client").value = client_id
+    await user.should_see("This looks like an open requirement of the same client:")
+    await user.should_see("Logo design for the website (To Do, 67% similar)")
+
+    # The warning has been seen, so saving again creates the requirement
+    user.find("Save Anyway").click()
+    assert await wait_until(lambda: len(get_all_requirements()) == 2)
+
+
 async def test_root_redirect(user: User, new_db) -> None:
     """Test that root URL redirects to dashboard"""
     await user.open("/")
     await user.should_see("Dashboard Overview")
+
+
+async def test_requirements_table_loads_only_first_page(user: User, test_data) -> None:
+    for i in range(30):
+        create_requirement(
+            RequirementCreate(
+                title=f"Requirement {i}", client_id=test_data["client"].id, category_id=test_data["category"].id
+            )
+        )
+
+    await user.open("/requirements")
+    await user.should_see("Requirements")
+
+    table = user.find(ui.table).elements.pop()
+    assert len(table.rows) == 25
+    assert table.rows[0]["title"] == "Requirement 29"
+    assert table.pagination["rowsNumber"] == 30
+
+
+async def wait_until(condition, timeout: float = 5) -> bool:
+    for _ in range(int(timeout / 0.05)):
+        if condition():
+            return True
+        await asyncio.sleep(0.05)
+    return condition()
+
+
+async def test_requirements_table_follows_changes_made_elsewhere(user: User, test_data) -> None:
+    ids = {"client_id": test_data["client"].id, "category_id": test_data["category"].id}
+    first = create_requirement(RequirementCreate(title="First", **ids))
+    assert first is not None and first.id is not None
+
+    await user.open("/requirements")
+    table = user.find(ui.table).elements.pop()
+    assert [row["title"] for row in table.rows] == ["First"]
+
+    # Another user renames the requirement: the row is patched in place
+    update_requirement(first.id, RequirementUpdate(title="Renamed"))
+    assert await wait_until(lambda: [row["title"] for row in table.rows] == ["Renamed"])
+
+    create_requirement(RequirementCreate(title="Second", **ids))
+    assert await wait_until(lambda: [row["title"] for row in table.rows] == ["Second", "Renamed"])
+    assert table.pagination["rowsNumber"] == 2
+
+    delete_requirement(first.id)
+    assert await wait_until(lambda: [row["title"] for row in table.rows] == ["Second"])
+
+
+async def test_requirements_can_be_searched(user: User, test_data) -> None:
+    ids = {"client_id": test_data["client"].id, "category_id": test_data["category"].id}
+    create_requirement(RequirementCreate(title="Landing page", description="Spring campaign banner", **ids))
+    create_requirement(RequirementCreate(title="Campaign report", **ids))
+    create_requirement(RequirementCreate(title="Logo", **ids))
+
+    await user.open("/requirements")
+    table = user.find(ui.table).elements.pop()
+
+    # Ranked while searching: the title match comes first
+    user.find("Search titles and descriptions").type("campa")
+    assert await wait_until(lambda: [row["title"] for row in table.rows] == ["Campaign report", "Landing page"])
+    assert table.pagination["sortBy"] == "relevance"
+
+    # Changes to the matches are applied with a query, as only the database can evaluate the search
+    logo = create_requirement(RequirementCreate(title="Logo for the campaign", **ids))
+    assert logo is not None
+    assert await wait_until(lambda: len(table.rows) == 3 and table.pagination["rowsNumber"] == 3)
+
+    user.find("Search titles and descriptions").clear()
+    assert await wait_until(lambda: len(table.rows) == 4)
+    assert table.pagination["sortBy"] == "created_at"
+
+
+def select_rows(user: User, table: ui.table, rows: list[dict]) -> None:
+    """Select table rows the way the browser reports it."""
+    assert user.client
+    with user.client:
+        for listener in table._event_listeners.values():
+            if listener.type == "selection":
+                args = {"added": True, "rows": rows, "keys": [row["id"] for row in rows]}
+                events.handle_event(
+                    listener.handler, events.GenericEventArguments(sender=table, client=user.client, args=args)
+                )
+
+
+def click_menu_item(user: User, text: str) -> None:
+    """Click the menu item labelled ``text``; its label lives in a child item section."""
+    sections = user.find(kind=ui.item_section, content=text).elements
+    items = {section.parent_slot.parent for section in sections if section.parent_slot}
+    UserInteraction(user, {item for item in items if isinstance(item, ui.menu_item)}, text).click()
+
+
+async def test_bulk_actions_change_selected_requirements(user: User, test_data) -> None:
+    ids = {"client_id": test_data["client"].id, "category_id": test_data["category"].id}
+    for i in range(3):
+        create_requirement(RequirementCreate(title=f"Requirement {i}", **ids))
+
+    await user.open("/requirements")
+    table = user.find(ui.table).elements.pop()
+    select_rows(user, table, table.rows[:2])
+    await user.should_see("2 selected")
+
+    click_menu_item(user, "Done")
+    await user.should_see("Updated 2 requirements")
+    assert await wait_until(lambda: [row["status"] for row in table.rows] == ["Done", "Done", "To Do"])
+    assert table.selected == []
+
+    # Once the page has seen the notices of its own change, later changes by others are shown again
+    await asyncio.sleep(0.5)
+    update_requirement(table.rows[0]["id"], RequirementUpdate(title="Renamed elsewhere"))
+    assert await wait_until(lambda: table.rows[0]["title"] == "Renamed elsewhere")
+
+    select_rows(user, table, table.rows[1:])
+    assert user.client is not None
+    with user.client:
+        assignee = user.find(marker="bulk-assignee").elements.pop()
+        assert isinstance(assignee, ui.select)
+        assignee.value = test_data["team_member"].id
+    user.find(marker="bulk-assign").click()
+    assert await wait_until(
+        lambda: [row["assigned_to"] for row in table.rows] == ["Unassigned", "Alice Smith", "Alice Smith"]
+    )
+
+    select_rows(user, table, table.rows[:2])
+    delete_buttons = user.find(kind=ui.button, content="Delete").elements
+    user.find(kind=ui.button, content="Delete").click()
+    await user.should_see("Are you sure you want to delete 2 requirements?")
+    confirm = user.find(kind=ui.button, content="Delete").elements - delete_buttons
+    UserInteraction(user, confirm, "Delete").click()
+    await user.should_see("Deleted 2 requirements")
+    # The page is queried again after the message is shown
+    assert await wait_until(lambda: [row["title"] for row in table.rows] == ["Requirement 0"])
+    assert table.pagination["rowsNumber"] == 1
+
+
+async def test_dashboard_counters_follow_requirement_changes(user: User, test_data) -> None:
+    ids = {"client_id": test_data["client"].id, "category_id": test_data["category"].id}
+    await user.open("/dashboard")
+    await user.should_see("Total Requirements")
+
+    # The breakdowns gain their first lines, so the summary is rebuilt
+    create_requirement(RequirementCreate(title="Live", status=Status.DONE, **ids))
+    await user.should_see("Done", retries=50)
+
+    # Same lines, new numbers: the existing labels are updated in place
+    total = user.find(marker="total-requirements").elements.pop()
+    assert isinstance(total, ui.label) and total.text == "1"
+    create_requirement(RequirementCreate(title="Live again", status=Status.DONE, **ids))
+    assert await wait_until(lambda: total.text == "2")
+
+
+def chart(user: User, marker: str) -> ui.highchart:
+    assert user.client is not None
+    with user.client:
+        element = user.find(marker=marker).elements.pop()
+    assert isinstance(element, ui.highchart)
+    return element
+
+
+async def test_dashboard_range_reloads_only_the_trends(user: User, test_data, query_count) -> None:
+    ids = {"client_id": test_data["client"].id, "category_id": test_data["category"].id}
+    yesterday = date.today() - timedelta(days=1)
+    create_requirement(
+        RequirementCreate(title="Late", due_date=yesterday, team_member_id=test_data["team_member"].id, **ids)
+    )
+    create_requirement(RequirementCreate(title="Shipped", status=Status.DONE, **ids))
+    await user.open("/dashboard")
+    await user.should_see("Created vs Completed")
+    await user.should_see("Open Requirements per Team Member")
+
+    flow, backlog = chart(user, "flow-chart"), chart(user, "backlog-chart")
+    overdue, load = chart(user, "overdue-by-client"), chart(user, "team-member-load")
+    assert [sum(series["data"]) for series in flow.options["series"]] == [2, 1]
+    assert backlog.options["series"][0]["data"][-1] == 1
+    assert overdue.options["xAxis"]["categories"] == ["Test Agency"]
+    assert load.options["xAxis"]["categories"] == ["Alice Smith"]
+    await asyncio.sleep(0.5)  # let the notifications of the setup arrive
+
+    before = query_count["queries"]
+    assert user.client is not None
+    with user.client:
+        trend_range = user.find(marker="trend-range").elements.pop()
+        assert isinstance(trend_range, ui.select)
+        trend_range.value = "3y"
+    assert await wait_until(lambda: len(flow.options["xAxis"]["categories"]) == 37)
+    assert len(backlog.options["series"][0]["data"]) == 37
+    # One query for the new range's trends; the summary and the breakdowns stay as they are
+    assert query_count["queries"] == before + 1